@@ -3,20 +3,34 @@ Lore Framework MCP Server
 
 MCP server and CLI for managing lore/ directory structure.
 Provides tools for session management, task tracking, and index generation.
+
+The MCP stack (and everything it pulls in) is only imported in server mode;
+CLI commands run on the lightweight core module.
 """
 
 import sys
-from .server import mcp, run_server
-from .cli import run_cli
 
 __version__ = "1.2.2"
 
 
+def __getattr__(name: str):
+    """Load the MCP server lazily on first access to mcp/run_server."""
+    if name in ("mcp", "run_server"):
+        from . import server
+
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def main():
     """Entry point - detect CLI mode or start MCP server."""
     if len(sys.argv) > 1:
         # CLI mode
+        from .cli import run_cli
+
         sys.exit(run_cli(sys.argv))
     else:
         # MCP server mode
+        from .server import run_server
+
         run_server()
@@ -0,0 +1,471 @@
+"""
+Lore Framework Benchmarks
+
+Usage:
+    python -m lore_framework_mcp.bench reader [--files N] [--body-kb K]
+    python -m lore_framework_mcp.bench imports [--max-ms N]
+    python -m lore_framework_mcp.bench scale [--sizes 100,10000] [--baseline FILE]
+                                             [--save-baseline FILE] [--tolerance 1.5]
+    python -m lore_framework_mcp.bench records [--tasks N]
+
+The scale benchmark generates synthetic lore/ trees and reports wall time,
+peak RSS and filesystem call counts per phase. With --baseline it exits
+non-zero when a phase regresses beyond the tolerance. The records benchmark
+compares the memory held by the slotted task model against plain dicts.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import builtins
+import subprocess
+import tempfile
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .cache import ParseCache
+from .catalog import sync_catalog, catalog_index
+from .core import (
+    extract_title,
+    scan_task_files,
+    parse_tasks,
+    parse_adrs,
+    compute_blocks,
+    generate_readme,
+    generate_next,
+    find_task,
+    generate_current_user_md,
+    load_team,
+)
+from .digest import session_digest
+from .graph import TaskGraph
+from .reader import read_frontmatter
+from .records import TaskRecord
+from .search import SearchIndex
+from .task_ids import TaskIdIndex
+from .timeline import iter_timeline, load_timeline
+from .validate import run_validation
+
+TASK_HEAD = """---
+id: "{id:04d}"
+title: "Synthetic task {id}"
+type: FEATURE
+status: active
+related_adr: ["0001"]
+tags: [bench, synthetic]
+history:
+  - date: 2026-01-01
+    status: active
+    who: bench
+    note: "Task created"
+---
+
+# Synthetic task {id}
+
+"""
+
+LOG_LINE = "2026-01-01T00:00:00 INFO worker processed batch with a fairly long log message\n"
+
+
+def write_task_files(root: Path, count: int, body_kb: int) -> list[Path]:
+    """Write count task files with a body of roughly body_kb kilobytes."""
+    body = LOG_LINE * max(1, body_kb * 1024 // len(LOG_LINE))
+    paths = []
+    for i in range(count):
+        path = root / f"{i:04d}_FEATURE_bench.md"
+        path.write_text(TASK_HEAD.format(id=i) + body)
+        paths.append(path)
+    return paths
+
+
+def time_per_file(paths: list[Path], read) -> float:
+    """Best-of-3 mean time per file in microseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for path in paths:
+            read(path)
+        best = min(best, time.perf_counter() - start)
+    return best / len(paths) * 1e6
+
+
+def bench_reader(files: int = 200, body_kb: int = 64) -> int:
+    """Compare the header-only reader against python-frontmatter."""
+    def read_fast(path: Path) -> str:
+        meta, content = read_frontmatter(path)
+        return meta.get("title") or extract_title(content)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_task_files(Path(tmp), files, body_kb)
+        fast = time_per_file(paths, read_fast)
+        print(f"reader: {files} files, {body_kb} KB body")
+        print(f"  read_frontmatter    {fast:10.1f} us/file")
+
+        try:
+            import frontmatter
+        except ImportError:
+            print("  python-frontmatter  not installed, skipping comparison")
+            return 0
+
+        def read_full(path: Path) -> str:
+            post = frontmatter.load(path)
+            return post.metadata.get("title") or extract_title(post.content)
+
+        full = time_per_file(paths, read_full)
+        print(f"  frontmatter.load    {full:10.1f} us/file")
+        print(f"  speedup             {full / fast:10.1f}x")
+    return 0
+
+
+# Packages that must never load on CLI/hook paths
+HEAVY_IMPORTS = ("mcp", "pydantic", "pydantic_core", "anyio", "starlette", "httpx", "uvicorn", "sse_starlette")
+
+
+def bench_imports(max_ms: int = 0) -> int:
+    """Guard CLI startup: import the CLI under -X importtime and fail if the MCP stack loads.
+
+    With max_ms, also fail when the cumulative CLI import time exceeds it.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lore_framework_mcp.cli"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        return 1
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+
+    heavy = sorted(name for name in modules if name.split(".")[0] in HEAVY_IMPORTS)
+    total_ms = modules.get("lore_framework_mcp.cli", 0) / 1000
+    print(f"imports: lore_framework_mcp.cli {total_ms:.1f} ms, {len(modules)} modules")
+
+    if heavy:
+        print(f"  FAIL: CLI imports MCP stack: {', '.join(heavy[:10])}", file=sys.stderr)
+        return 1
+    if max_ms and total_ms > max_ms:
+        print(f"  FAIL: CLI import time {total_ms:.1f} ms exceeds {max_ms} ms", file=sys.stderr)
+        return 1
+    print("  OK: no MCP stack imports")
+    return 0
+
+
+# ============================================================================
+# Synthetic lore trees
+# ============================================================================
+
+STATUS_SPLIT = [("archive", 0.7), ("active", 0.1), ("blocked", 0.1), ("backlog", 0.1)]
+TASK_TYPES = ["BUG", "FEATURE", "RESEARCH", "REFACTOR", "DOCS"]
+
+
+def task_markdown(task_id: int, status: str, task_type: str, blocked_by: list[int], related_adr: list[int], rng: random.Random) -> str:
+    """Render a synthetic task file with a realistic history."""
+    lines = [
+        "---",
+        f'id: "{task_id:04d}"',
+        f'title: "Synthetic {task_type.lower()} task {task_id}"',
+        f"type: {task_type}",
+        f"status: {'completed' if status == 'archive' else status}",
+        f"related_adr: [{', '.join(f'{a:04d}' for a in related_adr)}]",
+        f"tags: [bench, area-{rng.randint(1, 20)}]",
+        "history:",
+        f"  - date: 2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "    status: active",
+        "    who: bench",
+        '    note: "Task created"',
+    ]
+    if status == "blocked":
+        lines += [
+            "  - date: 2026-01-02",
+            "    status: blocked",
+            "    who: bench",
+            f"    by: [{', '.join(f'{b:04d}' for b in blocked_by)}]",
+        ]
+    elif status == "archive":
+        lines += ["  - date: 2026-01-03", "    status: completed", "    who: bench"]
+    lines += ["---", "", f"# Synthetic task {task_id}", "", LOG_LINE * rng.randint(1, 40)]
+    return "\n".join(lines)
+
+
+def make_tree(project_dir: Path, tasks: int, seed: int = 0) -> Path:
+    """Generate a synthetic lore/ tree under project_dir. Returns the lore/ path.
+
+    Mixes file and directory tasks (directory tasks get notes/ and worklog/),
+    builds blocked_by chains onto earlier tasks, and adds ADRs with
+    related_tasks.
+    """
+    rng = random.Random(seed)
+    lore_dir = project_dir / "lore"
+    session_dir = lore_dir / "0-session"
+    session_dir.mkdir(parents=True)
+    (session_dir / "team.yaml").write_text("bench:\n  name: Bench\n  role: benchmark\n")
+    for status, _ in STATUS_SPLIT:
+        (lore_dir / "1-tasks" / status).mkdir(parents=True)
+    adr_dir = lore_dir / "2-adrs"
+    adr_dir.mkdir()
+
+    adr_count = max(1, tasks // 50)
+    statuses = [status for status, _ in STATUS_SPLIT]
+    weights = [weight for _, weight in STATUS_SPLIT]
+
+    for task_id in range(1, tasks + 1):
+        status = rng.choices(statuses, weights)[0]
+        task_type = rng.choice(TASK_TYPES)
+        blocked_by = []
+        if status == "blocked" and task_id > 1:
+            # Mostly the previous task (chains), sometimes a random earlier one
+            blocked_by = [task_id - 1] + ([rng.randint(1, task_id - 1)] if rng.random() < 0.3 else [])
+        related_adr = [rng.randint(1, adr_count)] if rng.random() < 0.2 else []
+        content = task_markdown(task_id, status, task_type, blocked_by, related_adr, rng)
+
+        name = f"{task_id:04d}_{task_type}_synthetic-{task_id}"
+        status_dir = lore_dir / "1-tasks" / status
+        if rng.random() < 0.25:
+            task_dir = status_dir / name
+            (task_dir / "notes").mkdir(parents=True)
+            (task_dir / "worklog").mkdir()
+            (task_dir / "README.md").write_text(content)
+            day = f"2026-01-{task_id % 28 + 1:02d}"
+            (task_dir / "worklog" / f"{day}_session.md").write_text(f"---\ndate: {day}\ntags: [bench]\n---\n\n# Session\n")
+        else:
+            (status_dir / f"{name}.md").write_text(content)
+
+    for adr_id in range(1, adr_count + 1):
+        related = sorted({rng.randint(1, tasks) for _ in range(3)})
+        (adr_dir / f"{adr_id:04d}_decision-{adr_id}.md").write_text(
+            "---\n"
+            f'id: "{adr_id:04d}"\n'
+            f'title: "Decision {adr_id}"\n'
+            "status: accepted\n"
+            f"related_tasks: [{', '.join(f'{t:04d}' for t in related)}]\n"
+            "---\n\n"
+            f"# Decision {adr_id}\n"
+        )
+
+    return lore_dir
+
+
+# ============================================================================
+# Phase measurement
+# ============================================================================
+
+COUNTED_CALLS = [(os, "stat"), (os, "lstat"), (os, "listdir"), (os, "scandir"), (io, "open"), (builtins, "open")]
+
+
+@contextmanager
+def count_fs_calls(counter: dict):
+    """Count filesystem calls (stat/lstat/listdir/scandir/open) made inside the block."""
+    originals = [(module, name, getattr(module, name)) for module, name in COUNTED_CALLS]
+
+    def counting(func):
+        def wrapper(*args, **kwargs):
+            counter["fs_calls"] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    for module, name, func in originals:
+        setattr(module, name, counting(func))
+    try:
+        yield
+    finally:
+        for module, name, func in originals:
+            setattr(module, name, func)
+
+
+def peak_rss_mb() -> float:
+    """Process peak RSS so far, in MB (0 where unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(func) -> tuple[dict, object]:
+    """Run func once, returning its metrics and result."""
+    counter = {"fs_calls": 0}
+    with count_fs_calls(counter):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+    return {"ms": round(elapsed * 1000, 2), "fs_calls": counter["fs_calls"], "rss_mb": round(peak_rss_mb(), 1)}, result
+
+
+def bench_size(tasks: int) -> dict:
+    """Run all phases against a synthetic tree with the given task count."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        lore_dir = make_tree(Path(tmp), tasks)
+        print(f"scale: {tasks} tasks (tree generated in {time.perf_counter() - start:.1f}s)")
+
+        results = {}
+        results["scan"], files = measure(lambda: scan_task_files(lore_dir))
+        results["parse_cold"], parsed = measure(lambda: (parse_tasks(lore_dir, files=files), parse_adrs(lore_dir))
+        )
+        task_map, adrs = parsed
+
+        cache = ParseCache()
+        parse_tasks(lore_dir, cache, files=files)
+        results["parse_warm"], _ = measure(lambda: parse_tasks(lore_dir, cache, files=files))
+
+        results["compute_blocks"], blocks = measure(lambda: compute_blocks(task_map))
+        results["task_graph"], graph = measure(lambda: TaskGraph(task_map))
+        results["generate_readme"], _ = measure(lambda: generate_readme(task_map, adrs, blocks, graph=graph))
+        results["generate_next"], _ = measure(lambda: generate_next(task_map, graph))
+
+        rng = random.Random(1)
+        lookups = [str(rng.randint(1, tasks)) for _ in range(100)]
+        TaskIdIndex.rebuild(lore_dir, files)
+        results["find_task"], _ = measure(lambda: [find_task(lore_dir, task_id) for task_id in lookups])
+
+        index = SearchIndex(lore_dir)
+        results["search_build"], _ = measure(index.update)
+        results["search_update"], _ = measure(index.update)
+        results["search_query"], _ = measure(lambda: index.search("synthetic research batch", 10))
+
+        results["validate_cold"], _ = measure(lambda: run_validation(lore_dir))
+        results["validate_warm"], _ = measure(lambda: run_validation(lore_dir))
+
+        results["timeline_cold"], _ = measure(lambda: load_timeline(lore_dir))
+        results["timeline_query"], _ = measure(lambda: list(iter_timeline(lore_dir, "2026-01-08", "2026-01-14", ["bench"])))
+
+        session_dir = lore_dir / "0-session"
+        team = load_team(session_dir)
+        (session_dir / "current-user.md").write_text(generate_current_user_md("bench", team["bench"], team))
+        current = next(lore_dir.glob("1-tasks/active/*/README.md"), None) or files[0][2]
+        (session_dir / "current-task.md").symlink_to(os.path.relpath(current, session_dir))
+        results["digest_cold"], _ = measure(lambda: session_digest(lore_dir))
+        results["digest_warm"], _ = measure(lambda: session_digest(lore_dir))
+
+        results["catalog_build"], _ = measure(lambda: sync_catalog(lore_dir))
+        results["catalog_sync"], _ = measure(lambda: sync_catalog(lore_dir))
+        results["catalog_load"], _ = measure(lambda: catalog_index(lore_dir))
+
+        for phase, metrics in results.items():
+            print(f"  {phase:16s} {metrics['ms']:10.2f} ms {metrics['fs_calls']:8d} fs calls {metrics['rss_mb']:8.1f} MB peak RSS")
+        return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List regressions of results against baseline.
+
+    Times may grow by tolerance (plus 5 ms for noise on tiny phases) and peak
+    RSS by tolerance; filesystem call counts are deterministic and may grow by
+    at most 10%.
+    """
+    regressions = []
+    for size, phases in results.items():
+        for phase, metrics in phases.items():
+            base = baseline.get(size, {}).get(phase)
+            if not base:
+                continue
+            if metrics["ms"] > base["ms"] * tolerance + 5:
+                regressions.append(f"{size}/{phase}: {metrics['ms']} ms vs baseline {base['ms']} ms")
+            if metrics["fs_calls"] > base["fs_calls"] * 1.1:
+                regressions.append(f"{size}/{phase}: {metrics['fs_calls']} fs calls vs baseline {base['fs_calls']}")
+            if base["rss_mb"] and metrics["rss_mb"] > base["rss_mb"] * tolerance:
+                regressions.append(f"{size}/{phase}: {metrics['rss_mb']} MB peak RSS vs baseline {base['rss_mb']} MB")
+    return regressions
+
+
+def bench_scale(sizes: str = "100,10000", baseline: str = "", save_baseline: str = "", tolerance: str = "1.5") -> int:
+    """Benchmark scan/parse/graph/render/lookup phases on synthetic trees."""
+    results = {}
+    for size in sizes.split(","):
+        results[size.strip()] = bench_size(int(size))
+
+    if save_baseline:
+        Path(save_baseline).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline to {save_baseline}")
+
+    if baseline:
+        regressions = compare(results, json.loads(Path(baseline).read_text()), float(tolerance))
+        if regressions:
+            print("REGRESSIONS:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print(f"No regressions against {baseline}")
+    return 0
+
+
+# ============================================================================
+# Record memory
+# ============================================================================
+
+def retained_bytes(build) -> tuple[object, int]:
+    """Run build under tracemalloc, returning its result and the memory still held."""
+    tracemalloc.start()
+    try:
+        result = build()
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, held
+
+
+def bench_records(tasks: int = 100000) -> int:
+    """Compare memory of parsed tasks held as TaskRecord vs plain dicts.
+
+    Both models are built from the same parsed data (JSON, so neither shares
+    strings with the parser's output) and measured separately.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        lore_dir = make_tree(Path(tmp), tasks)
+        parsed = parse_tasks(lore_dir, jobs=0)
+    text = json.dumps([task.to_dict() for task in parsed.values()])
+    del parsed
+
+    dicts, dict_bytes = retained_bytes(lambda: {data["id"]: data for data in json.loads(text)})
+    del dicts
+    records, record_bytes = retained_bytes(
+        lambda: {data["id"]: TaskRecord.from_dict(data) for data in json.loads(text)}
+    )
+    del records
+
+    print(f"records: {tasks} tasks")
+    print(f"  dict        {dict_bytes / 2**20:8.1f} MB {dict_bytes / tasks:8.0f} B/task")
+    print(f"  TaskRecord  {record_bytes / 2**20:8.1f} MB {record_bytes / tasks:8.0f} B/task")
+    print(f"  reduction   {1 - record_bytes / dict_bytes:8.1%}")
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    """Run a benchmark by name."""
+    args = argv[1:]
+    name = args[0] if args else "reader"
+    options = {}
+    for flag, value in zip(args[1::2], args[2::2]):
+        options[flag.lstrip("-").replace("-", "_")] = value
+
+    if name == "reader":
+        return bench_reader(**{key: int(value) for key, value in options.items()})
+    if name == "imports":
+        return bench_imports(**{key: int(value) for key, value in options.items()})
+    if name == "scale":
+        return bench_scale(**options)
+    if name == "records":
+        return bench_records(**{key: int(value) for key, value in options.items()})
+
+    print(f"Unknown benchmark: {name}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,355 @@
+"""
+Lore Framework Parse Cache
+
+On-disk cache of parsed task and ADR records stored in lore/0-session/.cache/.
+Entries are keyed by path relative to lore/ and validated by mtime + size,
+with a content-hash fallback so touched-but-unchanged files skip re-parsing.
+The last computed blocks map is stored too, so single-file updates can patch
+the index state instead of rebuilding it.
+"""
+
+import os
+import re
+import json
+import filecmp
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable
+
+from . import stats
+from .reader import read_head
+from .records import decode_record, encode_record
+
+CACHE_VERSION = 6
+CACHE_FILE = "parse-cache.json"
+
+# progress(phase, done, total), called by long-running loads and scans
+Progress = Callable[[str, int, int], None]
+PROGRESS_STEPS = 20
+
+# Caches loaded in this process, reused while the file on disk is unchanged
+_loaded: dict[Path, "ParseCache"] = {}
+
+# Status directories in the order scan_task_files() visits them
+SCAN_STATUS_DIRS = ("active", "blocked", "archive", "backlog")
+
+
+def get_cache_dir(lore_dir: Path) -> Path:
+    """Get cache directory path (inside 0-session/, which is gitignored)."""
+    return lore_dir / "0-session" / ".cache"
+
+
+def scan_position(key: str) -> tuple[int, str]:
+    """Sort key placing a lore/-relative task or ADR path where a full scan visits it.
+
+    Tasks go by status directory, then by entry name within it; ADRs by name.
+    """
+    parts = key.split("/")
+    if parts[0] == "1-tasks" and len(parts) > 2:
+        status = parts[1]
+        rank = SCAN_STATUS_DIRS.index(status) if status in SCAN_STATUS_DIRS else len(SCAN_STATUS_DIRS)
+        return rank, parts[2]
+    return 0, parts[-1]
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Write file via temp file + rename so readers never see partial content."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path: Path, content: str, volatile: re.Pattern | None = None) -> bool:
+    """Atomically write content unless the file already holds it. Returns True if written.
+
+    Lines matching volatile (e.g. a generation timestamp) are ignored when
+    comparing, so regenerating unchanged output leaves the file untouched.
+    """
+    def digest(text: str) -> str:
+        if volatile is not None:
+            text = volatile.sub("", text)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    try:
+        if digest(path.read_text()) == digest(content):
+            stats.count("unchanged")
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    write_atomic(path, content)
+    stats.count("written")
+    stats.count("bytes_written", len(content))
+    return True
+
+
+def write_lines_if_changed(path: Path, lines: Iterable[str]) -> bool:
+    """Stream lines to a temp file and rename it over path unless identical.
+
+    Lines are written as they are produced, so memory use does not depend on
+    the file size. Returns True if path was written.
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w") as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+
+    if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+        tmp_path.unlink()
+        stats.count("unchanged")
+        return False
+
+    os.replace(tmp_path, path)
+    stats.count("written")
+    return True
+
+
+class ParseCache:
+    """Parsed frontmatter records keyed by path, validated by file stat."""
+
+    def __init__(self, path: Path | None = None, entries: dict | None = None, blocks: dict | None = None):
+        self.path = path
+        self.entries = entries or {}
+        self.blocks = blocks
+        self.seen = set()
+        self.dirty = False
+        self.file_mtime_ns = None
+        self.lock = threading.RLock()
+
+    @classmethod
+    def load(cls, lore_dir: Path, name: str = CACHE_FILE) -> "ParseCache":
+        """Load cache file name for lore_dir. Without 0-session/ the cache is memory-only."""
+        if not (lore_dir / "0-session").exists():
+            return cls()
+
+        path = get_cache_dir(lore_dir) / name
+        try:
+            file_mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            file_mtime_ns = None
+
+        # Long-lived processes (MCP server) keep the parsed cache in memory
+        loaded = _loaded.get(path)
+        if loaded and loaded.file_mtime_ns == file_mtime_ns:
+            return loaded
+
+        cache = cls(path)
+        try:
+            text = path.read_text()
+            stats.count("read")
+            stats.count("bytes_read", len(text))
+            data = json.loads(text)
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                cache = cls(path, data.get("files") or {}, data.get("blocks"))
+                if name == CACHE_FILE:
+                    for key, entry in cache.entries.items():
+                        entry["record"] = decode_record(key, entry["record"])
+        except (OSError, ValueError):
+            pass
+
+        cache.file_mtime_ns = file_mtime_ns
+        _loaded[path] = cache
+        return cache
+
+    def get(self, key: str, file_path: Path, build: Callable[[bytes], dict | None]) -> dict | None:
+        """Return cached record for file_path, calling build(head) only on change.
+
+        The content hash covers the frontmatter head the record is built from,
+        so body-only edits never trigger a re-parse.
+        """
+        self.seen.add(key)
+        st = file_path.stat()
+        entry = self.entries.get(key)
+        stats.count("stat")
+
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            stats.count("skipped")
+            return entry["record"]
+
+        head = read_head(file_path)
+        digest = hashlib.sha256(head).hexdigest()
+        stats.count("read")
+        stats.count("bytes_read", len(head))
+
+        if entry and entry["sha256"] == digest:
+            stats.count("skipped")
+            record = entry["record"]
+        else:
+            stats.count("parsed")
+            record = build(head)
+
+        self.entries[key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "record": record,
+        }
+        self.dirty = True
+        return record
+
+    def discard(self, key: str) -> dict | None:
+        """Drop entry for key, returning its record."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.dirty = True
+        return entry["record"]
+
+    def records(self, prefix: str) -> dict:
+        """Cached records under a lore/ subdirectory, keyed by record ID.
+
+        A duplicate ID resolves to the file a full scan parses last (see
+        scan_position), whatever order the entries were cached in.
+        """
+        records = {}
+        keys = {}
+        for key, entry in self.entries.items():
+            record = entry["record"]
+            if not key.startswith(prefix) or not record:
+                continue
+            record_id = record["id"]
+            if record_id in keys and scan_position(keys[record_id]) > scan_position(key):
+                continue
+            keys[record_id] = key
+            records[record_id] = record
+        return records
+
+    def save(self, prune: bool = True) -> None:
+        """Persist cache. With prune, drop entries for files not seen this run."""
+        if prune:
+            stale = [key for key in self.entries if key not in self.seen]
+            for key in stale:
+                del self.entries[key]
+            self.dirty = self.dirty or bool(stale)
+
+        if not self.path or not self.dirty:
+            return
+
+        self.path.parent.mkdir(exist_ok=True)
+        data = {"version": CACHE_VERSION, "files": self.entries, "blocks": self.blocks}
+        write_atomic(self.path, json.dumps(data, default=encode_record))
+        self.dirty = False
+        self.file_mtime_ns = self.path.stat().st_mtime_ns
+
+
+def cached_entries(lore_dir: Path) -> int:
+    """Number of records held in memory by the caches loaded for lore_dir."""
+    cache_dir = get_cache_dir(lore_dir)
+    return sum(len(cache.entries) for path, cache in list(_loaded.items()) if path.parent == cache_dir)
+
+
+def forget(lore_dir: Path) -> None:
+    """Drop the in-memory caches for lore_dir (files on disk stay)."""
+    cache_dir = get_cache_dir(lore_dir)
+    for path in [path for path in _loaded if path.parent == cache_dir]:
+        del _loaded[path]
+
+
+def load_record(
+    lore_dir: Path,
+    file_path: Path,
+    build: Callable[[bytes], dict | None],
+    cache: ParseCache | None = None,
+) -> dict | None:
+    """Build a record from file_path's frontmatter head, going through cache when given."""
+    if cache is None:
+        head = read_head(file_path)
+        stats.count("read")
+        stats.count("bytes_read", len(head))
+        stats.count("parsed")
+        return build(head)
+    key = file_path.relative_to(lore_dir).as_posix()
+    return cache.get(key, file_path, build)
+
+
+# LORE_FRAMEWORK_* values set for the current command only (see delegate.py)
+_env_overrides: contextvars.ContextVar[dict | None] = contextvars.ContextVar("env_overrides", default=None)
+
+
+def env_setting(name: str, default: str = "") -> str:
+    """Value of a LORE_FRAMEWORK_* setting: the current command's override, else the environment."""
+    overrides = _env_overrides.get()
+    if overrides is not None and name in overrides:
+        value = overrides[name]
+        return default if value is None else value
+    return os.environ.get(name, default)
+
+
+@contextmanager
+def env_overrides(values: dict):
+    """Make env_setting() see values (None meaning unset) in this thread for the block."""
+    token = _env_overrides.set(values)
+    try:
+        yield
+    finally:
+        _env_overrides.reset(token)
+
+
+def resolve_jobs(jobs: int | None = None) -> int:
+    """Worker count: explicit value, else LORE_FRAMEWORK_JOBS, else 1 (serial).
+
+    0 means one worker per CPU.
+    """
+    if jobs is None:
+        try:
+            jobs = int(env_setting("LORE_FRAMEWORK_JOBS", "1"))
+        except ValueError:
+            jobs = 1
+    if jobs <= 0:
+        jobs = min(32, os.cpu_count() or 1)
+    return jobs
+
+
+def load_records(
+    lore_dir: Path,
+    sources: list[tuple[Path, Callable[[bytes], dict | None]]],
+    cache: ParseCache | None = None,
+    jobs: int | None = None,
+    progress: Progress | None = None,
+    phase: str = "parse",
+) -> list[dict]:
+    """Load records for (file, build) pairs, fanning out across a thread pool.
+
+    Output follows input order regardless of jobs. Files that fail to read or
+    parse are skipped. progress, if given, is called as progress(phase, done,
+    total) about every 5% of files; an exception it raises (cancellation)
+    stops the load.
+    """
+    def load(source: tuple[Path, Callable[[bytes], dict | None]]) -> dict | None:
+        file_path, build = source
+        try:
+            return load_record(lore_dir, file_path, build, cache)
+        except Exception:
+            return None
+
+    def report(loaded) -> list:
+        if progress is None:
+            return list(loaded)
+        total = len(sources)
+        step = max(1, total // PROGRESS_STEPS)
+        records = []
+        for done, record in enumerate(loaded, 1):
+            records.append(record)
+            if done % step == 0 or done == total:
+                progress(phase, done, total)
+        return records
+
+    jobs = resolve_jobs(jobs)
+    if jobs > 1 and len(sources) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Workers count into the caller's span
+        with ThreadPoolExecutor(max_workers=jobs, initializer=stats.attach, initargs=(stats.current(),)) as pool:
+            try:
+                records = report(pool.map(load, sources))
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+    else:
+        records = report(load(source) for source in sources)
+
+    return [record for record in records if record]
@@ -0,0 +1,400 @@
+"""
+Lore Framework SQLite Catalog
+
+Optional local SQLite catalog of task, ADR and note frontmatter, including
+every `history` entry, in lore/0-session/.cache/catalog.sqlite. It is enabled
+with generate-index --catalog or LORE_FRAMEWORK_CATALOG=1. When enabled,
+generate-index syncs it and renders README.md/next-tasks.md from it. The
+`sql` command and the `lore_framework_sql` tool run read-only SQL against it.
+
+Sync is incremental: the `files` table remembers each source file's
+mtime/size, and only new or changed files are re-read. Their rows are then
+replaced in one transaction. Without 0-session/ the catalog is kept in memory.
+
+Tables (paths are relative to the project, like task record paths):
+    files(path, kind, mtime_ns, size)
+    tasks(path, id, title, type, status, updated)
+    task_blockers(task_path, blocker_id, seq)
+    task_adrs(task_path, adr_id, seq)
+    adrs(path, id, title, status)
+    adr_tasks(adr_path, task_id, seq)
+    notes(path, task_id, task_dir, title, type, status)
+    tags(path, tag, seq)
+    history(path, kind, seq, date, status, who, note, by, reason)
+"""
+
+import os
+import sqlite3
+import threading
+from functools import partial
+from pathlib import Path
+
+from . import stats
+from .cache import Progress, get_cache_dir, load_records
+from .core import scan_task_files, make_task_record, make_adr_record, compute_blocks, list_of_strings, extract_title
+from .lineage import scan_note_files
+from .reader import parse_head
+from .records import TaskRecord, AdrRecord
+from .task_ids import TaskIdIndex
+
+CATALOG_FILE = "catalog.sqlite"
+CATALOG_VERSION = 1
+DEFAULT_LIMIT = 200
+
+SCHEMA = """
+CREATE TABLE files (path TEXT PRIMARY KEY, kind TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL);
+CREATE TABLE tasks (path TEXT PRIMARY KEY, id TEXT NOT NULL, title TEXT, type TEXT, status TEXT, updated TEXT);
+CREATE INDEX tasks_id ON tasks (id);
+CREATE INDEX tasks_status ON tasks (status, type);
+CREATE TABLE task_blockers (task_path TEXT NOT NULL, blocker_id TEXT NOT NULL, seq INTEGER NOT NULL);
+CREATE INDEX task_blockers_path ON task_blockers (task_path);
+CREATE INDEX task_blockers_blocker ON task_blockers (blocker_id);
+CREATE TABLE task_adrs (task_path TEXT NOT NULL, adr_id TEXT NOT NULL, seq INTEGER NOT NULL);
+CREATE INDEX task_adrs_path ON task_adrs (task_path);
+CREATE INDEX task_adrs_adr ON task_adrs (adr_id);
+CREATE TABLE adrs (path TEXT PRIMARY KEY, id TEXT NOT NULL, title TEXT, status TEXT);
+CREATE INDEX adrs_id ON adrs (id);
+CREATE TABLE adr_tasks (adr_path TEXT NOT NULL, task_id TEXT NOT NULL, seq INTEGER NOT NULL);
+CREATE INDEX adr_tasks_path ON adr_tasks (adr_path);
+CREATE INDEX adr_tasks_task ON adr_tasks (task_id);
+CREATE TABLE notes (path TEXT PRIMARY KEY, task_id TEXT, task_dir TEXT, title TEXT, type TEXT, status TEXT);
+CREATE INDEX notes_task ON notes (task_id);
+CREATE TABLE tags (path TEXT NOT NULL, tag TEXT NOT NULL, seq INTEGER NOT NULL);
+CREATE INDEX tags_path ON tags (path);
+CREATE INDEX tags_tag ON tags (tag);
+CREATE TABLE history (
+    path TEXT NOT NULL, kind TEXT NOT NULL, seq INTEGER NOT NULL,
+    date TEXT, status TEXT, who TEXT, note TEXT, by TEXT, reason TEXT
+);
+CREATE INDEX history_path ON history (path);
+CREATE INDEX history_status ON history (kind, status, date);
+"""
+
+# (table, path column) pairs cleared when a source file changes
+PATH_COLUMNS = [
+    ("files", "path"),
+    ("tasks", "path"),
+    ("task_blockers", "task_path"),
+    ("task_adrs", "task_path"),
+    ("adrs", "path"),
+    ("adr_tasks", "adr_path"),
+    ("notes", "path"),
+    ("tags", "path"),
+    ("history", "path"),
+]
+
+# Statements the read-only SQL tool may run (see sqlite3 set_authorizer)
+READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, getattr(sqlite3, "SQLITE_RECURSIVE", 33)}
+
+# In-memory catalogs (no 0-session/), keyed by lore/ directory
+_memory: dict[Path, sqlite3.Connection] = {}
+_lock = threading.RLock()
+
+
+def get_catalog_path(lore_dir: Path) -> Path | None:
+    """Catalog file path, or None when it can only live in memory."""
+    if not (lore_dir / "0-session").exists():
+        return None
+    return get_cache_dir(lore_dir) / CATALOG_FILE
+
+
+def connect(lore_dir: Path) -> sqlite3.Connection:
+    """Open (creating or migrating) the catalog for lore_dir."""
+    path = get_catalog_path(lore_dir)
+    if path is None:
+        conn = _memory.get(lore_dir)
+        if conn is None:
+            conn = _memory[lore_dir] = sqlite3.connect(":memory:", check_same_thread=False)
+    else:
+        path.parent.mkdir(exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            conn.execute(f'DROP TABLE "{table}"')
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+        conn.commit()
+    return conn
+
+
+def release(lore_dir: Path, conn: sqlite3.Connection) -> None:
+    """Close a connection from connect() unless it is the in-memory catalog."""
+    if _memory.get(lore_dir) is not conn:
+        conn.close()
+
+
+def forget(lore_dir: Path) -> None:
+    """Close the in-memory catalog for lore_dir, if any (it is rebuilt on next use)."""
+    with _lock:
+        conn = _memory.pop(lore_dir, None)
+        if conn is not None:
+            conn.close()
+
+
+def text(value) -> str | None:
+    """Column value for a frontmatter scalar."""
+    return None if value is None else str(value)
+
+
+def history_rows(meta: dict) -> list[tuple]:
+    """(seq, date, status, who, note, by, reason) for each history entry."""
+    history = meta.get("history")
+    rows = []
+    for seq, entry in enumerate(history if isinstance(history, list) else []):
+        if not isinstance(entry, dict):
+            continue
+        by = ", ".join(list_of_strings(entry.get("by"))) or None
+        rows.append((seq, text(entry.get("date")), text(entry.get("status")), text(entry.get("who")),
+                     text(entry.get("note")), by, text(entry.get("reason"))))
+    return rows
+
+
+def build_task_rows(lore_dir: Path, task_path: Path, subdir: str, task_id: str, head: bytes) -> dict | None:
+    """Catalog rows for a task file."""
+    meta, content = parse_head(head)
+    if not meta:
+        return None
+    record = make_task_record(lore_dir, task_path, subdir, task_id, meta, content)
+    return {"kind": "task", "record": record, "history": history_rows(meta)}
+
+
+def build_adr_rows(lore_dir: Path, adr_path: Path, adr_id: str, head: bytes) -> dict | None:
+    """Catalog rows for an ADR file."""
+    meta, content = parse_head(head)
+    if not meta:
+        return None
+    record = make_adr_record(lore_dir, adr_path, adr_id, meta, content)
+    return {"kind": "adr", "record": record, "history": history_rows(meta)}
+
+
+def build_note_rows(lore_dir: Path, task_dir: Path, note_path: Path, head: bytes) -> dict | None:
+    """Catalog rows for a note file."""
+    meta, content = parse_head(head)
+    if not meta:
+        return None
+    project_dir = lore_dir.parent
+    return {
+        "kind": "note",
+        "path": str(note_path.relative_to(project_dir)),
+        "task_id": task_dir.name.split("_")[0],
+        "task_dir": str(task_dir.relative_to(project_dir)),
+        "title": str(meta.get("title") or extract_title(content)),
+        "type": text(meta.get("type")),
+        "status": text(meta.get("status")),
+        "tags": list_of_strings(meta.get("tags")),
+        "history": history_rows(meta),
+    }
+
+
+def scan_sources(lore_dir: Path) -> tuple[dict, list]:
+    """Catalog sources: {project-relative path: (kind, file, build)} and the task scan."""
+    project_dir = lore_dir.parent
+    sources = {}
+
+    task_files = scan_task_files(lore_dir)
+    for subdir, task_id, task_path in task_files:
+        build = partial(build_task_rows, lore_dir, task_path, subdir, task_id)
+        sources[str(task_path.relative_to(project_dir))] = ("task", task_path, build)
+
+    adr_dir = lore_dir / "2-adrs"
+    if adr_dir.exists():
+        for adr_path in sorted(adr_dir.glob("*.md")):
+            if adr_path.name.startswith("_"):
+                continue
+            build = partial(build_adr_rows, lore_dir, adr_path, adr_path.stem.split("_")[0])
+            sources[str(adr_path.relative_to(project_dir))] = ("adr", adr_path, build)
+
+    for task_dir, note_path in scan_note_files(lore_dir):
+        build = partial(build_note_rows, lore_dir, task_dir, note_path)
+        sources[str(note_path.relative_to(project_dir))] = ("note", note_path, build)
+
+    return sources, task_files
+
+
+def insert_rows(conn: sqlite3.Connection, rows: dict) -> None:
+    """Insert the rows of one source file."""
+    record = rows.get("record")
+    if rows["kind"] == "task":
+        path = record.path
+        conn.execute(
+            "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?)",
+            (path, record.id, record.title, record.type, record.status, record.updated),
+        )
+        conn.executemany("INSERT INTO task_blockers VALUES (?, ?, ?)", [(path, b, i) for i, b in enumerate(record.blocked_by)])
+        conn.executemany("INSERT INTO task_adrs VALUES (?, ?, ?)", [(path, a, i) for i, a in enumerate(record.related_adr)])
+        tags = record.tags
+    elif rows["kind"] == "adr":
+        path = record.path
+        conn.execute("INSERT INTO adrs VALUES (?, ?, ?, ?)", (path, record.id, record.title, record.status))
+        conn.executemany("INSERT INTO adr_tasks VALUES (?, ?, ?)", [(path, t, i) for i, t in enumerate(record.related_tasks)])
+        tags = record.tags
+    else:
+        path = rows["path"]
+        conn.execute(
+            "INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?)",
+            (path, rows["task_id"], rows["task_dir"], rows["title"], rows["type"], rows["status"]),
+        )
+        tags = rows["tags"]
+
+    conn.executemany("INSERT INTO tags VALUES (?, ?, ?)", [(path, tag, i) for i, tag in enumerate(tags)])
+    conn.executemany(
+        "INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(path, rows["kind"], *entry) for entry in rows["history"]],
+    )
+
+
+def sync_catalog(lore_dir: Path, jobs: int | None = None, progress: Progress | None = None) -> dict:
+    """Bring the catalog up to date with lore/.
+
+    Returns {"files", "updated", "removed"} counts, the task scan under
+    "task_files" for callers that also rebuild the task ID index, and the
+    source paths in scan order under "paths".
+    """
+    sources, task_files = scan_sources(lore_dir)
+
+    with _lock:
+        conn = connect(lore_dir)
+        try:
+            known = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute("SELECT path, mtime_ns, size FROM files")}
+            stamps = {}
+            for path, (_, file_path, _) in sources.items():
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                stamps[path] = (st.st_mtime_ns, st.st_size)
+            stats.count("stat", len(sources))
+
+            changed = [path for path, stamp in stamps.items() if known.get(path) != stamp]
+            removed = [path for path in known if path not in stamps]
+
+            if progress:
+                progress("scan", len(stamps), len(stamps))
+
+            # Builders return None for files without frontmatter; those still get a files row
+            sources_changed = [(sources[path][1], sources[path][2]) for path in changed]
+            parsed = load_records(lore_dir, sources_changed, None, jobs, progress, "sync catalog")
+
+            with conn:
+                for path in removed + changed:
+                    for table, column in PATH_COLUMNS:
+                        conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (path,))
+                conn.executemany(
+                    "INSERT INTO files VALUES (?, ?, ?, ?)",
+                    [(path, sources[path][0], *stamps[path]) for path in changed],
+                )
+                for rows in parsed:
+                    insert_rows(conn, rows)
+        finally:
+            release(lore_dir, conn)
+
+    return {
+        "files": len(stamps),
+        "updated": len(changed),
+        "removed": len(removed),
+        "task_files": task_files,
+        "paths": list(sources),
+    }
+
+
+def grouped(conn: sqlite3.Connection, sql: str) -> dict[str, list[str]]:
+    """Group (path, value) rows into path -> [values]."""
+    groups = {}
+    for path, value in conn.execute(sql):
+        groups.setdefault(path, []).append(value)
+    return groups
+
+
+def load_catalog(conn: sqlite3.Connection, paths: list[str]) -> tuple[dict, dict]:
+    """Task and ADR records from the catalog, keyed by ID.
+
+    Records are taken in the order of paths (the sync scan), as parse_tasks()
+    and parse_adrs() do, so duplicate IDs resolve to the same file; row order
+    would follow edit order instead.
+    """
+    blockers = grouped(conn, "SELECT task_path, blocker_id FROM task_blockers ORDER BY task_path, seq")
+    task_adrs = grouped(conn, "SELECT task_path, adr_id FROM task_adrs ORDER BY task_path, seq")
+    adr_tasks = grouped(conn, "SELECT adr_path, task_id FROM adr_tasks ORDER BY adr_path, seq")
+    tags = grouped(conn, "SELECT path, tag FROM tags ORDER BY path, seq")
+
+    task_rows = {row[0]: row for row in conn.execute("SELECT path, id, title, type, status, updated FROM tasks")}
+    adr_rows = {row[0]: row for row in conn.execute("SELECT path, id, title, status FROM adrs")}
+
+    tasks = {}
+    adrs = {}
+    for path in paths:
+        if path in task_rows:
+            _, task_id, title, task_type, status, updated = task_rows[path]
+            tasks[task_id] = TaskRecord(
+                task_id, title, task_type, status, path,
+                blockers.get(path, ()), task_adrs.get(path, ()), updated, tags.get(path, ()),
+            )
+        elif path in adr_rows:
+            _, adr_id, title, status = adr_rows[path]
+            adrs[adr_id] = AdrRecord(adr_id, title, status, path, adr_tasks.get(path, ()), tags.get(path, ()))
+
+    return tasks, adrs
+
+
+def catalog_index(lore_dir: Path, jobs: int | None = None, progress: Progress | None = None) -> tuple[dict, dict, dict]:
+    """Sync the catalog and return (tasks, adrs, blocks) rendered from it."""
+    with stats.span("sync"):
+        synced = sync_catalog(lore_dir, jobs, progress)
+        TaskIdIndex.rebuild(lore_dir, synced["task_files"])
+
+    with stats.span("load"), _lock:
+        conn = connect(lore_dir)
+        try:
+            tasks, adrs = load_catalog(conn, synced["paths"])
+        finally:
+            release(lore_dir, conn)
+    with stats.span("blocks"):
+        blocks = compute_blocks(tasks)
+    return tasks, adrs, blocks
+
+
+def read_only(action: int, *args) -> int:
+    """sqlite3 authorizer that only allows reading."""
+    return sqlite3.SQLITE_OK if action in READ_ACTIONS else sqlite3.SQLITE_DENY
+
+
+def run_sql(
+    lore_dir: Path,
+    query: str,
+    limit: int = DEFAULT_LIMIT,
+    sync: bool = True,
+    progress: Progress | None = None,
+) -> dict:
+    """Run one read-only SQL statement against the catalog.
+
+    Syncs the catalog first (unless sync is False). Returns {"columns",
+    "rows", "truncated"}; raises ValueError for invalid or non-read SQL.
+    """
+    if sync:
+        sync_catalog(lore_dir, progress=progress)
+
+    with _lock:
+        path = get_catalog_path(lore_dir)
+        if path is None:
+            conn = connect(lore_dir)
+        else:
+            conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, timeout=30)
+        conn.set_authorizer(read_only)
+        try:
+            cursor = conn.execute(query)
+            columns = [column[0] for column in cursor.description or []]
+            rows = cursor.fetchmany(limit + 1) if limit > 0 else cursor.fetchall()
+        except (sqlite3.Error, sqlite3.Warning) as e:
+            raise ValueError(str(e)) from e
+        finally:
+            conn.set_authorizer(None)
+            if path is not None:
+                conn.close()
+
+    truncated = limit > 0 and len(rows) > limit
+    if truncated:
+        rows = rows[:limit]
+    return {"columns": columns, "rows": [list(row) for row in rows], "truncated": truncated}
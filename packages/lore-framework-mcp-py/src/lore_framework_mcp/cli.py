@@ -10,30 +10,74 @@ Usage:
     lore-framework-mcp show-session
     lore-framework-mcp list-users
     lore-framework-mcp clear-task
-    lore-framework-mcp generate-index [--next-only] [--quiet]
+    lore-framework-mcp generate-index [--next-only] [--quiet] [--changed <path>] [--jobs N]
+                                      [--timestamp now|mtime] [--sharded] [--catalog]
+    lore-framework-mcp query [--kind tasks|adrs|all] [--status S,..] [--type T,..] [--tags T,..]
+                             [--id-min N] [--id-max N] [--blocked-by ID] [--related-adr ID]
+                             [--title TEXT] [--fields F,..] [--offset N] [--limit N] [--json]
+    lore-framework-mcp search <words...> [--limit N] [--offset N] [--json]
+    lore-framework-mcp lineage [<note path>] [--task ID] [--json]
+    lore-framework-mcp timeline [--since DATE] [--until DATE] [--tags T,..] [--task ID]
+                                [--newest-first] [--body] [--limit N] [--json]
+    lore-framework-mcp validate [<path>] [--jobs N] [--json]
+    lore-framework-mcp sql "<select statement>" [--limit N] [--json]
+    lore-framework-mcp sources dedupe [<path>] [--pointers] [--dry-run] [--json]
+    lore-framework-mcp sources materialize <path>
+    lore-framework-mcp batch ["<command>"...] [--json] [--quiet]   (commands from stdin if none given)
+
+Any command also accepts --profile (per-phase timings and counts as JSON on stderr).
 """
 
+import io
 import os
 import sys
 import json
+import shlex
+from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
 
-import yaml
-import frontmatter
-
-from .server import (
+from .core import (
     get_project_dir,
     get_lore_dir,
     get_session_dir,
     load_team,
     generate_current_user_md,
-    find_task,
-    parse_tasks,
-    parse_adrs,
-    compute_blocks,
-    generate_readme,
-    generate_next,
+    find_task_paths,
+    build_index,
+    affects_index,
+    catalog_enabled,
+    write_index,
 )
+from . import stats
+from .cache import ParseCache
+from .delegate import try_delegate
+from .graph import TaskGraph
+from .lineage import note_lineage, format_lineage
+from .query import run_query
+from .search import search_lore
+from .task_ids import TaskIdIndex, format_duplicates
+from .timeline import iter_timeline, format_entry
+from .validate import run_validation, format_validation
+
+
+# Options that take a value, collected into flags["options"]
+VALUE_OPTIONS = {
+    "--kind", "--status", "--type", "--tags", "--id-min", "--id-max", "--blocked-by",
+    "--related-adr", "--title", "--fields", "--offset", "--limit", "--task",
+    "--since", "--until",
+}
+
+# Value options each command accepts (flags["options"] keys)
+COMMAND_OPTIONS = {
+    "query": {
+        "kind", "status", "type", "tags", "id_min", "id_max", "blocked_by",
+        "related_adr", "title", "fields", "offset", "limit",
+    },
+    "search": {"offset", "limit"},
+    "lineage": {"task"},
+    "timeline": {"since", "until", "tags", "task", "limit"},
+    "sql": {"limit"},
+}
 
 
 def parse_args(argv: list[str]) -> tuple[str, list[str], dict]:
@@ -41,15 +85,68 @@ def parse_args(argv: list[str]) -> tuple[str, list[str], dict]:
     args = argv[1:]  # Remove script name
     command = args[0] if args else "help"
     positional = []
-    flags = {"env": False, "next_only": False, "quiet": False}
+    flags = {
+        "env": False,
+        "next_only": False,
+        "quiet": False,
+        "changed": None,
+        "jobs": None,
+        "timestamp": None,
+        "sharded": None,
+        "catalog": None,
+        "json": False,
+        "refresh": False,
+        "profile": False,
+        "newest_first": False,
+        "body": False,
+        "pointers": False,
+        "dry_run": False,
+        "options": {},
+    }
 
-    for i, arg in enumerate(args[1:], 1):
+    rest = iter(args[1:])
+    for arg in rest:
         if arg == "--env":
             flags["env"] = True
         elif arg == "--next-only":
             flags["next_only"] = True
         elif arg in ("--quiet", "-q"):
             flags["quiet"] = True
+        elif arg == "--changed":
+            flags["changed"] = next(rest, None)
+        elif arg.startswith("--changed="):
+            flags["changed"] = arg.split("=", 1)[1]
+        elif arg in ("--jobs", "-j"):
+            flags["jobs"] = next(rest, None)
+        elif arg.startswith("--jobs="):
+            flags["jobs"] = arg.split("=", 1)[1]
+        elif arg == "--sharded":
+            flags["sharded"] = True
+        elif arg == "--catalog":
+            flags["catalog"] = True
+        elif arg == "--timestamp":
+            flags["timestamp"] = next(rest, None)
+        elif arg.startswith("--timestamp="):
+            flags["timestamp"] = arg.split("=", 1)[1]
+        elif arg == "--json":
+            flags["json"] = True
+        elif arg == "--refresh":
+            flags["refresh"] = True
+        elif arg == "--profile":
+            flags["profile"] = True
+        elif arg == "--newest-first":
+            flags["newest_first"] = True
+        elif arg == "--body":
+            flags["body"] = True
+        elif arg == "--pointers":
+            flags["pointers"] = True
+        elif arg == "--dry-run":
+            flags["dry_run"] = True
+        elif arg in VALUE_OPTIONS:
+            flags["options"][arg[2:].replace("-", "_")] = next(rest, None)
+        elif arg.split("=", 1)[0] in VALUE_OPTIONS:
+            name, value = arg.split("=", 1)
+            flags["options"][name[2:].replace("-", "_")] = value
         elif not arg.startswith("-"):
             positional.append(arg)
 
@@ -109,26 +206,33 @@ def cmd_set_task(args: list[str], flags: dict) -> int:
         return 1
 
     task_id = args[0]
-    task_path = find_task(lore_dir, task_id)
+    task_paths = find_task_paths(lore_dir, task_id)
 
-    if not task_path:
+    if not task_paths:
         print(f"Error: Task {task_id} not found", file=sys.stderr)
         return 1
 
+    task_path = task_paths[0]
+    if len(task_paths) > 1:
+        others = ", ".join(os.path.relpath(p, lore_dir) for p in task_paths[1:])
+        print(f"Warning: duplicate task ID {task_id} also at: {others}", file=sys.stderr)
+
     current_task_md = session_dir / "current-task.md"
     current_task_json = session_dir / "current-task.json"
 
-    # Remove existing symlink
-    if current_task_md.exists() or current_task_md.is_symlink():
-        current_task_md.unlink()
+    with stats.span("write"):
+        # Remove existing symlink
+        if current_task_md.exists() or current_task_md.is_symlink():
+            current_task_md.unlink()
 
-    # Create relative symlink
-    relative_path = os.path.relpath(task_path, session_dir)
-    current_task_md.symlink_to(relative_path)
+        # Create relative symlink
+        relative_path = os.path.relpath(task_path, session_dir)
+        current_task_md.symlink_to(relative_path)
 
-    # Write task metadata
-    task_dir = os.path.relpath(task_path.parent, lore_dir)
-    current_task_json.write_text(json.dumps({"id": task_id, "path": task_dir}, indent=2))
+        # Write task metadata
+        task_dir = os.path.relpath(task_path.parent, lore_dir)
+        current_task_json.write_text(json.dumps({"id": task_id, "path": task_dir}, indent=2))
+        stats.count("written", 2)
 
     if not flags["quiet"]:
         print(f"Task: {task_id} -> {relative_path}")
@@ -228,26 +332,354 @@ def cmd_generate_index(flags: dict) -> int:
         print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
         return 1
 
-    tasks = parse_tasks(lore_dir)
-    adrs = parse_adrs(lore_dir)
-    blocks = compute_blocks(tasks)
+    try:
+        jobs = int(flags["jobs"]) if flags["jobs"] is not None else None
+    except ValueError:
+        print(f"Error: --jobs expects a number, got '{flags['jobs']}'", file=sys.stderr)
+        return 1
+
+    if flags["timestamp"] not in (None, "now", "mtime"):
+        print(f"Error: --timestamp expects 'now' or 'mtime', got '{flags['timestamp']}'", file=sys.stderr)
+        return 1
 
-    # Generate next-tasks.md
-    next_content = generate_next(tasks, blocks)
-    next_path = lore_dir / "0-session" / "next-tasks.md"
-    if next_path.parent.exists():
-        next_path.write_text(next_content)
+    changed = Path(flags["changed"]) if flags["changed"] else None
+    if changed and not affects_index(lore_dir, changed):
         if not flags["quiet"]:
-            print(f"Generated {next_path}")
+            print(f"Skipped: {changed} does not affect the index")
+        return 0
 
-    # Generate README.md (unless --next-only)
-    if not flags["next_only"]:
-        readme_content = generate_readme(tasks, adrs, blocks)
-        readme_path = lore_dir / "README.md"
-        readme_path.write_text(readme_content)
+    if catalog_enabled(flags["catalog"]):
+        from .catalog import catalog_index
+
+        # The catalog syncs incrementally by mtime, so --changed needs no special handling
+        tasks, adrs, blocks = catalog_index(lore_dir, jobs)
+    else:
+        with stats.span("load-cache"):
+            cache = ParseCache.load(lore_dir)
+        tasks, adrs, blocks = build_index(lore_dir, cache, changed, jobs)
+
+    # Generate next-tasks.md and README.md (unless --next-only)
+    with stats.span("graph"):
+        graph = TaskGraph(tasks)
+    for path, written in write_index(
+        lore_dir, tasks, adrs, blocks, flags["next_only"], flags["timestamp"], flags["sharded"], graph
+    ):
         if not flags["quiet"]:
-            print(f"Generated {readme_path}")
+            print(f"Generated {path}" if written else f"Unchanged {path}")
+
+    for warning in format_duplicates(TaskIdIndex.load(lore_dir).duplicates()) + graph.warnings():
+        print(warning, file=sys.stderr)
+
+    return 0
+
+
+def cmd_query(flags: dict) -> int:
+    """Query tasks and ADRs from the index."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    options = dict(flags["options"])
+    try:
+        for name in ("id_min", "id_max", "offset", "limit"):
+            if name in options:
+                options[name] = int(options[name])
+    except (TypeError, ValueError):
+        print(f"Error: --{name.replace('_', '-')} expects a number, got '{options[name]}'", file=sys.stderr)
+        return 1
+
+    for name, key in (("status", "statuses"), ("type", "types"), ("tags", "tags"), ("fields", "fields")):
+        if options.get(name):
+            options[key] = [value.strip() for value in options.pop(name).split(",") if value.strip()]
+
+    try:
+        result = run_query(lore_dir, refresh=flags["refresh"], **options)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if flags["json"]:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0
+
+    for item in result["items"]:
+        values = [item.get(field, "") for field in options.get("fields") or ["id", "status", "type", "title"]]
+        print("  ".join(", ".join(map(str, v)) if isinstance(v, list) else str(v) for v in values))
+    if not flags["quiet"]:
+        shown = len(result["items"])
+        print(f"({shown} of {result['total']}, offset {result['offset']})", file=sys.stderr)
+    return 0
+
+
+def cmd_search(args: list[str], flags: dict) -> int:
+    """Full-text search over task bodies, notes, worklogs, sources, ADRs and wiki."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    if not args:
+        print("Error: search query required", file=sys.stderr)
+        return 1
+
+    options = flags["options"]
+    try:
+        limit = int(options.get("limit", 10))
+        offset = int(options.get("offset", 0))
+    except (TypeError, ValueError):
+        print("Error: --limit and --offset expect numbers", file=sys.stderr)
+        return 1
+
+    result = search_lore(lore_dir, " ".join(args), limit, offset)
+
+    if flags["json"]:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0
+
+    for match in result["results"]:
+        print(f"{match['score']:8.3f}  {match['path']}")
+        if match["snippet"]:
+            print(f"          {match['snippet']}")
+    if not flags["quiet"]:
+        print(f"({len(result['results'])} of {result['total']}, offset {offset})", file=sys.stderr)
+    return 0
+
+
+def cmd_lineage(args: list[str], flags: dict) -> int:
+    """Show note lineage (spawned_from / spawns / superseded by)."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    result = note_lineage(lore_dir, args[0] if args else None, flags["options"].get("task"))
+
+    if flags["json"]:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(format_lineage(result) or "No notes found")
+    return 0
+
+
+def cmd_timeline(flags: dict) -> int:
+    """Worklogs across all tasks by date, printed as they are found."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    options = flags["options"]
+    try:
+        limit = int(options.get("limit", 0))
+    except (TypeError, ValueError):
+        print("Error: --limit expects a number", file=sys.stderr)
+        return 1
 
+    entries = iter_timeline(
+        lore_dir,
+        since=options.get("since"),
+        until=options.get("until"),
+        tags=[tag.strip() for tag in options.get("tags", "").split(",") if tag.strip()],
+        task_id=options.get("task"),
+        newest_first=flags["newest_first"],
+        body=flags["body"],
+    )
+
+    # One entry per line (JSON Lines with --json), so long ranges stream
+    shown = 0
+    try:
+        for entry in entries:
+            if limit and shown >= limit:
+                break
+            print(json.dumps(entry, ensure_ascii=False) if flags["json"] else format_entry(entry))
+            shown += 1
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not flags["quiet"] and not flags["json"]:
+        print(f"({shown} worklogs)", file=sys.stderr)
+    return 0
+
+
+def cmd_validate(args: list[str], flags: dict) -> int:
+    """Validate frontmatter of tasks, ADRs, notes and worklogs. Exits 1 on errors."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    try:
+        jobs = int(flags["jobs"]) if flags["jobs"] is not None else None
+    except ValueError:
+        print(f"Error: --jobs expects a number, got '{flags['jobs']}'", file=sys.stderr)
+        return 1
+
+    try:
+        report = run_validation(lore_dir, args[0] if args else None, jobs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if flags["json"]:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    elif not flags["quiet"] or report["errors"]:
+        print(format_validation(report))
+    return 1 if report["errors"] else 0
+
+
+def cmd_sql(args: list[str], flags: dict) -> int:
+    """Run a read-only SQL statement against the catalog."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    if not args:
+        print("Error: SQL statement required", file=sys.stderr)
+        return 1
+
+    from .catalog import DEFAULT_LIMIT, run_sql
+
+    try:
+        limit = int(flags["options"].get("limit", DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        print("Error: --limit expects a number", file=sys.stderr)
+        return 1
+
+    try:
+        result = run_sql(lore_dir, " ".join(args), limit)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if flags["json"]:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0
+
+    print("\t".join(result["columns"]))
+    for row in result["rows"]:
+        print("\t".join("" if value is None else str(value) for value in row))
+    if result["truncated"] and not flags["quiet"]:
+        print(f"(truncated to {limit} rows)", file=sys.stderr)
+    return 0
+
+
+def read_batch(lines) -> list[list[str]]:
+    """Parse batch input: one command per line, shell-quoted or a JSON array of arguments.
+
+    Blank lines and # comments are skipped. Raises ValueError on malformed lines.
+    """
+    commands = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("["):
+            argv = json.loads(line)
+            if not isinstance(argv, list) or not all(isinstance(arg, (str, int, float)) for arg in argv):
+                raise ValueError(f"expected a JSON array of arguments: {line}")
+            argv = [str(arg) for arg in argv]
+        else:
+            argv = shlex.split(line)
+        if argv:
+            commands.append(argv)
+    return commands
+
+
+def run_batch_command(argv: list[str], capture: bool) -> dict:
+    """Run one batch command, returning {"argv", "code"} (plus its output when captured)."""
+    result = {"argv": argv}
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out if capture else sys.stdout), redirect_stderr(err if capture else sys.stderr):
+        if argv[0] == "batch":
+            print("Error: batch cannot be nested", file=sys.stderr)
+            code = 1
+        else:
+            try:
+                code = run_cli(["lore-framework-mcp", *argv])
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                code = 1
+    result["code"] = code
+    if capture:
+        result["stdout"] = out.getvalue()
+        result["stderr"] = err.getvalue()
+    return result
+
+
+def cmd_batch(args: list[str], flags: dict) -> int:
+    """Run several commands in this process. Exits with the first non-zero code."""
+    try:
+        commands = read_batch(args if args else sys.stdin)
+    except ValueError as e:
+        print(f"Error: invalid batch input: {e}", file=sys.stderr)
+        return 1
+
+    if not commands:
+        print("Error: no commands given (pass them as arguments or on stdin)", file=sys.stderr)
+        return 1
+
+    # Commands share this process's caches (parse cache, task ID index, team.yaml),
+    # so only the first one pays for loading them
+    results = []
+    for argv in commands:
+        result = run_batch_command(argv, capture=flags["json"])
+        results.append(result)
+        if not flags["json"] and (result["code"] or not flags["quiet"]):
+            print(f"[exit {result['code']}] {shlex.join(argv)}", file=sys.stderr)
+
+    failed = [result["code"] for result in results if result["code"]]
+    if flags["json"]:
+        print(json.dumps({"results": results, "failed": len(failed)}, indent=2, ensure_ascii=False))
+    return failed[0] if failed else 0
+
+
+def cmd_sources(args: list[str], flags: dict) -> int:
+    """Source store commands: dedupe moves task sources into lore/.store/,
+    materialize turns them back into private copies."""
+    lore_dir = get_lore_dir()
+
+    if not lore_dir.exists():
+        print(f"Error: lore/ directory not found at {lore_dir}", file=sys.stderr)
+        return 1
+
+    if not args or args[0] not in ("dedupe", "materialize") or (args[0] == "materialize" and len(args) < 2):
+        print("Error: expected 'sources dedupe [<path>]' or 'sources materialize <path>'", file=sys.stderr)
+        return 1
+
+    from .sources import dedupe_sources, format_dedupe, materialize_sources
+
+    under = None
+    if len(args) > 1:
+        under = Path(args[1])
+        if not under.is_absolute():
+            under = get_project_dir() / under
+        if not under.exists():
+            print(f"Error: {args[1]} not found", file=sys.stderr)
+            return 1
+
+    if args[0] == "materialize":
+        count = materialize_sources(lore_dir, under)
+        if flags["json"]:
+            print(json.dumps({"materialized": count}))
+        elif not flags["quiet"]:
+            print(f"Materialized {count} source files")
+        return 0
+
+    report = dedupe_sources(lore_dir, under, pointers=flags["pointers"], dry_run=flags["dry_run"])
+
+    if flags["json"]:
+        print(json.dumps(report, indent=2))
+    elif not flags["quiet"]:
+        print(format_dedupe(report))
     return 0
 
 
@@ -266,12 +698,75 @@ Commands:
   list-users          List available users from team.yaml
   clear-task          Clear current task
   generate-index      Regenerate lore/README.md and next-tasks.md
+  query               Filter tasks/ADRs from the index (see options below)
+  search <words>      Full-text search (BM25) over tasks, notes, worklogs,
+                      sources, ADRs and wiki
+  lineage [<note>]    Note lineage: parents, children, ancestors,
+                      descendants, supersession (--task ID for one task)
+  timeline            Worklogs across all tasks by date (--since, --until,
+                      --tags, --task; --body adds the text)
+  sql "<select>"      Read-only SQL over the catalog (tasks, adrs, notes,
+                      history, tags, ...; see README)
+  validate [<path>]   Validate task/ADR/note/worklog frontmatter (one file
+                      or the whole tree); exits 1 on errors
+  sources dedupe [<path>]
+                      Move task sources into the content-addressed store
+                      (lore/.store/) as pointer files or hardlinks;
+                      reports space reclaimed
+  sources materialize <path>
+                      Turn stored sources back into private copies
+                      (before editing a body or image in place)
+  batch ["<cmd>"...]  Run several commands in one process (one per argument,
+                      or one per stdin line; shell-quoted or a JSON array);
+                      reports each exit status
   help                Show this help message
 
 Options:
   --env               Use LORE_SESSION_CURRENT_USER for set-user
   --next-only         Only generate next-tasks.md (skip README.md)
   --quiet, -q         Suppress output
+  --changed <path>    Only re-parse this file and patch the cached index
+  --jobs, -j N        Parser threads for generate-index/validate (0 = one per CPU,
+                      default: LORE_FRAMEWORK_JOBS or 1)
+  --timestamp MODE    README timestamp: now (default) or mtime (newest source
+                      file), default: LORE_FRAMEWORK_TIMESTAMP or now
+  --sharded           Split task tables into lore/index/ shards and keep
+                      README.md small (default: LORE_FRAMEWORK_INDEX=sharded)
+  --catalog           Sync the SQLite catalog and render from it
+                      (default: LORE_FRAMEWORK_CATALOG=1)
+  --profile           Print per-phase timings and file/byte counts as JSON
+                      on stderr (any command)
+
+Query options:
+  --kind KIND         tasks (default), adrs or all
+  --status, --type, --tags LIST
+                      Comma-separated; status/type match any, tags match all
+  --id-min, --id-max N
+                      Numeric ID range (inclusive)
+  --blocked-by ID     Tasks currently blocked by ID
+  --related-adr ID    Tasks linked to ADR ID
+  --title TEXT        Case-insensitive title substring
+  --fields LIST       Only return these fields (e.g. id,title,status)
+  --offset N, --limit N
+                      Pagination (default limit 50, 0 = no limit)
+  --json              Print the result as JSON
+  --refresh           Rescan lore/ before answering
+
+Timeline options:
+  --since, --until DATE
+                      Date range, inclusive: YYYY-MM-DD or Nd (N days ago)
+  --tags LIST         Only worklogs with all of these tags
+  --task ID           Only this task's worklogs
+  --newest-first      Latest first (default: oldest first)
+  --body              Include worklog text (otherwise only frontmatter is read)
+  --limit N           Stop after N worklogs (default: all)
+  --json              One JSON object per line
+
+Sources options:
+  --pointers          Use pointer files for files without frontmatter too
+                      (default: hardlinks where possible)
+  --dry-run           Only report what would be reclaimed
+  --json              Print the report as JSON
 
 MCP Server:
   Run without arguments to start the MCP server (stdio transport).
@@ -279,8 +774,18 @@ MCP Server:
     return 0
 
 
-def run_cli(argv: list[str]) -> int:
-    """Run CLI command."""
+def run_cli(argv: list[str], delegate: bool = True) -> int:
+    """Run CLI command.
+
+    With delegate, set-user/set-task/generate-index/query/search/timeline are
+    forwarded to a running MCP server when one is listening for this lore/
+    directory.
+    """
+    if delegate:
+        code = try_delegate(argv, get_lore_dir())
+        if code is not None:
+            return code
+
     command, args, flags = parse_args(argv)
 
     commands = {
@@ -290,13 +795,34 @@ def run_cli(argv: list[str]) -> int:
         "list-users": cmd_list_users,
         "clear-task": lambda: cmd_clear_task(flags),
         "generate-index": lambda: cmd_generate_index(flags),
+        "query": lambda: cmd_query(flags),
+        "search": lambda: cmd_search(args, flags),
+        "lineage": lambda: cmd_lineage(args, flags),
+        "timeline": lambda: cmd_timeline(flags),
+        "validate": lambda: cmd_validate(args, flags),
+        "sql": lambda: cmd_sql(args, flags),
+        "sources": lambda: cmd_sources(args, flags),
+        "batch": lambda: cmd_batch(args, flags),
         "help": cmd_help,
         "--help": cmd_help,
         "-h": cmd_help,
     }
 
     if command in commands:
-        return commands[command]()
+        unknown = sorted(set(flags["options"]) - COMMAND_OPTIONS.get(command, set()))
+        if unknown:
+            names = ", ".join("--" + name.replace("_", "-") for name in unknown)
+            print(f"Error: {names} not supported by '{command}'", file=sys.stderr)
+            return 1
+
+        if not flags["profile"]:
+            with stats.span(command):
+                return commands[command]()
+
+        with stats.profile() as spans, stats.span(command):
+            code = commands[command]()
+        print(json.dumps(stats.profile_report(spans), indent=2), file=sys.stderr)
+        return code
     else:
         print(f"Unknown command: {command}", file=sys.stderr)
         print('Run with "help" for usage information.', file=sys.stderr)
@@ -0,0 +1,717 @@
+"""
+Lore Framework Core
+
+Pure lore logic shared by the CLI and the MCP server: directory layout, team
+and session helpers, task/ADR scanning and parsing, dependency computation and
+index rendering. Deliberately free of MCP imports so CLI hook invocations
+start fast.
+"""
+
+import os
+import re
+from pathlib import Path
+from datetime import datetime
+from functools import partial
+
+import yaml
+
+from . import stats
+from .cache import ParseCache, Progress, env_setting, load_records, write_if_changed
+from .graph import TaskGraph
+from .reader import parse_head
+from .records import TaskRecord, AdrRecord
+from .task_ids import TaskIdIndex, normalize_task_id
+
+
+def get_project_dir() -> Path:
+    """Get project directory from env or cwd."""
+    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+
+
+def get_lore_dir() -> Path:
+    """Get lore directory path."""
+    return get_project_dir() / "lore"
+
+
+def get_session_dir() -> Path:
+    """Get session directory path."""
+    return get_lore_dir() / "0-session"
+
+
+# team.yaml files loaded in this process: path -> ((mtime_ns, size), team)
+_teams: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def load_team(session_dir: Path) -> dict:
+    """Load team.yaml file (reused while unchanged on disk)."""
+    team_file = session_dir / "team.yaml"
+    try:
+        st = team_file.stat()
+    except OSError:
+        raise FileNotFoundError(f"team.yaml not found at {team_file}") from None
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    loaded = _teams.get(team_file)
+    if loaded and loaded[0] == stamp:
+        return loaded[1]
+
+    with open(team_file, "r") as f:
+        team = yaml.safe_load(f) or {}
+    _teams[team_file] = (stamp, team)
+    return team
+
+
+def generate_current_user_md(user_id: str, user_data: dict, team: dict) -> str:
+    """Generate current-user.md content."""
+    lines = []
+
+    # Frontmatter
+    lines.append("---")
+    lines.append(f"name: {user_id}")
+    if user_data.get("github"):
+        lines.append(f"github: {user_data['github']}")
+    if user_data.get("role"):
+        lines.append(f"role: {user_data['role']}")
+    lines.append("---")
+    lines.append("")
+
+    # Content
+    name = user_data.get("name", user_id)
+    lines.append(f"# Current User: {name}")
+    lines.append("")
+
+    if user_data.get("focus"):
+        lines.append(f"**Focus:** {user_data['focus'].strip()}")
+        lines.append("")
+
+    if user_data.get("prompting"):
+        lines.append("## Communication Preferences")
+        lines.append("")
+        lines.append(user_data["prompting"].strip())
+        lines.append("")
+
+    if user_data.get("note"):
+        lines.append(f"> {user_data['note']}")
+        lines.append("")
+
+    # Other team members
+    other_members = [(k, v) for k, v in team.items() if k != user_id]
+    if other_members:
+        lines.append("---")
+        lines.append("")
+        lines.append("## Rest of Team")
+        lines.append("")
+        lines.append("| Name | Role |")
+        lines.append("|------|------|")
+        for member_id, member_data in other_members:
+            member_name = member_data.get("name", member_id)
+            role = member_data.get("role", "—")
+            lines.append(f"| {member_name} | {role} |")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def find_task(lore_dir: Path, task_id: str) -> Path | None:
+    """Find task file by ID."""
+    paths = find_task_paths(lore_dir, task_id)
+    return paths[0] if paths else None
+
+
+def find_task_paths(lore_dir: Path, task_id: str) -> list[Path]:
+    """Find all task files for an ID (more than one means a duplicate ID).
+
+    Paths are in status directory order: active, blocked, archive, backlog.
+    """
+    with stats.span("find-task"):
+        return TaskIdIndex.load(lore_dir).lookup(task_id)
+
+
+# ============================================================================
+# Index Generation Helpers
+# ============================================================================
+
+def scan_task_files(lore_dir: Path) -> list[tuple[str, str, Path]]:
+    """List (status dir, task ID, task file) for all tasks in 1-tasks/."""
+    files = []
+    tasks_base = lore_dir / "1-tasks"
+
+    for subdir in ["active", "blocked", "archive", "backlog"]:
+        subdir_path = tasks_base / subdir
+        if not subdir_path.exists():
+            continue
+
+        # scandir reports entry types without a stat() per entry; sorted so
+        # duplicate IDs resolve the same way on every run (see scan_position)
+        with os.scandir(subdir_path) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.name.startswith("_"):
+                    continue
+
+                task_path = None
+                if entry.is_file() and entry.name.endswith(".md"):
+                    task_path = Path(entry.path)
+                    task_id = task_path.stem.split("_")[0]
+                elif entry.is_dir():
+                    readme = Path(entry.path) / "README.md"
+                    stats.count("stat")
+                    if readme.exists():
+                        task_path = readme
+                        task_id = entry.name.split("_")[0]
+
+                if not task_path or not task_id.isdigit():
+                    continue
+
+                files.append((subdir, task_id, task_path))
+
+    stats.count("files", len(files))
+    return files
+
+
+def parse_tasks(
+    lore_dir: Path,
+    cache: ParseCache | None = None,
+    jobs: int | None = None,
+    files: list[tuple[str, str, Path]] | None = None,
+    progress: Progress | None = None,
+) -> dict:
+    """Parse all tasks from 1-tasks/ (or the given scan_task_files() result)."""
+    if files is None:
+        files = scan_task_files(lore_dir)
+
+    sources = [
+        (task_path, partial(build_task_record, lore_dir, task_path, subdir, task_id))
+        for subdir, task_id, task_path in files
+    ]
+
+    tasks = {}
+    for task in load_records(lore_dir, sources, cache, jobs, progress, "parse tasks"):
+        tasks[task.id] = task
+    return tasks
+
+
+def build_task_record(lore_dir: Path, task_path: Path, subdir: str, task_id: str, head: bytes) -> TaskRecord | None:
+    """Build task record from the task file's frontmatter head."""
+    meta, content = parse_head(head)
+
+    if not meta:
+        return None
+    return make_task_record(lore_dir, task_path, subdir, task_id, meta, content)
+
+
+def make_task_record(lore_dir: Path, task_path: Path, subdir: str, task_id: str, meta: dict, content: str) -> TaskRecord:
+    """Task record from parsed frontmatter (the status directory overrides `status`)."""
+    status = meta.get("status", "active")
+    if subdir == "archive":
+        status = "completed"
+    elif subdir == "blocked":
+        status = "blocked"
+    elif subdir == "backlog":
+        status = "backlog"
+
+    # Extract blocked_by and last update date from history
+    blocked_by = []
+    updated = ""
+    history = meta.get("history", [])
+    if history and isinstance(history, list) and len(history) > 0:
+        latest = history[-1]
+        updated = str(latest.get("date") or "")
+        if latest.get("status") == "blocked":
+            by = latest.get("by", [])
+            if isinstance(by, list):
+                blocked_by = [str(b) for b in by]
+            elif by:
+                blocked_by = [str(by)]
+
+    return TaskRecord(
+        id=meta.get("id", task_id),
+        title=meta.get("title") or extract_title(content),
+        type=meta.get("type", "FEATURE"),
+        status=status,
+        path=str(task_path.relative_to(lore_dir.parent)),
+        blocked_by=blocked_by,
+        related_adr=list_of_strings(meta.get("related_adr")),
+        updated=updated,
+        tags=list_of_strings(meta.get("tags")),
+    )
+
+
+def parse_adrs(
+    lore_dir: Path,
+    cache: ParseCache | None = None,
+    jobs: int | None = None,
+    progress: Progress | None = None,
+) -> dict:
+    """Parse all ADRs from 2-adrs/."""
+    adrs = {}
+    adr_dir = lore_dir / "2-adrs"
+
+    if not adr_dir.exists():
+        return adrs
+
+    sources = []
+    for item in sorted(adr_dir.glob("*.md")):
+        if item.name.startswith("_"):
+            continue
+        adr_id = item.stem.split("_")[0]
+        sources.append((item, partial(build_adr_record, lore_dir, item, adr_id)))
+
+    for adr in load_records(lore_dir, sources, cache, jobs, progress, "parse ADRs"):
+        adrs[adr.id] = adr
+    return adrs
+
+
+def build_adr_record(lore_dir: Path, adr_path: Path, adr_id: str, head: bytes) -> AdrRecord | None:
+    """Build ADR record from the ADR file's frontmatter head."""
+    meta, content = parse_head(head)
+
+    if not meta:
+        return None
+    return make_adr_record(lore_dir, adr_path, adr_id, meta, content)
+
+
+def make_adr_record(lore_dir: Path, adr_path: Path, adr_id: str, meta: dict, content: str) -> AdrRecord:
+    """ADR record from parsed frontmatter."""
+    return AdrRecord(
+        id=meta.get("id", adr_id),
+        title=meta.get("title") or extract_title(content),
+        status=meta.get("status", "proposed"),
+        path=str(adr_path.relative_to(lore_dir.parent)),
+        related_tasks=list_of_strings(meta.get("related_tasks")),
+        tags=list_of_strings(meta.get("tags")),
+    )
+
+
+def list_of_strings(value) -> list[str]:
+    """Frontmatter list field as strings (scalars become one-item lists)."""
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)] if value else []
+
+
+def extract_title(content: str) -> str:
+    """Extract title from markdown content."""
+    for line in content.split("\n"):
+        if line.startswith("# "):
+            return line[2:].strip()
+    return "Untitled"
+
+
+def resolve_task_id(tasks: dict, task_id: str) -> str | None:
+    """Key of task_id in tasks, matching normalized IDs as TaskGraph does ("1" finds "0001")."""
+    if task_id in tasks:
+        return task_id
+    key = normalize_task_id(task_id)
+    return next((tid for tid in tasks if normalize_task_id(tid) == key), None)
+
+
+def compute_blocks(tasks: dict) -> dict:
+    """Compute which tasks block other tasks."""
+    blocks = {tid: [] for tid in tasks}
+    by_key = {normalize_task_id(tid): tid for tid in tasks}
+
+    for task in tasks.values():
+        for blocker in task.blocked_by:
+            blocker_id = by_key.get(normalize_task_id(blocker))
+            if blocker_id is not None and task.id not in blocks[blocker_id]:
+                blocks[blocker_id].append(task.id)
+
+    return blocks
+
+
+def patch_blocks(blocks: dict, tasks: dict, old: TaskRecord | None, new: TaskRecord | None) -> None:
+    """Update blocks in place after a single task changed from old to new."""
+    if old:
+        for blocker in old.blocked_by:
+            blocker_id = resolve_task_id(blocks, blocker)
+            if blocker_id is not None and old.id in blocks[blocker_id]:
+                blocks[blocker_id].remove(old.id)
+        if old.id not in tasks:
+            blocks.pop(old.id, None)
+
+    if new:
+        if new.id not in blocks:
+            # Task ID appeared for the first time: collect existing dependents
+            key = normalize_task_id(new.id)
+            blocks[new.id] = [
+                t.id for t in tasks.values() if any(normalize_task_id(b) == key for b in t.blocked_by)
+            ]
+        for blocker in new.blocked_by:
+            blocker_id = resolve_task_id(blocks, blocker)
+            if blocker_id is not None and new.id not in blocks[blocker_id]:
+                blocks[blocker_id].append(new.id)
+
+
+def index_source(lore_dir: Path, path: Path) -> tuple[Path, partial, str] | None:
+    """Map a lore/-relative path to (source file, record builder, file ID) if it feeds the index."""
+    parts = path.parts
+    if len(parts) < 2 or parts[-1].startswith("_") or not parts[-1].endswith(".md"):
+        return None
+
+    if parts[0] == "1-tasks" and parts[1] in ["active", "blocked", "archive", "backlog"]:
+        if len(parts) == 3:
+            task_id = Path(parts[2]).stem.split("_")[0]
+        elif len(parts) == 4 and parts[3] == "README.md" and not parts[2].startswith("_"):
+            task_id = parts[2].split("_")[0]
+        else:
+            return None
+        if not task_id.isdigit():
+            return None
+        task_path = lore_dir / path
+        return task_path, partial(build_task_record, lore_dir, task_path, parts[1], task_id), task_id
+
+    if parts[0] == "2-adrs" and len(parts) == 2:
+        adr_path = lore_dir / path
+        adr_id = adr_path.stem.split("_")[0]
+        return adr_path, partial(build_adr_record, lore_dir, adr_path, adr_id), adr_id
+
+    return None
+
+
+def relative_to_lore(lore_dir: Path, path: Path) -> Path | None:
+    """Get path relative to lore/, or None if it lies outside."""
+    try:
+        return Path(path).resolve().relative_to(lore_dir.resolve())
+    except (OSError, ValueError):
+        return None
+
+
+def update_index(lore_dir: Path, changed: Path, cache: ParseCache) -> tuple[dict, dict, dict] | None:
+    """Patch cached index state for a single changed file.
+
+    Returns (tasks, adrs, blocks), or None when a full scan is needed
+    (no previous state, or the path is not a task/ADR file).
+    """
+    rel_path = relative_to_lore(lore_dir, changed)
+    source = index_source(lore_dir, rel_path) if rel_path else None
+    if not source or not cache.entries or cache.blocks is None:
+        return None
+
+    file_path, build, file_id = source
+    key = rel_path.as_posix()
+    is_task = rel_path.parts[0] == "1-tasks"
+    if is_task:
+        TaskIdIndex.load(lore_dir).update(file_id, key, file_path.is_file())
+
+    old = cache.discard(key)
+    new = None
+    if file_path.is_file():
+        try:
+            new = cache.get(key, file_path, build)
+        except Exception:
+            pass
+
+    # A task moved between status dirs leaves a stale entry with the same ID
+    changed_records = []
+    if new:
+        prefix = "1-tasks/" if is_task else "2-adrs/"
+        for other_key, entry in list(cache.entries.items()):
+            record = entry["record"]
+            if other_key != key and other_key.startswith(prefix) and record and record.id == new.id:
+                if not (lore_dir / other_key).exists():
+                    changed_records.append((cache.discard(other_key), None))
+    changed_records.append((old, new))
+
+    tasks = cache.records("1-tasks/")
+    adrs = cache.records("2-adrs/")
+    blocks = cache.blocks
+
+    if is_task:
+        for old_record, new_record in changed_records:
+            patch_blocks(blocks, tasks, old_record, new_record)
+        cache.dirty = True
+
+    return tasks, adrs, blocks
+
+
+def build_index(
+    lore_dir: Path,
+    cache: ParseCache,
+    changed: Path | None = None,
+    jobs: int | None = None,
+    progress: Progress | None = None,
+) -> tuple[dict, dict, dict]:
+    """Parse tasks and ADRs and compute blocks.
+
+    With changed, only that file is re-parsed and the cached state patched;
+    falls back to a full scan when that is not possible. jobs sets the
+    number of parser threads (see resolve_jobs). progress receives scan and
+    parse progress (see load_records).
+    """
+    with cache.lock:
+        if changed is not None:
+            with stats.span("update"):
+                state = update_index(lore_dir, changed, cache)
+                if state is not None:
+                    cache.save(prune=False)
+                    return state
+
+        cache.seen.clear()
+        with stats.span("scan"):
+            task_files = scan_task_files(lore_dir)
+            if progress:
+                progress("scan", len(task_files), len(task_files))
+            TaskIdIndex.rebuild(lore_dir, task_files)
+        with stats.span("parse-tasks"):
+            tasks = parse_tasks(lore_dir, cache, jobs, task_files, progress)
+        with stats.span("parse-adrs"):
+            adrs = parse_adrs(lore_dir, cache, jobs, progress)
+        with stats.span("blocks"):
+            blocks = compute_blocks(tasks)
+        with stats.span("save-cache"):
+            if cache.blocks != blocks:
+                cache.blocks = blocks
+                cache.dirty = True
+            cache.save()
+        return tasks, adrs, blocks
+
+
+def affects_index(lore_dir: Path, changed: Path) -> bool:
+    """Whether a changed path can affect the generated index.
+
+    Paths inside lore/ that are not task or ADR files (notes, worklogs,
+    sources) do not; anything unrecognised is assumed to.
+    """
+    rel_path = relative_to_lore(lore_dir, changed)
+    if rel_path is None or not rel_path.parts:
+        return True
+    return index_source(lore_dir, rel_path) is not None
+
+
+def catalog_enabled(flag: bool | None = None) -> bool:
+    """Whether generate-index should use the catalog (flag, else LORE_FRAMEWORK_CATALOG)."""
+    if flag is not None:
+        return flag
+    return env_setting("LORE_FRAMEWORK_CATALOG").lower() not in ("", "0", "false", "no")
+
+
+# README line that changes on every run; ignored when deciding whether to rewrite
+TIMESTAMP_LINE = re.compile(r"^> Auto-generated on .*$", re.MULTILINE)
+
+
+def newest_source_mtime(lore_dir: Path, tasks: dict, adrs: dict) -> datetime | None:
+    """Newest modification time among task and ADR source files."""
+    project_dir = lore_dir.parent
+    newest = None
+    for record in [*tasks.values(), *adrs.values()]:
+        try:
+            mtime = os.stat(project_dir / record.path).st_mtime
+        except OSError:
+            continue
+        newest = mtime if newest is None else max(newest, mtime)
+    return datetime.fromtimestamp(newest) if newest is not None else None
+
+
+def write_index(
+    lore_dir: Path,
+    tasks: dict,
+    adrs: dict,
+    blocks: dict,
+    next_only: bool = False,
+    timestamp: str | None = None,
+    sharded: bool | None = None,
+    graph: TaskGraph | None = None,
+) -> list[tuple[Path, bool]]:
+    """Write 0-session/next-tasks.md (if 0-session/ exists) and README.md.
+
+    Files are only rewritten (atomically) when their content changed; the
+    README timestamp alone does not count. timestamp is "now" (default) or
+    "mtime" to stamp the README with the newest source file mtime instead,
+    falling back to LORE_FRAMEWORK_TIMESTAMP. With sharded (default:
+    LORE_FRAMEWORK_INDEX=sharded) task tables go to lore/index/ shards and
+    README.md only links to them (see shards.py).
+
+    Returns (path, written) for each index file.
+    """
+    if graph is None:
+        with stats.span("graph"):
+            graph = TaskGraph(tasks)
+    results = []
+
+    next_path = lore_dir / "0-session" / "next-tasks.md"
+    if next_path.parent.exists():
+        with stats.span("render"):
+            content = generate_next(tasks, graph)
+        with stats.span("write"):
+            results.append((next_path, write_if_changed(next_path, content)))
+
+    if not next_only:
+        timestamp = timestamp or env_setting("LORE_FRAMEWORK_TIMESTAMP", "now")
+        generated_at = newest_source_mtime(lore_dir, tasks, adrs) if timestamp == "mtime" else None
+
+        if sharded is None:
+            sharded = env_setting("LORE_FRAMEWORK_INDEX").lower() == "sharded"
+        if sharded:
+            from .shards import write_shards, generate_sharded_readme
+
+            with stats.span("shards"):
+                results.extend(write_shards(lore_dir, tasks, adrs, blocks))
+            with stats.span("render"):
+                content = generate_sharded_readme(tasks, adrs, blocks, generated_at, graph)
+        else:
+            with stats.span("render"):
+                content = generate_readme(tasks, adrs, blocks, generated_at, graph)
+
+        readme_path = lore_dir / "README.md"
+        with stats.span("write"):
+            results.append((readme_path, write_if_changed(readme_path, content, TIMESTAMP_LINE)))
+
+    return results
+
+
+def generate_readme(
+    tasks: dict,
+    adrs: dict,
+    blocks: dict,
+    generated_at: datetime | None = None,
+    graph: TaskGraph | None = None,
+) -> str:
+    """Generate lore/README.md content, stamped with generated_at (default: now)."""
+    graph = graph or TaskGraph(tasks)
+    sections = [readme_header(graph, adrs, generated_at)]
+    sections.extend(ready_section(graph))
+
+    # Task status table
+    sections.append("\n## Task Status\n")
+    sections.extend(TASK_TABLE_HEADER)
+
+    status_order = {"active": 0, "blocked": 1, "backlog": 2, "completed": 3}
+    # Dict keys are the task IDs, so sorting does not format record IDs
+    sorted_ids = sorted(tasks, key=lambda task_id: (status_order.get(tasks[task_id].status, 4), task_id))
+
+    for task_id in sorted_ids:
+        sections.append(task_row(tasks[task_id], blocks))
+
+    # ADR table
+    if adrs:
+        sections.append("\n## Architecture Decision Records\n")
+        sections.extend(ADR_TABLE_HEADER)
+        for adr in sorted(adrs.values(), key=lambda a: a.id):
+            sections.append(adr_row(adr))
+
+    return "\n".join(sections)
+
+
+def readme_header(graph: TaskGraph, adrs: dict, generated_at: datetime | None = None) -> str:
+    """README title, timestamp and Quick Stats table."""
+    date_str = (generated_at or datetime.now()).strftime("%Y-%m-%d %H:%M")
+
+    counts = graph.status_counts
+    active_count = counts["active"]
+    blocked_count = counts["blocked"]
+    backlog_count = counts["backlog"]
+    completed_count = counts["completed"]
+    adr_count = len(adrs)
+
+    return f"""# Lore Index
+
+> Auto-generated on {date_str}. Do not edit manually.
+> Use `lore-framework_generate-index` tool to regenerate.
+
+Quick reference for task dependencies, status, and ADR relationships.
+
+## Quick Stats
+
+| Active | Blocked | Backlog | Completed | ADRs |
+|:------:|:-------:|:-------:|:---------:|:----:|
+| {active_count} | {blocked_count} | {backlog_count} | {completed_count} | {adr_count} |"""
+
+
+TASK_TABLE_HEADER = [
+    "| ID | Title | Type | Status | Blocked By | Blocks | ADRs |",
+    "|:---|:------|:-----|:-------|:-----------|:-------|:-----|",
+]
+ADR_TABLE_HEADER = [
+    "| ID | Title | Status | Related Tasks |",
+    "|:---|:------|:-------|:--------------|",
+]
+
+
+def ready_section(graph: TaskGraph, link=lambda path: path) -> list[str]:
+    """README "Ready to Start" lines (empty if nothing is ready).
+
+    Priority counts every open task a task transitively unblocks.
+    """
+    if not graph.ready:
+        return []
+
+    lines = ["\n## Ready to Start\n\nThese tasks have no blockers (or all blockers completed):\n"]
+    for task in sorted(graph.ready, key=lambda t: t.id):
+        block_count = graph.downstream[task.id]
+        priority = "**HIGH**" if block_count >= 3 else "medium" if block_count >= 1 else "low"
+        lines.append(f"- **Task {task.id}**: [{task.title}]({link(task.path)}) — blocks {block_count} tasks ({priority})")
+    return lines
+
+
+def task_row(task: TaskRecord, blocks: dict, link=lambda path: path) -> str:
+    """Task status table row."""
+    task_id = task.id
+    blocked_by = ", ".join(task.blocked_by) or "—"
+    task_blocks = ", ".join(sorted(blocks.get(task_id, []))) or "—"
+    related_adr = ", ".join(task.related_adr) or "—"
+    status_display = f"**{task.status}**" if task.status == "active" else task.status
+    title = task.title[:35] + "..." if len(task.title) > 35 else task.title
+    return f"| {task_id} | [{title}]({link(task.path)}) | {task.type} | {status_display} | {blocked_by} | {task_blocks} | {related_adr} |"
+
+
+def adr_row(adr: AdrRecord, link=lambda path: path) -> str:
+    """ADR table row."""
+    related = ", ".join(adr.related_tasks) or "—"
+    return f"| {adr.id} | [{adr.title}]({link(adr.path)}) | {adr.status} | {related} |"
+
+
+def generate_next(tasks: dict, graph: TaskGraph | None = None) -> str:
+    """Generate 0-session/next-tasks.md content.
+
+    Ready tasks are ranked by how many open tasks they transitively unblock,
+    then by the length of the dependency chain behind them.
+    """
+    graph = graph or TaskGraph(tasks)
+    counts = graph.status_counts
+
+    lines = [
+        "# Next Tasks",
+        "",
+        "> Auto-generated. Use `lore-framework_generate-index` tool to regenerate.",
+        "> Full index: [README.md](../README.md)",
+        "",
+        f"**Active:** {counts['active']} | **Blocked:** {counts['blocked']} | **Backlog:** {counts['backlog']} | **Completed:** {counts['completed']}",
+        "",
+    ]
+
+    if graph.ready:
+        lines.append("## Ready to Start")
+        lines.append("")
+
+        for task in graph.ranked_ready()[:10]:
+            block_count = graph.downstream[task.id]
+            depth = graph.depth[task.id]
+            priority = " [HIGH]" if block_count >= 3 else ""
+            unblocks = f"unblocks {block_count}" if block_count > 0 else "no blockers"
+            if depth > 2:
+                unblocks += f", critical path {depth}"
+            lines.append(f"- **{task.id}** [{task.title}]({task.path}) — {unblocks}{priority}")
+        lines.append("")
+
+    blocked_tasks = [t for t in tasks.values() if t.status == "blocked"]
+    if blocked_tasks:
+        blocked_ids = ", ".join(sorted(t.id for t in blocked_tasks))
+        lines.append(f"## Blocked ({len(blocked_tasks)})")
+        lines.append("")
+        lines.append(blocked_ids)
+        lines.append("")
+
+    warnings = graph.warnings()
+    if warnings:
+        lines.append("## Dependency Problems")
+        lines.append("")
+        for warning in warnings:
+            lines.append(f"- {warning.removeprefix('Warning: ')}")
+        lines.append("")
+
+    lines.append("---")
+    lines.append("")
+    lines.append("Set current task: use `lore-framework_set-task` tool with task ID")
+    lines.append("")
+
+    return "\n".join(lines)
@@ -0,0 +1,206 @@
+"""
+Lore Framework CLI Delegation
+
+While the MCP server runs it listens on a unix socket in lore/0-session/.cache/.
+CLI invocations of set-user, set-task, generate-index, query, search and timeline are
+forwarded to it, so hooks reuse the warm process and its in-memory caches
+instead of paying interpreter startup and a cold filesystem walk. Without a server the
+CLI runs the command in-process as before.
+
+Protocol: one JSON request line ({"argv": [...], "env": {...}}) answered by
+one JSON line ({"code": int, "stdout": str, "stderr": str}). env carries the
+caller's LORE_FRAMEWORK_* settings that change what a command does (null when
+unset); the server applies them to that command only. Once a request is sent
+the command is never re-run locally: no answer within RESPONSE_TIMEOUT is an
+error, since the server may still be running it.
+"""
+
+import io
+import os
+import sys
+import json
+import socket
+import threading
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from typing import Callable
+
+from .cache import env_overrides, get_cache_dir
+
+SOCKET_NAME = "server.sock"
+DELEGATED_COMMANDS = {"set-user", "set-task", "generate-index", "query", "search", "timeline"}
+CONNECT_TIMEOUT = 0.5
+RESPONSE_TIMEOUT = 120.0
+# Caller settings applied to each delegated command
+FORWARDED_ENV = ("LORE_FRAMEWORK_INDEX", "LORE_FRAMEWORK_CATALOG", "LORE_FRAMEWORK_JOBS", "LORE_FRAMEWORK_TIMESTAMP")
+
+
+def get_socket_path(lore_dir: Path) -> Path:
+    """Get delegation socket path."""
+    return get_cache_dir(lore_dir) / SOCKET_NAME
+
+
+def prepare_argv(argv: list[str]) -> list[str] | None:
+    """Rewrite argv so it means the same thing in the server process.
+
+    Resolves --env from this process's environment and makes --changed
+    absolute. Returns None if the command should run locally.
+    """
+    args = list(argv[1:])
+    if not args or args[0] not in DELEGATED_COMMANDS:
+        return None
+
+    if "--env" in args:
+        user_id = os.environ.get("LORE_SESSION_CURRENT_USER")
+        if not user_id:
+            return None
+        args[args.index("--env")] = user_id
+
+    for i, arg in enumerate(args):
+        if arg == "--changed" and i + 1 < len(args):
+            args[i + 1] = os.path.abspath(args[i + 1])
+        elif arg.startswith("--changed="):
+            args[i] = "--changed=" + os.path.abspath(arg.split("=", 1)[1])
+
+    return [argv[0], *args]
+
+
+def try_delegate(argv: list[str], lore_dir: Path) -> int | None:
+    """Forward a CLI command to a running server. Returns None if not delegated.
+
+    A failure after the request was sent returns 1 instead, so the command
+    does not run twice.
+    """
+    if os.environ.get("LORE_FRAMEWORK_NO_DELEGATE") or not hasattr(socket, "AF_UNIX"):
+        return None
+
+    socket_path = get_socket_path(lore_dir)
+    if not socket_path.exists():
+        return None
+
+    forwarded = prepare_argv(argv)
+    if forwarded is None:
+        return None
+
+    request = {"argv": forwarded, "env": {name: os.environ.get(name) for name in FORWARDED_ENV}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.settimeout(RESPONSE_TIMEOUT)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+        except OSError:
+            return None
+
+        try:
+            with sock.makefile("rb") as stream:
+                response = json.loads(stream.readline())
+            if not isinstance(response, dict):
+                raise ValueError("malformed response")
+        except (OSError, ValueError) as e:
+            print(f"Error: no answer from the lore-framework server ({e}); the command may still be running there", file=sys.stderr)
+            return 1
+
+    if response.get("stdout"):
+        sys.stdout.write(response["stdout"])
+    if response.get("stderr"):
+        sys.stderr.write(response["stderr"])
+    return int(response.get("code", 1))
+
+
+class DelegateServer:
+    """Unix socket listener that runs forwarded CLI commands in-process."""
+
+    def __init__(self, lore_dir: Path, run: Callable[[list[str]], int]):
+        self.socket_path = get_socket_path(lore_dir)
+        self.run = run
+        self.lock = threading.Lock()
+        self.sock = None
+
+    def start(self) -> bool:
+        """Bind the socket and serve in a daemon thread. Returns False if unavailable."""
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+
+        if self.socket_path.exists():
+            if self.is_live():
+                return False
+            self.socket_path.unlink()
+
+        try:
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(str(self.socket_path))
+            sock.listen()
+        except OSError:
+            return False
+
+        self.sock = sock
+        threading.Thread(target=self.serve, name="lore-delegate", daemon=True).start()
+        return True
+
+    def stop(self) -> None:
+        """Close the socket and remove the socket file."""
+        if self.sock is None:
+            return
+        self.sock.close()
+        self.sock = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def is_live(self) -> bool:
+        """Whether another server already answers on the socket path."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                sock.connect(str(self.socket_path))
+                return True
+            except OSError:
+                return False
+
+    def serve(self) -> None:
+        """Accept loop."""
+        while self.sock is not None:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn: socket.socket) -> None:
+        """Run one forwarded command and send back its exit code and output."""
+        with conn:
+            try:
+                with conn.makefile("rb") as stream:
+                    request = json.loads(stream.readline())
+                argv = [str(arg) for arg in request["argv"]]
+                env = {
+                    name: None if value is None else str(value)
+                    for name, value in (request.get("env") or {}).items()
+                    if name in FORWARDED_ENV
+                }
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                return
+
+            if len(argv) < 2 or argv[1] not in DELEGATED_COMMANDS:
+                response = {"code": 1, "stdout": "", "stderr": f"Error: command not delegated: {argv[1:2]}\n"}
+            else:
+                response = self.execute(argv, env)
+
+            try:
+                conn.sendall(json.dumps(response).encode() + b"\n")
+            except OSError:
+                pass
+
+    def execute(self, argv: list[str], env: dict | None = None) -> dict:
+        """Run argv with stdout/stderr captured and the caller's env settings. Commands run one at a time."""
+        out, err = io.StringIO(), io.StringIO()
+        with self.lock, env_overrides(env or {}), redirect_stdout(out), redirect_stderr(err):
+            try:
+                code = self.run(argv)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                code = 1
+        return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
@@ -0,0 +1,243 @@
+"""
+Lore Framework Session Digest
+
+Everything a session starts by reading, in one bundle: the current user, the
+current task's frontmatter and title, the tasks blocking it and the tasks it
+unblocks, its latest worklogs, and the top ready tasks.
+
+The digest is assembled from pieces cached in memory per lore/ directory,
+each validated by the (mtime, size) stamps of the files it was built from:
+
+- user: current-user.md and team.yaml
+- task: the current-task.md link target and the task file
+- worklogs: the task's worklog/ directory and the worklogs returned
+- graph: the parse cache file and README.md, i.e. the index state
+  generate-index (or the watcher) last saved, so blockers and ready tasks
+  match README.md and next-tasks.md
+
+A warm call with nothing changed costs a handful of stat() calls.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+from . import stats
+from .cache import CACHE_FILE, ParseCache, Progress, get_cache_dir
+from .core import build_index, catalog_enabled, extract_title, find_task_paths, load_team
+from .graph import TaskGraph
+from .reader import read_frontmatter, read_head
+from .task_ids import normalize_task_id
+from .timeline import WORKLOG_NAME, build_worklog_record
+
+# Cached pieces per lore/ directory: piece name -> (stamp, value)
+_pieces: dict[Path, dict[str, tuple]] = {}
+_lock = threading.Lock()
+
+
+def stamp(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of path, None if missing."""
+    stats.count("stat")
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def cached(lore_dir: Path, piece: str, key, build):
+    """Value of piece for lore_dir, rebuilt with build() when key() changed.
+
+    The key is taken again after a rebuild, since building may write the
+    files it covers.
+    """
+    pieces = _pieces.setdefault(lore_dir, {})
+    hit = pieces.get(piece)
+    if hit and hit[0] == key():
+        stats.count("skipped")
+        return hit[1]
+    value = build()
+    pieces[piece] = (key(), value)
+    return value
+
+
+def forget(lore_dir: Path) -> None:
+    """Drop the cached digest pieces for lore_dir."""
+    with _lock:
+        _pieces.pop(lore_dir, None)
+
+
+def load_user(session_dir: Path) -> dict | None:
+    """Current user from current-user.md, with name, role and focus from team.yaml."""
+    meta, _ = read_frontmatter(session_dir / "current-user.md")
+    user_id = meta.get("name")
+    if not user_id:
+        return None
+    try:
+        data = load_team(session_dir).get(user_id) or {}
+    except FileNotFoundError:
+        data = {}
+    focus = data.get("focus")
+    return {
+        "id": str(user_id),
+        "name": data.get("name", str(user_id)),
+        "role": data.get("role"),
+        "focus": focus.strip() if isinstance(focus, str) else focus,
+    }
+
+
+def current_task_path(lore_dir: Path) -> Path | None:
+    """Task file current-task.md points to, re-resolved by ID if the task moved."""
+    session_dir = lore_dir / "0-session"
+    link = session_dir / "current-task.md"
+    if not link.is_symlink():
+        return None
+    target = link.resolve()
+    if target.exists():
+        return target
+    try:
+        task_id = json.loads((session_dir / "current-task.json").read_text())["id"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    paths = find_task_paths(lore_dir, str(task_id))
+    return paths[0] if paths else None
+
+
+def load_task(lore_dir: Path, task_path: Path) -> dict:
+    """Current task: ID, title, path and frontmatter."""
+    meta, content = read_frontmatter(task_path)
+    name = task_path.parent.name if task_path.name == "README.md" else task_path.stem
+    return {
+        "id": str(meta.get("id") or name.split("_")[0]),
+        "title": meta.get("title") or extract_title(content),
+        "path": task_path.relative_to(lore_dir.parent).as_posix(),
+        "frontmatter": meta,
+    }
+
+
+def load_worklogs(lore_dir: Path, task_path: Path, limit: int) -> tuple[tuple, list[dict]]:
+    """Latest limit worklogs of a directory task, newest first.
+
+    Returns (stamps of the files read, entries).
+    """
+    worklog_dir = task_path.parent / "worklog"
+    try:
+        with os.scandir(worklog_dir) as entries:
+            names = sorted((e.name for e in entries if WORKLOG_NAME.match(e.name)), reverse=True)
+    except OSError:
+        return (), []
+
+    status = task_path.relative_to(lore_dir / "1-tasks").parts[0]
+    entries = []
+    files = []
+    for name in names[:limit]:
+        path = worklog_dir / name
+        try:
+            record = build_worklog_record(lore_dir, task_path.parent, status, path, read_head(path))
+        except (OSError, ValueError):
+            continue
+        files.append((name, stamp(path)))
+        if record:
+            entries.append(record)
+    entries.sort(key=lambda r: (r["date"], r["session"] or 0, r["path"]), reverse=True)
+    return tuple(files), entries
+
+
+def load_graph(lore_dir: Path, progress: Progress | None = None) -> TaskGraph:
+    """Task graph from the catalog or the parse cache (building the index if there is none yet)."""
+    if catalog_enabled():
+        from .catalog import catalog_index
+
+        tasks, _, _ = catalog_index(lore_dir, progress=progress)
+        return TaskGraph(tasks)
+
+    cache = ParseCache.load(lore_dir)
+    with cache.lock:
+        tasks = cache.records("1-tasks/")
+        if not cache.entries:
+            tasks, _, _ = build_index(lore_dir, cache, progress=progress)
+    return TaskGraph(tasks)
+
+
+def ranked_graph(lore_dir: Path, progress: Progress | None = None) -> tuple[TaskGraph, list]:
+    """(task graph, ready tasks ranked as in next-tasks.md)."""
+    graph = load_graph(lore_dir, progress)
+    return graph, graph.ranked_ready()
+
+
+def graph_id(graph: TaskGraph, task_id: str) -> str:
+    """task_id as keyed in graph ("7" finds "0007")."""
+    if task_id in graph.tasks:
+        return task_id
+    key = normalize_task_id(task_id)
+    return next((tid for tid in graph.tasks if normalize_task_id(tid) == key), task_id)
+
+
+def task_summary(graph: TaskGraph, task_id: str) -> dict:
+    """{"id", "title", "status"} for task_id (title and status None if unknown)."""
+    task = graph.tasks.get(task_id)
+    return {"id": task_id, "title": task.title if task else None, "status": task.status if task else None}
+
+
+def session_digest(
+    lore_dir: Path,
+    worklogs: int = 3,
+    ready: int = 5,
+    progress: Progress | None = None,
+) -> dict:
+    """Session start bundle: {"user", "task", "worklogs", "ready", "counts"}.
+
+    task (None when no task is set) also carries "blocked_by" and "unblocks"
+    as [{"id", "title", "status"}]; ready lists the top ready tasks with the
+    number of open tasks each transitively unblocks.
+    """
+    session_dir = lore_dir / "0-session"
+    with _lock:
+        user = cached(
+            lore_dir, "user",
+            lambda: (stamp(session_dir / "current-user.md"), stamp(session_dir / "team.yaml")),
+            lambda: load_user(session_dir) if (session_dir / "current-user.md").exists() else None,
+        )
+
+        graph, ranked = cached(
+            lore_dir, "graph",
+            lambda: (stamp(get_cache_dir(lore_dir) / CACHE_FILE), stamp(lore_dir / "README.md")),
+            lambda: ranked_graph(lore_dir, progress),
+        )
+
+        task = None
+        recent = []
+        task_path = current_task_path(lore_dir)
+        if task_path is not None:
+            task = cached(lore_dir, "task", lambda: (task_path, stamp(task_path)), lambda: load_task(lore_dir, task_path))
+            task_id = graph_id(graph, task["id"])
+            task = {
+                **task,
+                "blocked_by": [task_summary(graph, b) for b in graph.blockers.get(task_id, [])],
+                "unblocks": [task_summary(graph, d) for d in sorted(graph.dependents.get(task_id, []))],
+            }
+
+            if task_path.name == "README.md":
+                worklog_dir = task_path.parent / "worklog"
+                hit = _pieces[lore_dir].get("worklogs")
+                key = (worklog_dir, stamp(worklog_dir), worklogs)
+                if hit and hit[0][0] == key and all(stamp(worklog_dir / name) == st for name, st in hit[0][1]):
+                    stats.count("skipped")
+                    recent = hit[1]
+                else:
+                    files, recent = load_worklogs(lore_dir, task_path, worklogs)
+                    _pieces[lore_dir]["worklogs"] = ((key, files), recent)
+
+        top = [
+            {"id": t.id, "title": t.title, "status": t.status, "path": t.path, "unblocks": graph.downstream[t.id]}
+            for t in ranked[:ready]
+        ]
+
+    return {
+        "user": user,
+        "task": task,
+        "worklogs": recent,
+        "ready": top,
+        "counts": graph.status_counts,
+    }
@@ -0,0 +1,184 @@
+"""
+Lore Framework Task Graph
+
+Dependency graph over task records, built once per index run. Edges point
+from a blocker to the tasks it blocks (from the latest history entry's `by`).
+Strongly connected components (iterative Tarjan) give cycle detection and a
+topological order of the condensed graph in one linear pass; transitive
+downstream counts and critical-path lengths are then propagated in reverse
+topological order, using int bitsets for the reachable sets. Blocker IDs are
+matched in normalized form ("12" and "0012" are the same task); IDs that match
+no task are reported as dangling.
+"""
+
+from .records import TaskRecord
+from .task_ids import normalize_task_id
+
+STATUSES = ["active", "blocked", "backlog", "completed"]
+
+
+class TaskGraph:
+    """Task dependency graph with precomputed ranking and diagnostics.
+
+    Attributes:
+        dependents: task ID -> IDs it directly blocks
+        status_counts: status -> number of tasks
+        ready: active/blocked tasks whose blockers are all completed
+        order: task IDs in topological order (blockers first)
+        cycles: lists of task IDs that block each other
+        dangling: task ID -> blocked_by IDs that match no task
+        downstream: task ID -> open tasks transitively blocked by it
+        depth: task ID -> open tasks on the longest chain starting at it
+    """
+
+    def __init__(self, tasks: dict):
+        self.tasks = tasks
+        self.status_counts = {status: 0 for status in STATUSES}
+        for task in tasks.values():
+            self.status_counts[task.status] = self.status_counts.get(task.status, 0) + 1
+
+        by_key = {normalize_task_id(task_id): task_id for task_id in tasks}
+        self.dependents = {task_id: [] for task_id in tasks}
+        self.blockers = {task_id: [] for task_id in tasks}
+        self.dangling = {}
+        for task_id in sorted(tasks):
+            for blocker in tasks[task_id].blocked_by:
+                blocker_id = by_key.get(normalize_task_id(blocker))
+                if blocker_id is None:
+                    self.dangling.setdefault(task_id, []).append(str(blocker))
+                elif task_id not in self.dependents[blocker_id]:
+                    self.dependents[blocker_id].append(task_id)
+                    self.blockers[task_id].append(blocker_id)
+
+        self.ready = [
+            task for task_id, task in tasks.items()
+            if task.status in ("active", "blocked")
+            and task_id not in self.dangling
+            and all(tasks[b].status == "completed" for b in self.blockers[task_id])
+        ]
+
+        components = self.strongly_connected()
+        self.cycles = [
+            sorted(component) for component in components
+            if len(component) > 1 or component[0] in self.dependents[component[0]]
+        ]
+        self.cycles.sort()
+        self.order = [task_id for component in reversed(components) for task_id in sorted(component)]
+        self.propagate(components)
+
+    def strongly_connected(self) -> list[list[str]]:
+        """Tarjan's SCC algorithm, iterative. Components come out in reverse topological order."""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in sorted(self.tasks):
+            if root in index:
+                continue
+            work = [(root, iter(self.dependents[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.dependents[child])))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components
+
+    def propagate(self, components: list[list[str]]) -> None:
+        """Compute downstream counts and critical-path depth over the condensed graph.
+
+        Only open tasks that have blockers can be downstream of anything, so
+        only they get a bit; a component's reachable set is dropped once all
+        of its predecessors have consumed it.
+        """
+        bit = {}
+        for task_id, task in self.tasks.items():
+            if self.blockers[task_id] and task.status != "completed":
+                bit[task_id] = 1 << len(bit)
+
+        component_of = {}
+        for i, component in enumerate(components):
+            for task_id in component:
+                component_of[task_id] = i
+
+        incoming = [0] * len(components)
+        for task_id, children in self.dependents.items():
+            for child in children:
+                if component_of[child] != component_of[task_id]:
+                    incoming[component_of[child]] += 1
+
+        reach = [0] * len(components)
+        depth = [0] * len(components)
+        self.downstream = {}
+        self.depth = {}
+
+        # Tarjan emits sinks first, so successors are always done already
+        for i, component in enumerate(components):
+            members = 0
+            open_members = 0
+            for task_id in component:
+                members |= bit.get(task_id, 0)
+                open_members += self.tasks[task_id].status != "completed"
+            reachable = 0
+            longest = 0
+            for task_id in component:
+                for child in self.dependents[task_id]:
+                    j = component_of[child]
+                    if j == i:
+                        continue
+                    reachable |= reach[j]
+                    longest = max(longest, depth[j])
+                    incoming[j] -= 1
+                    if not incoming[j]:
+                        reach[j] = 0
+            if incoming[i]:
+                reach[i] = reachable | members
+            depth[i] = longest + open_members
+
+            cyclic = len(component) > 1 or component[0] in self.dependents[component[0]]
+            below = reachable | (members if cyclic else 0)
+            for task_id in component:
+                self.downstream[task_id] = (below & ~bit.get(task_id, 0)).bit_count()
+                self.depth[task_id] = depth[i]
+
+    def ranked_ready(self) -> list[TaskRecord]:
+        """Ready tasks, most unblocking first (downstream count, then critical path, then ID)."""
+        return sorted(self.ready, key=lambda t: (-self.downstream[t.id], -self.depth[t.id], t.id))
+
+    def warnings(self) -> list[str]:
+        """Human-readable warnings for cycles and dangling blocked_by IDs."""
+        warnings = [f"Warning: dependency cycle between tasks {', '.join(cycle)}" for cycle in self.cycles]
+        warnings += [
+            f"Warning: task {task_id} is blocked by unknown task {', '.join(missing)}"
+            for task_id, missing in sorted(self.dangling.items())
+        ]
+        return warnings
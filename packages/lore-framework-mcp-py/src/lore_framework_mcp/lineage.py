@@ -0,0 +1,279 @@
+"""
+Lore Framework Note Lineage
+
+Index of knowledge lineage between research notes (`notes/` inside task
+directories). Each note's frontmatter is read header-only and reduced to its
+edges: `spawned_from` and `spawns` (top-level, deprecated, or in history
+entries) and `by` on a superseded entry. Paths are resolved relative to the
+task directory (falling back to the note's own directory) and stored relative
+to the project, like task record paths.
+
+Per-note records are persisted in lore/0-session/.cache/lineage-cache.json and
+validated by stat like the parse cache, so only changed notes are re-read.
+Parent/child/supersession adjacency is kept in memory and patched per changed
+note record; ancestor/descendant queries walk it from the queried note.
+
+Each query still lists notes/ and stats every note. Editing a note's lineage
+rewrites the note in place, which changes no directory mtime, so stat is the
+cheapest reliable check without a watcher; headers are re-read only for
+changed notes. The adjacency is not persisted separately: it is derived from
+the cached records in one pass over their edges, which costs less than
+reading it back from a file would.
+"""
+
+import os
+import threading
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+from .cache import ParseCache, Progress, load_records
+from .core import list_of_strings
+from .reader import parse_head
+from .task_ids import normalize_task_id
+
+CACHE_NAME = "lineage-cache.json"
+STATUS_DIRS = ["active", "blocked", "archive", "backlog"]
+
+# Lineage graphs built in this process, keyed by lore/ directory
+_graphs: dict[Path, "LineageGraph"] = {}
+_lock = threading.Lock()
+
+
+def resolve_ref(lore_dir: Path, task_dir: Path, note_path: Path, ref: str) -> str:
+    """Resolve a lineage path to a path relative to the project directory.
+
+    Tries the task directory first (`notes/Q-x.md`), then the note's own
+    directory (`../sources/x.md`). Directories resolve to their README.md.
+    """
+    candidates = [os.path.normpath(base / ref) for base in (task_dir, note_path.parent)]
+    target = next((c for c in candidates if os.path.exists(c)), candidates[0])
+    if os.path.isdir(target):
+        target = os.path.join(target, "README.md")
+    return Path(os.path.relpath(target, lore_dir.parent)).as_posix()
+
+
+def build_note_record(lore_dir: Path, task_dir: Path, note_path: Path, head: bytes) -> dict | None:
+    """Build a lineage record from a note's frontmatter head."""
+    meta, _ = parse_head(head)
+    if not meta:
+        return None
+
+    spawned_from = list_of_strings(meta.get("spawned_from"))
+    spawns = list_of_strings(meta.get("spawns"))
+    superseded_by = None
+    history = meta.get("history")
+    for entry in history if isinstance(history, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        spawned_from += list_of_strings(entry.get("spawned_from"))
+        spawns += list_of_strings(entry.get("spawns"))
+        if entry.get("status") == "superseded" and entry.get("by"):
+            superseded_by = str(entry["by"])
+
+    resolve = partial(resolve_ref, lore_dir, task_dir, note_path)
+    return {
+        "path": note_path.relative_to(lore_dir.parent).as_posix(),
+        "task": task_dir.relative_to(lore_dir.parent).as_posix(),
+        "title": str(meta.get("title") or note_path.stem),
+        "type": meta.get("type"),
+        "status": meta.get("status"),
+        "spawned_from": sorted({resolve(ref) for ref in spawned_from}),
+        "spawns": sorted({resolve(ref) for ref in spawns}),
+        "superseded_by": resolve(superseded_by) if superseded_by else None,
+    }
+
+
+def scan_note_files(lore_dir: Path) -> list[tuple[Path, Path]]:
+    """List (task dir, note file) for every markdown file under a task's notes/."""
+    files = []
+    for status in STATUS_DIRS:
+        status_path = lore_dir / "1-tasks" / status
+        if not status_path.exists():
+            continue
+        with os.scandir(status_path) as entries:
+            task_dirs = [Path(entry.path) for entry in entries if entry.is_dir() and not entry.name.startswith("_")]
+        for task_dir in sorted(task_dirs):
+            for root, dirs, names in os.walk(task_dir / "notes"):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.endswith(".md") and not name.startswith("."):
+                        files.append((task_dir, Path(root) / name))
+    return files
+
+
+class LineageGraph:
+    """Note lineage adjacency: parents, children and supersession edges."""
+
+    def __init__(self, records: list[dict]):
+        self.notes = {}
+        # Edge counts: both ends of a link may declare it (spawns / spawned_from)
+        self.parents = {}
+        self.children = {}
+        self.superseded_by = {}
+        self.supersedes = {}
+        self.update(records)
+
+    def edges(self, record: dict) -> list[tuple[str, str]]:
+        """(parent, child) links a note record declares."""
+        path = record["path"]
+        return [(parent, path) for parent in record["spawned_from"]] + [(path, child) for child in record["spawns"]]
+
+    def link(self, record: dict, delta: int) -> None:
+        """Add (delta 1) or remove (delta -1) the edges a note record declares."""
+        for parent, child in self.edges(record):
+            for edges, node, neighbor in ((self.children, parent, child), (self.parents, child, parent)):
+                counts = edges.setdefault(node, Counter())
+                counts[neighbor] += delta
+                if counts[neighbor] <= 0:
+                    del counts[neighbor]
+                if not counts:
+                    del edges[node]
+
+        path, target = record["path"], record["superseded_by"]
+        if not target:
+            return
+        if delta > 0:
+            self.superseded_by[path] = target
+            self.supersedes.setdefault(target, set()).add(path)
+        else:
+            self.superseded_by.pop(path, None)
+            self.supersedes[target].discard(path)
+            if not self.supersedes[target]:
+                del self.supersedes[target]
+
+    def update(self, records: list[dict]) -> bool:
+        """Patch the adjacency to match records. Returns True if any note changed."""
+        notes = {record["path"]: record for record in records}
+        changed = False
+        for path in self.notes.keys() | notes.keys():
+            old, new = self.notes.get(path), notes.get(path)
+            if old is new or old == new:
+                continue
+            changed = True
+            if old:
+                self.link(old, -1)
+            if new:
+                self.link(new, 1)
+        self.notes = notes
+        return changed
+
+    def walk(self, start: str, edges: dict) -> list[str]:
+        """All nodes reachable from start along edges, nearest first."""
+        seen = {start}
+        order = []
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbor in sorted(edges.get(node, ())):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        order.append(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return order
+
+    def latest(self, path: str) -> str:
+        """Follow superseded_by to the current version of a note."""
+        seen = {path}
+        while path in self.superseded_by and self.superseded_by[path] not in seen:
+            path = self.superseded_by[path]
+            seen.add(path)
+        return path
+
+    def describe(self, path: str) -> dict:
+        """Lineage of one note."""
+        note = self.notes.get(path, {})
+        return {
+            "path": path,
+            "title": note.get("title"),
+            "type": note.get("type"),
+            "status": note.get("status"),
+            "parents": sorted(self.parents.get(path, ())),
+            "children": sorted(self.children.get(path, ())),
+            "ancestors": self.walk(path, self.parents),
+            "descendants": self.walk(path, self.children),
+            "superseded_by": self.superseded_by.get(path),
+            "supersedes": sorted(self.supersedes.get(path, ())),
+            "latest": self.latest(path),
+        }
+
+
+def load_lineage(lore_dir: Path, jobs: int | None = None, progress: Progress | None = None) -> LineageGraph:
+    """Bring the lineage index up to date and return its graph.
+
+    Later loads patch the same graph, so read it while holding _lock.
+    """
+    cache = ParseCache.load(lore_dir, CACHE_NAME)
+    with _lock, cache.lock:
+        cache.seen.clear()
+        sources = [
+            (note_path, partial(build_note_record, lore_dir, task_dir, note_path))
+            for task_dir, note_path in scan_note_files(lore_dir)
+        ]
+        records = load_records(lore_dir, sources, cache, jobs, progress, "read notes")
+        cache.save()
+
+        graph = _graphs.get(lore_dir)
+        if graph is None:
+            graph = _graphs[lore_dir] = LineageGraph(records)
+        else:
+            graph.update(records)
+        return graph
+
+
+def forget(lore_dir: Path) -> None:
+    """Drop the in-memory lineage graph for lore_dir."""
+    with _lock:
+        _graphs.pop(lore_dir, None)
+
+
+def normalize_note_path(lore_dir: Path, path: str) -> str:
+    """Accept absolute, project-relative (lore/...) or lore-relative note paths."""
+    path = Path(path)
+    if path.is_absolute():
+        try:
+            path = path.relative_to(lore_dir.parent)
+        except ValueError:
+            return path.as_posix()
+    elif not path.parts or path.parts[0] != lore_dir.name:
+        path = Path(lore_dir.name) / path
+    if (lore_dir.parent / path).is_dir():
+        path = path / "README.md"
+    return path.as_posix()
+
+
+def note_lineage(
+    lore_dir: Path,
+    path: str | None = None,
+    task_id: str | None = None,
+    progress: Progress | None = None,
+) -> dict:
+    """Lineage for one note, or {"notes": [...]} for every note (of one task, if given)."""
+    graph = load_lineage(lore_dir, progress=progress)
+    if path:
+        path = normalize_note_path(lore_dir, path)
+
+    with _lock:
+        if path:
+            return graph.describe(path)
+
+        notes = sorted(graph.notes)
+        if task_id:
+            key = normalize_task_id(task_id)
+            notes = [note for note in notes if normalize_task_id(Path(graph.notes[note]["task"]).name.split("_")[0]) == key]
+        return {"notes": [graph.describe(note) for note in notes]}
+
+
+def format_lineage(result: dict) -> str:
+    """Human-readable lineage for the CLI."""
+    lines = []
+    for note in result.get("notes", [result]):
+        lines.append(f"{note['path']}" + (f" ({note['type']}, {note['status']})" if note["type"] else ""))
+        for key in ("parents", "children", "ancestors", "descendants", "supersedes"):
+            if note[key]:
+                lines.append(f"  {key}: {', '.join(note[key])}")
+        if note["superseded_by"]:
+            lines.append(f"  superseded_by: {note['superseded_by']} (latest: {note['latest']})")
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""
+Lore Framework Query
+
+Structured task/ADR queries answered from the in-memory index instead of the
+generated README. Records come from the watcher's live model when watch mode
+runs, otherwise from the parse cache that generate-index keeps current (the
+MCP server holds it in memory, so queries do not walk lore/). A cold cache is
+filled once with a full build.
+"""
+
+from pathlib import Path
+
+from .cache import ParseCache, Progress
+from .core import build_index
+from .task_ids import normalize_task_id
+
+KINDS = ["tasks", "adrs", "all"]
+DEFAULT_LIMIT = 50
+
+
+def load_index(lore_dir: Path, refresh: bool = False, progress: Progress | None = None) -> tuple[dict, dict]:
+    """Current (tasks, adrs) for lore_dir. With refresh, rescan the tree first."""
+    if not refresh:
+        from .watch import get_watcher
+
+        watcher = get_watcher(lore_dir)
+        if watcher and watcher.version:
+            with watcher.lock:
+                return watcher.tasks, watcher.adrs
+
+    cache = ParseCache.load(lore_dir)
+    with cache.lock:
+        if refresh or not cache.entries:
+            tasks, adrs, _ = build_index(lore_dir, cache, progress=progress)
+            return tasks, adrs
+        return cache.records("1-tasks/"), cache.records("2-adrs/")
+
+
+def id_number(record_id: str) -> int | None:
+    """Numeric value of a record ID, if it has one."""
+    record_id = normalize_task_id(record_id)
+    return int(record_id) if record_id.isdigit() else None
+
+
+def matches(
+    record: dict,
+    statuses: list[str] | None = None,
+    types: list[str] | None = None,
+    id_min: int | None = None,
+    id_max: int | None = None,
+    blocked_by: str | None = None,
+    related_adr: str | None = None,
+    tags: list[str] | None = None,
+    title: str | None = None,
+) -> bool:
+    """Whether a record passes every given filter.
+
+    Filters on fields a record does not have (e.g. blocked_by on an ADR)
+    exclude it.
+    """
+    if statuses and record.get("status") not in statuses:
+        return False
+    if types and str(record.get("type", "")).upper() not in {t.upper() for t in types}:
+        return False
+    if id_min is not None or id_max is not None:
+        number = id_number(record["id"])
+        if number is None or (id_min is not None and number < id_min) or (id_max is not None and number > id_max):
+            return False
+    if blocked_by is not None:
+        if normalize_task_id(blocked_by) not in {normalize_task_id(b) for b in record.get("blocked_by", [])}:
+            return False
+    if related_adr is not None:
+        if normalize_task_id(related_adr) not in {normalize_task_id(a) for a in record.get("related_adr", [])}:
+            return False
+    if tags and not set(tags) <= set(record.get("tags", [])):
+        return False
+    if title and title.lower() not in str(record.get("title", "")).lower():
+        return False
+    return True
+
+
+def run_query(
+    lore_dir: Path,
+    kind: str = "tasks",
+    fields: list[str] | None = None,
+    offset: int = 0,
+    limit: int = DEFAULT_LIMIT,
+    refresh: bool = False,
+    progress: Progress | None = None,
+    **filters,
+) -> dict:
+    """Filter, sort (by kind, then numeric ID), paginate and project records.
+
+    filters are passed to matches(). Returns {"total", "offset", "limit",
+    "items"}; with kind "all" every item carries a "kind" key.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {', '.join(KINDS)}, got '{kind}'")
+
+    tasks, adrs = load_index(lore_dir, refresh, progress)
+    sources = []
+    if kind in ("tasks", "all"):
+        sources.append(("task", tasks))
+    if kind in ("adrs", "all"):
+        sources.append(("adr", adrs))
+
+    found = []
+    for source_kind, records in sources:
+        hits = [record for record in records.values() if matches(record, **filters)]
+        hits.sort(key=lambda r: (id_number(r["id"]) is None, id_number(r["id"]) or 0, r["id"]))
+        found.extend((source_kind, record) for record in hits)
+
+    page = found[offset:offset + limit] if limit > 0 else found[offset:]
+    items = []
+    for source_kind, record in page:
+        item = dict(record)
+        if kind == "all":
+            item["kind"] = source_kind
+        if fields:
+            item = {field: item[field] for field in fields if field in item}
+        items.append(item)
+
+    return {"total": len(found), "offset": offset, "limit": limit, "items": items}
@@ -0,0 +1,80 @@
+"""
+Lore Framework Frontmatter Reader
+
+Fast reader for the metadata the index needs. Streams a markdown file only up
+to the closing `---` of its YAML frontmatter (continuing to the first `# `
+heading only when no `title` is set) and parses it with the libyaml C loader
+when available. Large task bodies and embedded logs are never read.
+"""
+
+import re
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+BOUNDARY = re.compile(rb"^-{3,}\s*$")
+TITLE_LINE = re.compile(rb"^title:[ \t]*(.*?)[ \t]*$")
+EMPTY_VALUES = {b"", b'""', b"''", b"~", b"null", b"Null", b"NULL"}
+
+
+def has_title(line: bytes) -> bool:
+    """Whether a top-level frontmatter line sets a non-empty title."""
+    match = TITLE_LINE.match(line.rstrip(b"\r\n"))
+    return bool(match) and match.group(1) not in EMPTY_VALUES and not match.group(1).startswith(b"#")
+
+
+def read_head(path: Path) -> bytes:
+    """Read the frontmatter block, plus body lines up to the first heading if untitled.
+
+    Returns b"" when the file has no frontmatter.
+    """
+    with open(path, "rb") as f:
+        line = f.readline()
+        if line.startswith(b"\xef\xbb\xbf"):
+            line = line[3:]
+        while line and not line.strip():
+            line = f.readline()
+
+        if not BOUNDARY.match(line):
+            return b""
+
+        lines = [line]
+        titled = False
+        for line in f:
+            lines.append(line)
+            if BOUNDARY.match(line):
+                break
+            titled = titled or has_title(line)
+        else:
+            return b""  # Unterminated frontmatter
+
+        if not titled:
+            for line in f:
+                lines.append(line)
+                if line.startswith(b"# "):
+                    break
+
+    return b"".join(lines)
+
+
+def parse_head(head: bytes) -> tuple[dict, str]:
+    """Parse read_head() output into (metadata, body text read so far)."""
+    if not head:
+        return {}, ""
+
+    lines = head.splitlines(keepends=True)
+    end = next(i for i in range(1, len(lines)) if BOUNDARY.match(lines[i]))
+
+    meta = yaml.load(b"".join(lines[1:end]), Loader=SafeLoader)
+    body = b"".join(lines[end + 1:]).decode("utf-8").strip()
+    return (meta if isinstance(meta, dict) else {}), body
+
+
+def read_frontmatter(path: Path) -> tuple[dict, str]:
+    """Read and parse frontmatter from a markdown file."""
+    return parse_head(read_head(path))
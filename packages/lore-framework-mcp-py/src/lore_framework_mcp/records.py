@@ -0,0 +1,151 @@
+"""
+Lore Framework Records
+
+Compact in-memory task and ADR records. A long-lived server can hold 100k+
+tasks, so records use __slots__ instead of per-record dicts. Status, type,
+dates, tags and IDs inside list fields are interned, so every record shares
+one string object per distinct value. Canonical zero-padded IDs ("0042") are
+stored as ints. Paths are split into a directory shared by all records in it
+(e.g. lore/1-tasks/archive) and the rest. List fields are tuples.
+
+Records also allow read-only mapping access (record["id"], record.get(),
+dict(record)), so query results and JSON output keep their shape. to_dict()
+is the form persisted in the parse cache.
+"""
+
+import os
+import sys
+
+intern = sys.intern
+
+
+def pack_id(value: str) -> int | str:
+    """Store canonical zero-padded IDs as int, anything else as str."""
+    if value.isdigit() and value == f"{int(value):04d}":
+        return int(value)
+    return value
+
+
+def split_path(path: str) -> tuple[str, str]:
+    """Split a path into (interned shared directory, rest).
+
+    Directory tasks (<dir>/README.md) keep the task directory in the rest,
+    so the shared part is always the status or ADR directory.
+    """
+    directory, name = os.path.split(path)
+    if name == "README.md":
+        directory, task_dir = os.path.split(directory)
+        name = os.path.join(task_dir, name)
+    return intern(directory), name
+
+
+def interned(values) -> tuple[str, ...]:
+    """Tuple of interned strings."""
+    return tuple(intern(str(value)) for value in values)
+
+
+class Record:
+    """Base for slotted records with read-only mapping access over FIELDS."""
+
+    __slots__ = ()
+    FIELDS: tuple[str, ...] = ()
+
+    @property
+    def id(self) -> str:
+        value = self._id
+        return value if value.__class__ is str else f"{value:04d}"
+
+    @property
+    def path(self) -> str:
+        return f"{self._dir}{os.sep}{self._name}" if self._dir else self._name
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self) -> tuple[str, ...]:
+        return self.FIELDS
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """Plain dict form (lists instead of tuples), as stored in the parse cache."""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            data[field] = list(value) if isinstance(value, tuple) else value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Record":
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+
+class TaskRecord(Record):
+    """A task from 1-tasks/."""
+
+    __slots__ = ("_id", "title", "type", "status", "_dir", "_name", "blocked_by", "related_adr", "updated", "tags")
+    FIELDS = ("id", "title", "type", "status", "path", "blocked_by", "related_adr", "updated", "tags")
+
+    def __init__(self, id, title, type, status, path, blocked_by=(), related_adr=(), updated="", tags=()):
+        self._id = pack_id(str(id))
+        self.title = str(title)
+        self.type = intern(str(type))
+        self.status = intern(str(status))
+        self._dir, self._name = split_path(path)
+        self.blocked_by = interned(blocked_by)
+        self.related_adr = interned(related_adr)
+        self.updated = intern(str(updated))
+        self.tags = interned(tags)
+
+
+class AdrRecord(Record):
+    """An ADR from 2-adrs/."""
+
+    __slots__ = ("_id", "title", "status", "_dir", "_name", "related_tasks", "tags")
+    FIELDS = ("id", "title", "status", "path", "related_tasks", "tags")
+
+    def __init__(self, id, title, status, path, related_tasks=(), tags=()):
+        self._id = pack_id(str(id))
+        self.title = str(title)
+        self.status = intern(str(status))
+        self._dir, self._name = split_path(path)
+        self.related_tasks = interned(related_tasks)
+        self.tags = interned(tags)
+
+
+def decode_record(key: str, data: dict | None) -> Record | dict | None:
+    """Record for a parse cache entry loaded from JSON (keyed by lore/-relative path)."""
+    if data is None:
+        return None
+    if key.startswith("1-tasks/"):
+        return TaskRecord.from_dict(data)
+    if key.startswith("2-adrs/"):
+        return AdrRecord.from_dict(data)
+    return data
+
+
+def encode_record(value):
+    """json.dumps default: records as dicts, anything else as str."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
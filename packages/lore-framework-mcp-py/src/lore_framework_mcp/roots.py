@@ -0,0 +1,130 @@
+"""
+Lore Framework Roots
+
+One server process can serve several lore/ trees (packages of a monorepo,
+sibling repositories). Tools take an optional root: a project directory that
+contains lore/, or a lore/ directory itself, with relative paths resolved
+against the default project (CLAUDE_PROJECT_DIR). Each root keeps its own
+in-memory state in the module registries, which are all keyed by lore/
+directory: parse, validate, lineage and timeline caches, task ID index,
+search index, lineage graph, worklog timeline, in-memory catalog and
+session digest pieces.
+
+Roots are kept in least-recently-used order. When more than
+LORE_FRAMEWORK_MAX_ROOTS roots are loaded (default 8), or together they hold
+more than LORE_FRAMEWORK_MAX_ENTRIES cached records (default 200000), idle
+roots are evicted oldest first. Eviction only drops in-memory state; the
+caches in 0-session/.cache/ stay, so the next call reloads them without
+re-parsing. The default root, a watched root and roots with a call in
+progress are never evicted.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import cache, catalog, digest, lineage, search, task_ids, timeline
+from .core import get_lore_dir, get_project_dir
+from .watch import get_watcher
+
+DEFAULT_MAX_ROOTS = 8
+DEFAULT_MAX_ENTRIES = 200_000
+
+# lore/ directory -> calls in progress, least recently used first
+_roots: "OrderedDict[Path, int]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def env_limit(name: str, default: int) -> int:
+    """Positive integer from environment variable name, else default."""
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def resolve_root(root: str | None = None) -> Path:
+    """lore/ directory for a tool's root argument (None: the default project).
+
+    The result may not exist; callers report that as they do for the default.
+    """
+    default = get_lore_dir()
+    if not root:
+        return default
+
+    path = Path(os.path.expanduser(root))
+    if not path.is_absolute():
+        path = get_project_dir() / path
+    path = path.resolve()
+
+    lore_dir = path if path.name == "lore" and not (path / "lore").is_dir() else path / "lore"
+
+    # Same tree as the default root: use the same registry key
+    if lore_dir == default.resolve():
+        return default
+    return lore_dir
+
+
+def forget_root(lore_dir: Path) -> None:
+    """Drop all in-memory state for lore_dir."""
+    cache.forget(lore_dir)
+    task_ids.forget(lore_dir)
+    search.forget(lore_dir)
+    lineage.forget(lore_dir)
+    timeline.forget(lore_dir)
+    catalog.forget(lore_dir)
+    digest.forget(lore_dir)
+
+
+def evict_idle() -> list[Path]:
+    """Evict least recently used idle roots until within the limits. Call with _lock held."""
+    max_roots = env_limit("LORE_FRAMEWORK_MAX_ROOTS", DEFAULT_MAX_ROOTS)
+    max_entries = env_limit("LORE_FRAMEWORK_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+    sizes = {lore_dir: cache.cached_entries(lore_dir) for lore_dir in _roots}
+    count = len(_roots)
+    total = sum(sizes.values())
+
+    default = get_lore_dir()
+    evicted = []
+    for lore_dir, busy in list(_roots.items()):
+        if count <= max_roots and total <= max_entries:
+            break
+        if busy or lore_dir == default or get_watcher(lore_dir):
+            continue
+        forget_root(lore_dir)
+        del _roots[lore_dir]
+        evicted.append(lore_dir)
+        count -= 1
+        total -= sizes[lore_dir]
+    return evicted
+
+
+@contextmanager
+def use_root(lore_dir: Path):
+    """Mark lore_dir most recently used and busy (not evictable) for the block.
+
+    Limits are enforced on entry and again on exit, once the call has
+    loaded whatever it needed.
+    """
+    with _lock:
+        _roots[lore_dir] = _roots.get(lore_dir, 0) + 1
+        _roots.move_to_end(lore_dir)
+        evict_idle()
+    try:
+        yield lore_dir
+    finally:
+        with _lock:
+            _roots[lore_dir] -= 1
+            evict_idle()
+
+
+def loaded_roots() -> list[dict]:
+    """Loaded roots, most recently used first: [{"root", "busy", "entries"}]."""
+    with _lock:
+        return [
+            {"root": str(lore_dir), "busy": busy, "entries": cache.cached_entries(lore_dir)}
+            for lore_dir, busy in reversed(_roots.items())
+        ]
@@ -0,0 +1,465 @@
+"""
+Lore Framework Full-Text Search
+
+Persisted inverted index over the markdown under lore/1-tasks (task bodies,
+notes, worklogs, sources), lore/2-adrs and lore/3-wiki, ranked with BM25.
+
+Stored in lore/0-session/.cache/search/ as segments. index.json holds the
+document table (path, mtime, size, length), the deleted doc ids and the list
+of segments. Each segment has a term dictionary, terms-<generation>.json
+(term -> postings offset and count), and postings-<generation>.bin with
+(doc id, term frequency) uint32 pairs grouped by term, which is memory-mapped
+for queries. Segment files are never modified.
+
+An update re-reads only files whose mtime/size changed and appends their
+postings as a new segment; the old doc ids of changed or removed files are
+marked deleted and skipped when postings are read. Above MAX_SEGMENTS the
+newer segments are merged into one (or all of them, once they outweigh the
+oldest), and once MAX_DELETED_RATIO of the doc ids are deleted everything is
+merged, dropping deleted postings. A watcher can register a change feed
+(set_change_feed) so updates stat only the changed paths instead of walking
+the corpus. Without 0-session/ the index lives in memory only. Sources stored
+as pointer files are indexed with their blob's text (see sources.py).
+"""
+
+import io
+import os
+import re
+import json
+import math
+import mmap
+import heapq
+import threading
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .cache import PROGRESS_STEPS, Progress, get_cache_dir, write_atomic
+from .sources import read_lore_text
+
+INDEX_VERSION = 2
+SEARCH_DIR = "search"
+INDEX_FILE = "index.json"
+SEARCHED_DIRS = ["1-tasks", "2-adrs", "3-wiki"]
+TOKEN = re.compile(r"\w{2,40}")
+SEGMENT_FILE = re.compile(r"^(?:postings-(\d+)\.bin|terms-(\d+)\.json)$")
+SNIPPET_CHARS = 80
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Merge policy
+MAX_SEGMENTS = 8
+MAX_DELETED_RATIO = 0.25
+
+# Indexes loaded in this process, keyed by lore/ directory
+_loaded: dict[Path, "SearchIndex"] = {}
+
+# Change feeds keyed by lore/ directory: feed() returns the lore/-relative
+# paths changed since its last call, or None when it cannot tell
+_feeds: dict[Path, Callable[[], list[str] | None]] = {}
+
+
+def set_change_feed(lore_dir: Path, feed: Callable[[], list[str] | None] | None) -> None:
+    """Register (or with None remove) the change feed updates for lore_dir use."""
+    if feed is None:
+        _feeds.pop(lore_dir, None)
+    else:
+        _feeds[lore_dir] = feed
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens (2-40 characters)."""
+    return TOKEN.findall(text.lower())
+
+
+def make_snippet(text: str, terms: set[str]) -> str:
+    """Text around the first occurrence of any term, whitespace collapsed."""
+    if not terms:
+        return ""
+    match = re.search(r"\b(?:" + "|".join(re.escape(t) for t in sorted(terms)) + r")\b", text, re.IGNORECASE)
+    if not match:
+        return ""
+    start = max(0, match.start() - SNIPPET_CHARS)
+    end = min(len(text), match.end() + SNIPPET_CHARS)
+    snippet = " ".join(text[start:end].split())
+    return ("..." if start else "") + snippet + ("..." if end < len(text) else "")
+
+
+class SearchIndex:
+    """BM25 inverted index with memory-mapped, append-only postings segments."""
+
+    def __init__(self, lore_dir: Path):
+        self.lore_dir = lore_dir
+        self.docs = {}
+        self.deleted = set()
+        self.segments = []
+        self.next_id = 0
+        self.generation = 0
+        self.paths = {}
+        self.lengths = {}
+        self.total_length = 0
+        self.file_mtime_ns = None
+        # Whether docs reflect a full walk done by this instance (a change feed is only enough then)
+        self.walked = False
+        self.lock = threading.RLock()
+
+    @property
+    def directory(self) -> Path | None:
+        if not (self.lore_dir / "0-session").exists():
+            return None
+        return get_cache_dir(self.lore_dir) / SEARCH_DIR
+
+    @classmethod
+    def load(cls, lore_dir: Path) -> "SearchIndex":
+        """Load the persisted index for lore_dir (empty if never built).
+
+        The in-process instance is reused while index.json is unchanged.
+        """
+        index = _loaded.get(lore_dir) or cls(lore_dir)
+        _loaded[lore_dir] = index
+        directory = index.directory
+        if directory is None:
+            return index
+
+        try:
+            file_mtime_ns = (directory / INDEX_FILE).stat().st_mtime_ns
+        except OSError:
+            return index
+        if file_mtime_ns == index.file_mtime_ns:
+            return index
+
+        with index.lock:
+            segments = []
+            try:
+                data = json.loads((directory / INDEX_FILE).read_text())
+                if data.get("version") != INDEX_VERSION:
+                    return index
+                for generation in data["segments"]:
+                    terms = json.loads((directory / f"terms-{generation}.json").read_text())
+                    postings = index.map_postings(directory / f"postings-{generation}.bin")
+                    segments.append({"generation": generation, "terms": terms, "postings": postings})
+            except (OSError, ValueError, KeyError, TypeError):
+                for segment in segments:
+                    index.close_segment(segment)
+                return index
+
+            index.release()
+            index.docs = data["docs"]
+            index.deleted = set(data["deleted"])
+            index.segments = segments
+            index.next_id = data["next_id"]
+            index.generation = data["generation"]
+            index.file_mtime_ns = file_mtime_ns
+            index.walked = False
+            index.refresh_tables()
+        return index
+
+    @staticmethod
+    def map_postings(path: Path):
+        """Memory-map a postings file (empty files cannot be mapped)."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def close_segment(segment: dict) -> None:
+        """Unmap a segment's postings."""
+        if isinstance(segment["postings"], mmap.mmap):
+            segment["postings"].close()
+
+    def release(self) -> None:
+        """Unmap all segments."""
+        for segment in self.segments:
+            self.close_segment(segment)
+        self.segments = []
+
+    def refresh_tables(self) -> None:
+        """Rebuild doc id lookups from the document table."""
+        self.paths = {doc["id"]: path for path, doc in self.docs.items()}
+        self.lengths = {doc["id"]: doc["length"] for doc in self.docs.values()}
+        self.total_length = sum(self.lengths.values())
+
+    def read_postings(self, term: str, segments: list[dict] | None = None) -> array:
+        """Flat (doc id, tf, doc id, tf, ...) array for a term, without deleted docs."""
+        pairs = array("I")
+        for segment in self.segments if segments is None else segments:
+            entry = segment["terms"].get(term)
+            if entry:
+                start, count = entry
+                pairs.frombytes(segment["postings"][start * 8:(start + count) * 8])
+        if self.deleted and pairs:
+            kept = array("I")
+            for i in range(0, len(pairs), 2):
+                if pairs[i] not in self.deleted:
+                    kept.append(pairs[i])
+                    kept.append(pairs[i + 1])
+            pairs = kept
+        return pairs
+
+    def scan(self, roots: Iterable[str] = SEARCHED_DIRS) -> dict:
+        """Searchable files under roots: path relative to lore/ -> (mtime_ns, size)."""
+        found = {}
+        pending = list(roots)
+        while pending:
+            rel_dir = pending.pop()
+            try:
+                entries = os.scandir(self.lore_dir / rel_dir)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    rel_path = f"{rel_dir}/{entry.name}"
+                    if entry.is_dir():
+                        pending.append(rel_path)
+                    elif entry.name.endswith(".md"):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        found[rel_path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def scan_changed(self, changed: Iterable[str]) -> tuple[dict, set]:
+        """Stat only the changed paths (walking changed directories).
+
+        Returns (searchable files found, indexed paths they cover).
+        """
+        found = {}
+        covered = set()
+        for rel_path in set(changed):
+            parts = rel_path.split("/")
+            if parts[0] not in SEARCHED_DIRS or any(part.startswith(".") for part in parts):
+                continue
+            path = self.lore_dir / rel_path
+            if path.is_dir():
+                found.update(self.scan([rel_path]))
+            elif rel_path.endswith(".md"):
+                try:
+                    st = path.stat()
+                    found[rel_path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+
+            if rel_path in self.docs:
+                covered.add(rel_path)
+            elif not rel_path.endswith(".md"):
+                # A directory, created, moved or removed
+                prefix = rel_path + "/"
+                covered.update(p for p in self.docs if p.startswith(prefix))
+        return found, covered
+
+    def update(self, progress: Progress | None = None, changed: Iterable[str] | None = None) -> tuple[int, int]:
+        """Re-index files whose mtime/size changed. Returns (indexed, removed) counts.
+
+        changed limits the stat calls to those lore/-relative paths; it is
+        ignored until this instance has walked the corpus once.
+        """
+        with self.lock:
+            if changed is None or not self.walked:
+                current = self.scan()
+                covered = list(self.docs)
+                self.walked = True
+            else:
+                current, covered = self.scan_changed(changed)
+
+            stale = set()
+            for rel_path in covered:
+                doc = self.docs[rel_path]
+                if (doc["mtime_ns"], doc["size"]) != tuple(current.get(rel_path, ())):
+                    stale.add(doc["id"])
+            changed_paths = []
+            for rel_path, stamp in current.items():
+                doc = self.docs.get(rel_path)
+                if not doc or (doc["mtime_ns"], doc["size"]) != stamp:
+                    changed_paths.append(rel_path)
+
+            if not stale and not changed_paths:
+                return 0, 0
+
+            removed = [rel_path for rel_path in covered if rel_path not in current]
+            for rel_path in removed:
+                del self.docs[rel_path]
+            self.deleted |= stale
+
+            added = {}
+            step = max(1, len(changed_paths) // PROGRESS_STEPS)
+            for done, rel_path in enumerate(changed_paths, 1):
+                if progress and (done % step == 0 or done == len(changed_paths)):
+                    progress("index", done, len(changed_paths))
+                try:
+                    text = read_lore_text(self.lore_dir, rel_path, current[rel_path][1])
+                except OSError:
+                    self.docs.pop(rel_path, None)
+                    continue
+                counts = Counter(tokenize(text))
+                doc_id = self.next_id
+                self.next_id += 1
+                mtime_ns, size = current[rel_path]
+                self.docs[rel_path] = {"id": doc_id, "mtime_ns": mtime_ns, "size": size, "length": sum(counts.values())}
+                for term, tf in counts.items():
+                    added.setdefault(term, array("I")).extend((doc_id, tf))
+
+            self.commit(added)
+            self.refresh_tables()
+            return len(changed_paths), len(removed)
+
+    def write_segment(self, terms: Iterable[str], get_pairs: Callable[[str], array]) -> dict:
+        """Write a new segment with the postings of terms (in order) and map it."""
+        directory = self.directory
+        self.generation += 1
+        generation = self.generation
+        if directory:
+            directory.mkdir(parents=True, exist_ok=True)
+            postings_path = directory / f"postings-{generation}.bin"
+            out = open(postings_path, "wb")
+        else:
+            out = io.BytesIO()
+
+        segment_terms = {}
+        offset = 0
+        with out:
+            for term in terms:
+                pairs = get_pairs(term)
+                if not pairs:
+                    continue
+                out.write(pairs.tobytes())
+                segment_terms[term] = [offset, len(pairs) // 2]
+                offset += len(pairs) // 2
+            if not directory:
+                postings = out.getvalue()
+
+        if directory:
+            write_atomic(directory / f"terms-{generation}.json", json.dumps(segment_terms, separators=(",", ":")))
+            postings = self.map_postings(postings_path)
+        return {"generation": generation, "terms": segment_terms, "postings": postings}
+
+    def merge(self, segments: list[dict]) -> dict:
+        """One segment holding the live postings of segments."""
+        terms = sorted(set().union(*(segment["terms"].keys() for segment in segments)))
+        return self.write_segment(terms, lambda term: self.read_postings(term, segments))
+
+    def commit(self, added: dict[str, array]) -> None:
+        """Append the new postings as a segment, merge per the policy and save."""
+        first_save = not self.segments
+        if added:
+            self.segments.append(self.write_segment(sorted(added), added.get))
+
+        merged = None
+        if self.segments and len(self.deleted) > MAX_DELETED_RATIO * (len(self.docs) + len(self.deleted)):
+            merged = [self.merge(self.segments)]
+        elif len(self.segments) > MAX_SEGMENTS:
+            # Merge the newer segments, or everything once they outweigh the oldest
+            base, newer = self.segments[0], self.segments[1:]
+            if sum(len(segment["postings"]) for segment in newer) < len(base["postings"]):
+                merged = [base, self.merge(newer)]
+            else:
+                merged = [self.merge(self.segments)]
+        if merged is not None:
+            for segment in self.segments:
+                if segment is not merged[0]:
+                    self.close_segment(segment)
+            if len(merged) == 1:
+                self.deleted = set()
+            self.segments = merged
+        if not self.segments:
+            self.deleted = set()
+
+        directory = self.directory
+        if not directory:
+            return
+
+        directory.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "generation": self.generation,
+            "next_id": self.next_id,
+            "docs": self.docs,
+            "deleted": sorted(self.deleted),
+            "segments": [segment["generation"] for segment in self.segments],
+        }
+        write_atomic(directory / INDEX_FILE, json.dumps(data, separators=(",", ":")))
+        self.file_mtime_ns = (directory / INDEX_FILE).stat().st_mtime_ns
+
+        if merged is not None or first_save:
+            # Drop merged-away segments and leftovers of older index layouts
+            live = {segment["generation"] for segment in self.segments}
+            for path in directory.iterdir():
+                match = SEGMENT_FILE.match(path.name)
+                if match and int(match.group(1) or match.group(2)) not in live:
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> dict:
+        """BM25-ranked matches for query: {"total", "results": [{path, score, snippet}]}."""
+        terms = set(tokenize(query))
+        with self.lock:
+            doc_count = len(self.docs)
+            if not terms or not doc_count:
+                return {"total": 0, "results": []}
+            average_length = self.total_length / doc_count or 1
+
+            scores = {}
+            for term in terms:
+                pairs = self.read_postings(term)
+                doc_freq = len(pairs) // 2
+                if not doc_freq:
+                    continue
+                idf = math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+                for i in range(0, len(pairs), 2):
+                    doc_id, tf = pairs[i], pairs[i + 1]
+                    norm = K1 * (1 - B + B * self.lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+            ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))
+            paths = [(self.paths[doc_id], score) for doc_id, score in ranked[offset:]]
+            sizes = {rel_path: self.docs[rel_path]["size"] for rel_path, _ in paths}
+
+        results = []
+        for rel_path, score in paths:
+            try:
+                text = read_lore_text(self.lore_dir, rel_path, sizes[rel_path])
+            except OSError:
+                text = ""
+            results.append({
+                "path": f"{self.lore_dir.name}/{rel_path}",
+                "score": round(score, 3),
+                "snippet": make_snippet(text, terms),
+            })
+        return {"total": len(scores), "results": results}
+
+
+def forget(lore_dir: Path) -> None:
+    """Drop the in-memory index for lore_dir, unmapping its postings."""
+    index = _loaded.pop(lore_dir, None)
+    if index is not None:
+        with index.lock:
+            index.release()
+
+
+def search_lore(
+    lore_dir: Path,
+    query: str,
+    limit: int = 10,
+    offset: int = 0,
+    update: bool = True,
+    progress: Progress | None = None,
+) -> dict:
+    """Bring the index up to date (unless update is False) and run query."""
+    index = SearchIndex.load(lore_dir)
+    if update:
+        feed = _feeds.get(lore_dir)
+        try:
+            index.update(progress, feed() if feed else None)
+        except BaseException:
+            # The feed's changes are consumed: walk everything next time
+            index.walked = False
+            raise
+    return index.search(query, limit, offset)
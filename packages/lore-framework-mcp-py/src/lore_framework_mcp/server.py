@@ -1,121 +1,82 @@
 """
 Lore Framework MCP Server
 
-Provides MCP tools for session and index management.
+Provides MCP tools for session and index management. Tools that scan or
+parse lore/ are async and run their work in a worker thread, so the event
+loop keeps serving other requests; they send progress notifications when
+the client asks for them and stop at the next progress point when the
+request is cancelled.
 """
 
 import os
 import json
+import time
+from functools import partial
 from pathlib import Path
-from datetime import datetime
 
-import yaml
-import frontmatter
-from mcp.server.fastmcp import FastMCP
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
+
+from .core import (
+    get_lore_dir,
+    get_session_dir,
+    load_team,
+    generate_current_user_md,
+    find_task_paths,
+    build_index,
+    affects_index,
+    catalog_enabled,
+    write_index,
+)
+from . import stats
+from .cache import ParseCache
+from .catalog import catalog_index, run_sql
+from .delegate import DelegateServer
+from .digest import session_digest
+from .graph import TaskGraph
+from .lineage import note_lineage
+from .query import run_query
+from .roots import loaded_roots, resolve_root, use_root
+from .search import search_lore
+from .task_ids import TaskIdIndex, format_duplicates
+from .timeline import timeline_page
+from .validate import run_validation
 
 # Create MCP server
 mcp = FastMCP("lore-framework")
 
 
-def get_project_dir() -> Path:
-    """Get project directory from env or cwd."""
-    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+# Minimum seconds between progress notifications (phase changes always go out)
+PROGRESS_INTERVAL = 0.1
 
 
-def get_lore_dir() -> Path:
-    """Get lore directory path."""
-    return get_project_dir() / "lore"
+async def run_tool(ctx: Context | None, name: str, func, lore_dir: Path, *args, **kwargs):
+    """Run func(lore_dir, ...) in a worker thread inside stats span name, passing a progress callback.
 
+    lore_dir is kept from eviction while the call runs (see roots.py).
 
-def get_session_dir() -> Path:
-    """Get session directory path."""
-    return get_lore_dir() / "0-session"
-
-
-def load_team(session_dir: Path) -> dict:
-    """Load team.yaml file."""
-    team_file = session_dir / "team.yaml"
-    if not team_file.exists():
-        raise FileNotFoundError(f"team.yaml not found at {team_file}")
-    with open(team_file, "r") as f:
-        return yaml.safe_load(f) or {}
-
-
-def generate_current_user_md(user_id: str, user_data: dict, team: dict) -> str:
-    """Generate current-user.md content."""
-    lines = []
-
-    # Frontmatter
-    lines.append("---")
-    lines.append(f"name: {user_id}")
-    if user_data.get("github"):
-        lines.append(f"github: {user_data['github']}")
-    if user_data.get("role"):
-        lines.append(f"role: {user_data['role']}")
-    lines.append("---")
-    lines.append("")
-
-    # Content
-    name = user_data.get("name", user_id)
-    lines.append(f"# Current User: {name}")
-    lines.append("")
-
-    if user_data.get("focus"):
-        lines.append(f"**Focus:** {user_data['focus'].strip()}")
-        lines.append("")
-
-    if user_data.get("prompting"):
-        lines.append("## Communication Preferences")
-        lines.append("")
-        lines.append(user_data["prompting"].strip())
-        lines.append("")
-
-    if user_data.get("note"):
-        lines.append(f"> {user_data['note']}")
-        lines.append("")
-
-    # Other team members
-    other_members = [(k, v) for k, v in team.items() if k != user_id]
-    if other_members:
-        lines.append("---")
-        lines.append("")
-        lines.append("## Rest of Team")
-        lines.append("")
-        lines.append("| Name | Role |")
-        lines.append("|------|------|")
-        for member_id, member_data in other_members:
-            member_name = member_data.get("name", member_id)
-            role = member_data.get("role", "—")
-            lines.append(f"| {member_name} | {role} |")
-        lines.append("")
-
-    return "\n".join(lines)
-
-
-def find_task(lore_dir: Path, task_id: str) -> Path | None:
-    """Find task file by ID."""
-    tasks_dir = lore_dir / "1-tasks"
-    task_num = task_id.lstrip("0") or "0"
-
-    for status_dir in ["active", "blocked", "archive", "backlog"]:
-        status_path = tasks_dir / status_dir
-        if not status_path.exists():
-            continue
-
-        for item in status_path.iterdir():
-            if item.name.startswith("_"):
-                continue
+    Each progress(phase, done, total) call first checks for cancellation of
+    the request (raising in the worker so it unwinds its locks) and then
+    sends a progress notification with a monotonic counter and a
+    "<phase> <done>/<total>" message.
+    """
+    sent = {"count": 0, "phase": None, "at": 0.0}
 
-            item_id = item.name.split("_")[0].lstrip("0") or "0"
-            if item_id == task_num:
-                if item.is_dir():
-                    readme = item / "README.md"
-                    if readme.exists():
-                        return readme
-                elif item.suffix == ".md":
-                    return item
+    def progress(phase: str, done: int, total: int) -> None:
+        anyio.from_thread.check_cancelled()
+        if ctx is None:
+            return
+        now = time.monotonic()
+        if phase == sent["phase"] and done < total and now - sent["at"] < PROGRESS_INTERVAL:
+            return
+        sent["count"] += 1
+        sent["phase"] = phase
+        sent["at"] = now
+        anyio.from_thread.run(ctx.report_progress, sent["count"], None, f"{phase} {done}/{total}")
 
-    return None
+    # The worker thread runs in a copy of this context, so its spans nest under name
+    with stats.span(name), use_root(lore_dir):
+        return await anyio.to_thread.run_sync(partial(func, lore_dir, *args, progress=progress, **kwargs))
 
 
 # ============================================================================
@@ -123,13 +84,15 @@ def find_task(lore_dir: Path, task_id: str) -> Path | None:
 # ============================================================================
 
 @mcp.tool()
-def lore_framework_set_user(user_id: str) -> str:
+def lore_framework_set_user(user_id: str, root: str | None = None) -> str:
     """Set current user from team.yaml.
 
     Args:
         user_id: The user ID from team.yaml
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
     """
-    session_dir = get_session_dir()
+    session_dir = resolve_root(root) / "0-session"
 
     if not session_dir.exists():
         return "Error: 0-session/ directory not found. Run lore framework bootstrap first."
@@ -154,44 +117,60 @@ def lore_framework_set_user(user_id: str) -> str:
 
 
 @mcp.tool()
-def lore_framework_set_task(task_id: str) -> str:
+async def lore_framework_set_task(task_id: str, root: str | None = None) -> str:
     """Set current task by ID (creates symlink to task file).
 
     Args:
         task_id: The task ID (e.g., "1", "01", "123")
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
     """
-    lore_dir = get_lore_dir()
-    session_dir = get_session_dir()
+    lore_dir = resolve_root(root)
+    session_dir = lore_dir / "0-session"
 
     if not session_dir.exists():
         return "Error: 0-session/ directory not found. Run lore framework bootstrap first."
 
-    task_path = find_task(lore_dir, task_id)
-    if not task_path:
-        return f"Error: Task {task_id} not found. Check 1-tasks/{{active,blocked,archive,backlog}}/"
+    with stats.span("set-task"), use_root(lore_dir):
+        # A cold task ID index walks 1-tasks/
+        task_paths = await anyio.to_thread.run_sync(find_task_paths, lore_dir, task_id)
+        if not task_paths:
+            return f"Error: Task {task_id} not found. Check 1-tasks/{{active,blocked,archive,backlog}}/"
+        task_path = task_paths[0]
 
-    current_task_md = session_dir / "current-task.md"
-    current_task_json = session_dir / "current-task.json"
+        current_task_md = session_dir / "current-task.md"
+        current_task_json = session_dir / "current-task.json"
 
-    # Remove existing symlink
-    if current_task_md.exists() or current_task_md.is_symlink():
-        current_task_md.unlink()
+        with stats.span("write"):
+            # Remove existing symlink
+            if current_task_md.exists() or current_task_md.is_symlink():
+                current_task_md.unlink()
 
-    # Create relative symlink
-    relative_path = os.path.relpath(task_path, session_dir)
-    current_task_md.symlink_to(relative_path)
+            # Create relative symlink
+            relative_path = os.path.relpath(task_path, session_dir)
+            current_task_md.symlink_to(relative_path)
 
-    # Write task metadata
-    task_dir = os.path.relpath(task_path.parent, lore_dir)
-    current_task_json.write_text(json.dumps({"id": task_id, "path": task_dir}, indent=2))
+            # Write task metadata
+            task_dir = os.path.relpath(task_path.parent, lore_dir)
+            current_task_json.write_text(json.dumps({"id": task_id, "path": task_dir}, indent=2))
+            stats.count("written", 2)
 
-    return f"Task set: {task_id} -> {relative_path}"
+    result = f"Task set: {task_id} -> {relative_path}"
+    if len(task_paths) > 1:
+        others = ", ".join(os.path.relpath(p, lore_dir) for p in task_paths[1:])
+        result += f"\nWarning: duplicate task ID {task_id} also at: {others}"
+    return result
 
 
 @mcp.tool()
-def lore_framework_show_session() -> str:
-    """Show current session state (user and task)."""
-    session_dir = get_session_dir()
+def lore_framework_show_session(root: str | None = None) -> str:
+    """Show current session state (user and task).
+
+    Args:
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    session_dir = resolve_root(root) / "0-session"
 
     if not session_dir.exists():
         return "Error: 0-session/ directory not found. Run lore framework bootstrap first."
@@ -229,9 +208,46 @@ def lore_framework_show_session() -> str:
 
 
 @mcp.tool()
-def lore_framework_list_users() -> str:
-    """List available users from team.yaml."""
-    session_dir = get_session_dir()
+async def lore_framework_session_digest(
+    worklogs: int = 3,
+    ready: int = 5,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Everything needed to start a session, in one call.
+
+    Replaces reading show_session, current-user.md, current-task.md,
+    next-tasks.md and recent worklogs. Returns JSON: {"user": {"id", "name",
+    "role", "focus"}, "task": {"id", "title", "path", "frontmatter",
+    "blocked_by", "unblocks"}, "worklogs": [{"date", "session", "focus",
+    "tags", "title", "path", ...}], "ready": [{"id", "title", "status",
+    "path", "unblocks"}], "counts": {status: tasks}}. user and task are null
+    when not set. Blockers and ready tasks reflect the last generated index.
+
+    Args:
+        worklogs: Number of the current task's latest worklogs to include
+        ready: Number of top ready tasks to include
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
+
+    if not (lore_dir / "0-session").exists():
+        return "Error: 0-session/ directory not found. Run lore framework bootstrap first."
+
+    result = await run_tool(ctx, "session-digest", session_digest, lore_dir, worklogs=worklogs, ready=ready)
+    return json.dumps(result, ensure_ascii=False, default=str)
+
+
+@mcp.tool()
+def lore_framework_list_users(root: str | None = None) -> str:
+    """List available users from team.yaml.
+
+    Args:
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    session_dir = resolve_root(root) / "0-session"
 
     if not session_dir.exists():
         return "Error: 0-session/ directory not found. Run lore framework bootstrap first."
@@ -251,9 +267,14 @@ def lore_framework_list_users() -> str:
 
 
 @mcp.tool()
-def lore_framework_clear_task() -> str:
-    """Clear current task symlink."""
-    session_dir = get_session_dir()
+def lore_framework_clear_task(root: str | None = None) -> str:
+    """Clear current task symlink.
+
+    Args:
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    session_dir = resolve_root(root) / "0-session"
 
     if not session_dir.exists():
         return "Error: 0-session/ directory not found. Run lore framework bootstrap first."
@@ -272,301 +293,365 @@ def lore_framework_clear_task() -> str:
     return "Task cleared" if cleared else "No task was set"
 
 
+def generate_index(lore_dir: Path, changed: Path | None, progress) -> str:
+    """Rebuild the index and write README.md and next-tasks.md; returns the tool result."""
+    if catalog_enabled():
+        tasks, adrs, blocks = catalog_index(lore_dir, progress=progress)
+    else:
+        with stats.span("load-cache"):
+            cache = ParseCache.load(lore_dir)
+        tasks, adrs, blocks = build_index(lore_dir, cache, changed, progress=progress)
+    progress("graph", 0, 1)
+    with stats.span("graph"):
+        graph = TaskGraph(tasks)
+    progress("render", 0, 1)
+    written = write_index(lore_dir, tasks, adrs, blocks, graph=graph)
+    progress("render", 1, 1)
+    counts = graph.status_counts
+
+    generated = "\n".join(f"- {path}" + ("" if was_written else " (unchanged)") for path, was_written in written)
+    result = f"""Generated:
+{generated}
+
+Stats: {counts['active']} active, {counts['blocked']} blocked, {counts['backlog']} backlog, {counts['completed']} completed, {len(adrs)} ADRs"""
+
+    warnings = format_duplicates(TaskIdIndex.load(lore_dir).duplicates()) + graph.warnings()
+    if warnings:
+        result += "\n\n" + "\n".join(warnings)
+    return result
+
+
 @mcp.tool()
-def lore_framework_generate_index() -> str:
-    """Regenerate lore/README.md and 0-session/next-tasks.md from task and ADR frontmatter."""
-    lore_dir = get_lore_dir()
+async def lore_framework_generate_index(
+    changed_path: str | None = None,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Regenerate lore/README.md and 0-session/next-tasks.md from task and ADR frontmatter.
+
+    Args:
+        changed_path: Optional path of a single edited file. Only that file is
+            re-parsed and the cached index state patched.
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
 
     if not lore_dir.exists():
         return f"Error: lore/ directory not found at {lore_dir}"
 
-    tasks = parse_tasks(lore_dir)
-    adrs = parse_adrs(lore_dir)
-    blocks = compute_blocks(tasks)
+    changed = Path(changed_path) if changed_path else None
+    if changed and not affects_index(lore_dir, changed):
+        return f"Skipped: {changed_path} does not affect the index"
 
-    # Generate README.md
-    readme_content = generate_readme(tasks, adrs, blocks)
-    readme_path = lore_dir / "README.md"
-    readme_path.write_text(readme_content)
+    return await run_tool(ctx, "generate-index", generate_index, lore_dir, changed)
 
-    # Generate next-tasks.md
-    next_content = generate_next(tasks, blocks)
-    next_path = lore_dir / "0-session" / "next-tasks.md"
-    if next_path.parent.exists():
-        next_path.write_text(next_content)
 
-    stats = {
-        "active": len([t for t in tasks.values() if t["status"] == "active"]),
-        "blocked": len([t for t in tasks.values() if t["status"] == "blocked"]),
-        "backlog": len([t for t in tasks.values() if t["status"] == "backlog"]),
-        "completed": len([t for t in tasks.values() if t["status"] == "completed"]),
-        "adrs": len(adrs),
-    }
+@mcp.tool()
+async def lore_framework_query(
+    kind: str = "tasks",
+    status: list[str] | None = None,
+    type: list[str] | None = None,
+    id_min: int | None = None,
+    id_max: int | None = None,
+    blocked_by: str | None = None,
+    related_adr: str | None = None,
+    tags: list[str] | None = None,
+    title: str | None = None,
+    fields: list[str] | None = None,
+    offset: int = 0,
+    limit: int = 50,
+    refresh: bool = False,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Query tasks and ADRs from the in-memory index instead of reading lore/README.md.
+
+    Returns JSON: {"total", "offset", "limit", "items"}.
 
-    return f"""Generated:
-- {readme_path}
-- {next_path}
+    Args:
+        kind: "tasks" (default), "adrs" or "all"
+        status: Match any of these statuses (e.g. ["active", "blocked"])
+        type: Match any of these task types (e.g. ["BUG"])
+        id_min: Minimum numeric ID (inclusive)
+        id_max: Maximum numeric ID (inclusive)
+        blocked_by: Only tasks currently blocked by this task ID
+        related_adr: Only tasks linked to this ADR ID
+        tags: Match records that have all of these tags
+        title: Case-insensitive title substring
+        fields: Only return these fields (e.g. ["id", "title", "status"])
+        offset: Number of matches to skip
+        limit: Maximum number of items (0 = no limit)
+        refresh: Rescan lore/ before answering
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
 
-Stats: {stats['active']} active, {stats['blocked']} blocked, {stats['backlog']} backlog, {stats['completed']} completed, {stats['adrs']} ADRs"""
+    if not lore_dir.exists():
+        return f"Error: lore/ directory not found at {lore_dir}"
 
+    try:
+        result = await run_tool(
+            ctx,
+            "query",
+            run_query,
+            lore_dir,
+            kind=kind,
+            fields=fields,
+            offset=offset,
+            limit=limit,
+            refresh=refresh,
+            statuses=status,
+            types=type,
+            id_min=id_min,
+            id_max=id_max,
+            blocked_by=blocked_by,
+            related_adr=related_adr,
+            tags=tags,
+            title=title,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
 
-# ============================================================================
-# Index Generation Helpers
-# ============================================================================
+    return json.dumps(result, ensure_ascii=False)
 
-def parse_tasks(lore_dir: Path) -> dict:
-    """Parse all tasks from 1-tasks/."""
-    tasks = {}
-    tasks_base = lore_dir / "1-tasks"
-
-    for subdir in ["active", "blocked", "archive", "backlog"]:
-        subdir_path = tasks_base / subdir
-        if not subdir_path.exists():
-            continue
-
-        for item in subdir_path.iterdir():
-            if item.name.startswith("_"):
-                continue
-
-            task_path = None
-            if item.is_file() and item.suffix == ".md":
-                task_path = item
-            elif item.is_dir():
-                readme = item / "README.md"
-                if readme.exists():
-                    task_path = readme
-
-            if not task_path:
-                continue
-
-            # Extract task ID
-            if task_path.name == "README.md":
-                task_id = task_path.parent.name.split("_")[0]
-            else:
-                task_id = item.stem.split("_")[0]
-
-            if not task_id.isdigit():
-                continue
-
-            try:
-                post = frontmatter.load(task_path)
-                meta = post.metadata
-
-                if not meta:
-                    continue
-
-                status = meta.get("status", "active")
-                if subdir == "archive":
-                    status = "completed"
-                elif subdir == "blocked":
-                    status = "blocked"
-                elif subdir == "backlog":
-                    status = "backlog"
-
-                # Extract blocked_by from history
-                blocked_by = []
-                history = meta.get("history", [])
-                if history and isinstance(history, list) and len(history) > 0:
-                    latest = history[-1]
-                    if latest.get("status") == "blocked":
-                        by = latest.get("by", [])
-                        if isinstance(by, list):
-                            blocked_by = [str(b) for b in by]
-                        elif by:
-                            blocked_by = [str(by)]
-
-                tasks[str(meta.get("id", task_id))] = {
-                    "id": str(meta.get("id", task_id)),
-                    "title": meta.get("title") or extract_title(post.content),
-                    "type": meta.get("type", "FEATURE"),
-                    "status": status,
-                    "path": str(task_path.relative_to(lore_dir.parent)),
-                    "blocked_by": blocked_by,
-                    "related_adr": meta.get("related_adr", []) or [],
-                }
-            except Exception:
-                pass
-
-    return tasks
-
-
-def parse_adrs(lore_dir: Path) -> dict:
-    """Parse all ADRs from 2-adrs/."""
-    adrs = {}
-    adr_dir = lore_dir / "2-adrs"
-
-    if not adr_dir.exists():
-        return adrs
-
-    for item in adr_dir.glob("*.md"):
-        if item.name.startswith("_"):
-            continue
-
-        adr_id = item.stem.split("_")[0]
-
-        try:
-            post = frontmatter.load(item)
-            meta = post.metadata
-
-            if not meta:
-                continue
-
-            adrs[str(meta.get("id", adr_id))] = {
-                "id": str(meta.get("id", adr_id)),
-                "title": meta.get("title") or extract_title(post.content),
-                "status": meta.get("status", "proposed"),
-                "path": str(item.relative_to(lore_dir.parent)),
-                "related_tasks": meta.get("related_tasks", []) or [],
-            }
-        except Exception:
-            pass
-
-    return adrs
-
-
-def extract_title(content: str) -> str:
-    """Extract title from markdown content."""
-    for line in content.split("\n"):
-        if line.startswith("# "):
-            return line[2:].strip()
-    return "Untitled"
-
-
-def compute_blocks(tasks: dict) -> dict:
-    """Compute which tasks block other tasks."""
-    blocks = {tid: [] for tid in tasks}
-
-    for task in tasks.values():
-        for blocker_id in task.get("blocked_by", []):
-            if blocker_id in blocks:
-                blocks[blocker_id].append(task["id"])
-
-    return blocks
-
-
-def generate_readme(tasks: dict, adrs: dict, blocks: dict) -> str:
-    """Generate lore/README.md content."""
-    now = datetime.now()
-    date_str = now.strftime("%Y-%m-%d %H:%M")
-
-    active_count = len([t for t in tasks.values() if t["status"] == "active"])
-    blocked_count = len([t for t in tasks.values() if t["status"] == "blocked"])
-    backlog_count = len([t for t in tasks.values() if t["status"] == "backlog"])
-    completed_count = len([t for t in tasks.values() if t["status"] == "completed"])
-    adr_count = len(adrs)
-
-    sections = [f"""# Lore Index
-
-> Auto-generated on {date_str}. Do not edit manually.
-> Use `lore-framework_generate-index` tool to regenerate.
-
-Quick reference for task dependencies, status, and ADR relationships.
-
-## Quick Stats
-
-| Active | Blocked | Backlog | Completed | ADRs |
-|:------:|:-------:|:-------:|:---------:|:----:|
-| {active_count} | {blocked_count} | {backlog_count} | {completed_count} | {adr_count} |"""]
-
-    # Ready to start
-    completed_ids = {t["id"] for t in tasks.values() if t["status"] == "completed"}
-    ready = []
-    for task in tasks.values():
-        if task["status"] not in ["active", "blocked"]:
-            continue
-        blocked_by = task.get("blocked_by", [])
-        if not blocked_by or all(b in completed_ids for b in blocked_by):
-            ready.append(task)
-
-    if ready:
-        sections.append("\n## Ready to Start\n\nThese tasks have no blockers (or all blockers completed):\n")
-        for task in sorted(ready, key=lambda t: t["id"]):
-            block_count = len(blocks.get(task["id"], []))
-            priority = "**HIGH**" if block_count >= 3 else "medium" if block_count >= 1 else "low"
-            sections.append(f"- **Task {task['id']}**: [{task['title']}]({task['path']}) — blocks {block_count} tasks ({priority})")
-
-    # Task status table
-    sections.append("\n## Task Status\n")
-    sections.append("| ID | Title | Type | Status | Blocked By | Blocks | ADRs |")
-    sections.append("|:---|:------|:-----|:-------|:-----------|:-------|:-----|")
-
-    status_order = {"active": 0, "blocked": 1, "backlog": 2, "completed": 3}
-    sorted_tasks = sorted(tasks.values(), key=lambda t: (status_order.get(t["status"], 4), t["id"]))
-
-    for task in sorted_tasks:
-        blocked_by = ", ".join(task.get("blocked_by", [])) or "—"
-        task_blocks = ", ".join(sorted(blocks.get(task["id"], []))) or "—"
-        related_adr = ", ".join(str(a) for a in task.get("related_adr", [])) or "—"
-        status_display = f"**{task['status']}**" if task["status"] == "active" else task["status"]
-        title = task["title"][:35] + "..." if len(task["title"]) > 35 else task["title"]
-        sections.append(f"| {task['id']} | [{title}]({task['path']}) | {task['type']} | {status_display} | {blocked_by} | {task_blocks} | {related_adr} |")
-
-    # ADR table
-    if adrs:
-        sections.append("\n## Architecture Decision Records\n")
-        sections.append("| ID | Title | Status | Related Tasks |")
-        sections.append("|:---|:------|:-------|:--------------|")
-        for adr in sorted(adrs.values(), key=lambda a: a["id"]):
-            related = ", ".join(str(t) for t in adr.get("related_tasks", [])) or "—"
-            sections.append(f"| {adr['id']} | [{adr['title']}]({adr['path']}) | {adr['status']} | {related} |")
-
-    return "\n".join(sections)
-
-
-def generate_next(tasks: dict, blocks: dict) -> str:
-    """Generate 0-session/next-tasks.md content."""
-    completed_ids = {t["id"] for t in tasks.values() if t["status"] == "completed"}
-    ready = []
-    for task in tasks.values():
-        if task["status"] not in ["active", "blocked"]:
-            continue
-        blocked_by = task.get("blocked_by", [])
-        if not blocked_by or all(b in completed_ids for b in blocked_by):
-            ready.append(task)
-
-    active_count = len([t for t in tasks.values() if t["status"] == "active"])
-    blocked_count = len([t for t in tasks.values() if t["status"] == "blocked"])
-    backlog_count = len([t for t in tasks.values() if t["status"] == "backlog"])
-    completed_count = len([t for t in tasks.values() if t["status"] == "completed"])
-
-    lines = [
-        "# Next Tasks",
-        "",
-        "> Auto-generated. Use `lore-framework_generate-index` tool to regenerate.",
-        "> Full index: [README.md](../README.md)",
-        "",
-        f"**Active:** {active_count} | **Blocked:** {blocked_count} | **Backlog:** {backlog_count} | **Completed:** {completed_count}",
-        "",
-    ]
-
-    if ready:
-        lines.append("## Ready to Start")
-        lines.append("")
-
-        sorted_ready = sorted(ready, key=lambda t: -len(blocks.get(t["id"], [])))
-        for task in sorted_ready[:10]:
-            block_count = len(blocks.get(task["id"], []))
-            priority = " [HIGH]" if block_count >= 3 else ""
-            unblocks = f"unblocks {block_count}" if block_count > 0 else "no blockers"
-            lines.append(f"- **{task['id']}** [{task['title']}]({task['path']}) — {unblocks}{priority}")
-        lines.append("")
-
-    blocked_tasks = [t for t in tasks.values() if t["status"] == "blocked"]
-    if blocked_tasks:
-        blocked_ids = ", ".join(sorted(t["id"] for t in blocked_tasks))
-        lines.append(f"## Blocked ({len(blocked_tasks)})")
-        lines.append("")
-        lines.append(blocked_ids)
-        lines.append("")
-
-    lines.append("---")
-    lines.append("")
-    lines.append("Set current task: use `lore-framework_set-task` tool with task ID")
-    lines.append("")
 
-    return "\n".join(lines)
+@mcp.tool()
+async def lore_framework_search(
+    query: str,
+    limit: int = 10,
+    offset: int = 0,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Full-text search (BM25) over task bodies, notes, worklogs, sources, ADRs and wiki.
+
+    Returns JSON: {"total", "results": [{"path", "score", "snippet"}]}.
+
+    Args:
+        query: Search words (all words contribute to the ranking)
+        limit: Maximum number of results
+        offset: Number of results to skip
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
+
+    if not lore_dir.exists():
+        return f"Error: lore/ directory not found at {lore_dir}"
+
+    result = await run_tool(ctx, "search", search_lore, lore_dir, query, limit, offset)
+    return json.dumps(result, ensure_ascii=False)
+
+
+@mcp.tool()
+async def lore_framework_lineage(
+    path: str | None = None,
+    task_id: str | None = None,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Note lineage from spawned_from / spawns / superseded-by history.
+
+    Returns JSON with parents, children, ancestors, descendants, superseded_by,
+    supersedes and latest (current version) for one note, or {"notes": [...]}
+    for all notes of a task (or of the whole tree when neither is given).
+
+    Args:
+        path: Note path, e.g. lore/1-tasks/active/0001_RESEARCH_x/notes/Q-why.md
+        task_id: List the lineage of every note in this task
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
+
+    if not lore_dir.exists():
+        return f"Error: lore/ directory not found at {lore_dir}"
+
+    result = await run_tool(ctx, "lineage", note_lineage, lore_dir, path, task_id)
+    return json.dumps(result, ensure_ascii=False)
+
+
+@mcp.tool()
+async def lore_framework_timeline(
+    since: str | None = None,
+    until: str | None = None,
+    tags: list[str] | None = None,
+    task_id: str | None = None,
+    newest_first: bool = False,
+    include_body: bool = False,
+    offset: int = 0,
+    limit: int = 50,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Worklogs across all tasks, sorted by date, from the timeline index.
+
+    Only worklog frontmatter is read unless include_body is set. Returns JSON:
+    {"total", "offset", "limit", "items": [{"date", "session", "focus", "tags",
+    "title", "task_id", "status", "task", "path"}]}; page with offset.
+
+    Args:
+        since: First date, inclusive: YYYY-MM-DD or "7d" (7 days ago)
+        until: Last date, inclusive: YYYY-MM-DD or "Nd"
+        tags: Only worklogs that have all of these tags
+        task_id: Only this task's worklogs
+        newest_first: Latest first (default: oldest first)
+        include_body: Add each returned worklog's text as "body"
+        offset: Number of matches to skip
+        limit: Maximum number of items (0 = no limit)
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
+
+    if not lore_dir.exists():
+        return f"Error: lore/ directory not found at {lore_dir}"
+
+    try:
+        result = await run_tool(
+            ctx,
+            "timeline",
+            timeline_page,
+            lore_dir,
+            offset=offset,
+            limit=limit,
+            since=since,
+            until=until,
+            tags=tags,
+            task_id=task_id,
+            newest_first=newest_first,
+            body=include_body,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return json.dumps(result, ensure_ascii=False)
+
+
+@mcp.tool()
+async def lore_framework_sql(
+    query: str,
+    limit: int = 200,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Run one read-only SQL statement against the lore SQLite catalog.
+
+    The catalog is synced from file mtimes first. Tables: tasks(path, id,
+    title, type, status, updated), task_blockers(task_path, blocker_id),
+    task_adrs(task_path, adr_id), adrs(path, id, title, status),
+    adr_tasks(adr_path, task_id), notes(path, task_id, task_dir, title, type,
+    status), tags(path, tag), history(path, kind, seq, date, status, who,
+    note, by, reason), files(path, kind, mtime_ns, size).
+
+    Returns JSON: {"columns", "rows", "truncated"}.
+
+    Args:
+        query: A single SELECT statement, e.g. "SELECT substr(date, 1, 7) AS month,
+            count(*) FROM history WHERE kind = 'task' AND status = 'completed' GROUP BY month"
+        limit: Maximum number of rows (0 = no limit)
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
+
+    if not lore_dir.exists():
+        return f"Error: lore/ directory not found at {lore_dir}"
+
+    try:
+        result = await run_tool(ctx, "sql", run_sql, lore_dir, query, limit)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return json.dumps(result, ensure_ascii=False)
+
+
+@mcp.tool()
+async def lore_framework_validate(
+    file_path: str | None = None,
+    root: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """Validate frontmatter in tasks, ADRs, notes and worklogs.
+
+    Returns JSON: {"files", "errors", "warnings", "results": [{"path", "type",
+    "errors", "warnings"}]}, listing only files with problems.
+
+    Args:
+        file_path: Validate only this file (absolute or relative to the project)
+        root: Project directory (containing lore/) or lore/ directory to use
+            instead of the server's project; relative to the project
+    """
+    lore_dir = resolve_root(root)
+
+    if not lore_dir.exists():
+        return f"Error: lore/ directory not found at {lore_dir}"
+
+    try:
+        report = await run_tool(ctx, "validate", run_validation, lore_dir, file_path)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return json.dumps(report, ensure_ascii=False)
+
+
+@mcp.tool()
+def lore_framework_roots() -> str:
+    """Lore roots with in-memory state in this server, most recently used first.
+
+    Returns JSON: [{"root", "busy", "entries"}], where entries is the number
+    of cached records held for the root. Idle roots beyond
+    LORE_FRAMEWORK_MAX_ROOTS or LORE_FRAMEWORK_MAX_ENTRIES are evicted.
+    """
+    return json.dumps(loaded_roots())
+
+
+@mcp.tool()
+def lore_framework_stats(reset: bool = False) -> str:
+    """Cumulative per-phase metrics of this server process.
+
+    Covers MCP tool calls and CLI commands delegated to the server. Spans are
+    dotted phase paths (e.g. "generate-index.parse-tasks"); counts are files
+    stat'd, read, parsed, skipped (parse cache hits), written or unchanged,
+    bytes read and written, made directly in that phase.
+
+    Returns JSON: {"since", "uptime_s", "spans": {path: {"calls", "ms",
+    "avg_ms", "counts"}}}.
+
+    Args:
+        reset: Clear the totals after reporting them
+    """
+    return json.dumps(stats.snapshot(reset))
 
 
 def run_server():
-    """Run the MCP server."""
-    mcp.run()
+    """Run the MCP server.
+
+    Also listens on a unix socket so CLI hook invocations can be delegated
+    to this process (see delegate.py), and with LORE_FRAMEWORK_WATCH set
+    keeps the index current from filesystem events (see watch.py).
+    """
+    from .cli import run_cli
+
+    delegate = None
+    if get_session_dir().exists():
+        delegate = DelegateServer(get_lore_dir(), lambda argv: run_cli(argv, delegate=False))
+        delegate.start()
+
+    watcher = None
+    watch_mode = os.environ.get("LORE_FRAMEWORK_WATCH", "").lower()
+    if watch_mode not in ("", "0", "false", "no") and get_lore_dir().exists():
+        from .watch import LoreWatcher
+
+        watcher = LoreWatcher(get_lore_dir(), poll=(watch_mode == "poll"))
+        watcher.start()
+
+    try:
+        mcp.run()
+    finally:
+        if watcher:
+            watcher.stop()
+        if delegate:
+            delegate.stop()
@@ -0,0 +1,150 @@
+"""
+Lore Framework Sharded Index
+
+Index layout for very large lore trees (generate-index --sharded or
+LORE_FRAMEWORK_INDEX=sharded). Task tables are split into shard files under
+lore/index/: active.md, blocked.md, backlog.md, one archive-YYYY.md per year
+of the last history entry, and adrs.md. lore/README.md keeps only the stats,
+the ready-to-start list and links to the shards, so agents load a small file
+by default. Shard rows are produced by generators and streamed to disk.
+"""
+
+import re
+import posixpath
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from .cache import write_lines_if_changed
+from .graph import TaskGraph
+from .records import TaskRecord
+from .core import (
+    TASK_TABLE_HEADER,
+    ADR_TABLE_HEADER,
+    readme_header,
+    ready_section,
+    task_row,
+    adr_row,
+)
+
+INDEX_DIR = "index"
+OPEN_SHARDS = ["active", "blocked", "backlog"]
+ADR_SHARD = "adrs"
+# Files in lore/index/ that write_shards() owns; anything else there is left alone
+SHARD_FILE = re.compile(r"^(active|blocked|backlog|other|adrs|archive-(\d{4}|undated))\.md$")
+
+
+def shard_name(task: TaskRecord) -> str:
+    """Shard a task belongs to."""
+    status = task.status
+    if status in OPEN_SHARDS:
+        return status
+    if status == "completed":
+        year = task.updated[:4]
+        return f"archive-{year}" if year.isdigit() else "archive-undated"
+    return "other"
+
+
+def shard_title(name: str) -> str:
+    """Heading for a task shard."""
+    if name.startswith("archive-"):
+        year = name.split("-", 1)[1]
+        return "Archive (undated)" if year == "undated" else f"Archive {year}"
+    return {"active": "Active Tasks", "blocked": "Blocked Tasks", "backlog": "Backlog"}.get(name, "Other Tasks")
+
+
+def shard_order(name: str) -> tuple:
+    """Open shards first, then archive years newest first."""
+    if name in OPEN_SHARDS:
+        return (0, OPEN_SHARDS.index(name))
+    if name.startswith("archive-"):
+        year = name.split("-", 1)[1]
+        return (1, -int(year)) if year.isdigit() else (2, 0)
+    return (3, name)
+
+
+def group_shards(tasks: dict) -> dict[str, list[TaskRecord]]:
+    """Task records grouped by shard name, in shard order."""
+    shards = {}
+    for task in tasks.values():
+        shards.setdefault(shard_name(task), []).append(task)
+    return {name: shards[name] for name in sorted(shards, key=shard_order)}
+
+
+def shard_link(path: str) -> str:
+    """Link to a project-relative path from a file in lore/index/."""
+    return posixpath.relpath(Path(path).as_posix(), f"lore/{INDEX_DIR}")
+
+
+def render_task_shard(name: str, tasks: list[TaskRecord], blocks: dict) -> Iterator[str]:
+    """Yield the lines of a task shard."""
+    yield f"# {shard_title(name)}"
+    yield ""
+    yield "> Auto-generated. Use `lore-framework_generate-index` tool to regenerate."
+    yield "> Index: [README.md](../README.md)"
+    yield ""
+    yield from TASK_TABLE_HEADER
+    for task in sorted(tasks, key=lambda t: t.id):
+        yield task_row(task, blocks, shard_link)
+
+
+def render_adr_shard(adrs: dict) -> Iterator[str]:
+    """Yield the lines of the ADR shard."""
+    yield "# Architecture Decision Records"
+    yield ""
+    yield "> Auto-generated. Use `lore-framework_generate-index` tool to regenerate."
+    yield "> Index: [README.md](../README.md)"
+    yield ""
+    yield from ADR_TABLE_HEADER
+    for adr in sorted(adrs.values(), key=lambda a: a.id):
+        yield adr_row(adr, shard_link)
+
+
+def write_shards(lore_dir: Path, tasks: dict, adrs: dict, blocks: dict) -> list[tuple[Path, bool]]:
+    """Write lore/index/ shards, removing shards that no longer have tasks.
+
+    Only files named like shards are removed; other files in lore/index/ stay.
+
+    Returns (path, written) for each shard.
+    """
+    index_dir = lore_dir / INDEX_DIR
+    index_dir.mkdir(exist_ok=True)
+    results = []
+
+    for name, shard_tasks in group_shards(tasks).items():
+        path = index_dir / f"{name}.md"
+        results.append((path, write_lines_if_changed(path, render_task_shard(name, shard_tasks, blocks))))
+
+    if adrs:
+        path = index_dir / f"{ADR_SHARD}.md"
+        results.append((path, write_lines_if_changed(path, render_adr_shard(adrs))))
+
+    current = {path for path, _ in results}
+    for path in index_dir.glob("*.md"):
+        if path not in current and SHARD_FILE.match(path.name):
+            path.unlink()
+
+    return results
+
+
+def generate_sharded_readme(
+    tasks: dict,
+    adrs: dict,
+    blocks: dict,
+    generated_at: datetime | None = None,
+    graph: TaskGraph | None = None,
+) -> str:
+    """Generate the small lore/README.md that links to the shards."""
+    graph = graph or TaskGraph(tasks)
+    sections = [readme_header(graph, adrs, generated_at)]
+    sections.extend(ready_section(graph))
+
+    sections.append("\n## Index\n")
+    sections.append("| Shard | Entries |")
+    sections.append("|:------|:-------:|")
+    for name, shard_tasks in group_shards(tasks).items():
+        sections.append(f"| [{shard_title(name)}]({INDEX_DIR}/{name}.md) | {len(shard_tasks)} |")
+    if adrs:
+        sections.append(f"| [Architecture Decision Records]({INDEX_DIR}/{ADR_SHARD}.md) | {len(adrs)} |")
+
+    return "\n".join(sections)
@@ -0,0 +1,455 @@
+"""
+Lore Framework Source Store
+
+Content-addressed store for the downloaded web content in task `sources/`
+directories. The same page is often fetched for several tasks; the store
+keeps one copy of each distinct content as a blob named by its SHA-256 under
+lore/.store/ (lore/.store/ab/ab12...).
+
+A fetched markdown source carries per-task frontmatter (url, fetched_date,
+...), so only its body is stored: the body is hashed without the frontmatter,
+and the task's entry becomes a pointer file that keeps its own frontmatter
+followed by a single `lore-blob: sha256:<hex>` line. Files without
+frontmatter (images, raw downloads) become hardlinks to their blob, so readers
+see an ordinary file; where a hardlink is not possible, or pointers are
+requested, they get a pointer file with just that line. read_source() and
+read_lore_text() put pointer files back together.
+
+Hardlink targets live apart from pointer targets, under lore/.store/links/,
+so no blob is both linked into a task and referenced by a pointer file. Blobs
+stay writable; an edit through a hardlink changes every entry linked to that
+blob, and the next dedupe run re-keys it under its new hash. Pointer targets
+are never linked, so their content cannot change underneath a pointer.
+Frontmatter in pointer files is edited as usual. Before editing a source's body (or
+an image) in place, `sources materialize` turns the entry back into a private
+copy. Hashes are cached in lore/0-session/.cache/sources-cache.json by path,
+mtime, size and inode, so re-runs only hash new or changed files.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+from . import stats
+from .cache import PROGRESS_STEPS, Progress, get_cache_dir, write_atomic
+from .reader import BOUNDARY
+
+STORE_DIR = ".store"
+LINKS_DIR = "links"
+CACHE_NAME = "sources-cache.json"
+STATUS_DIRS = ["active", "blocked", "archive", "backlog"]
+POINTER_PREFIX = b"lore-blob: sha256:"
+# Pointer files hold at most a frontmatter block and the pointer line
+POINTER_MAX_BYTES = 8192
+
+_lock = threading.Lock()
+
+
+def blob_path(lore_dir: Path, digest: str, linked: bool = False) -> Path:
+    """Store path of the blob with this SHA-256 (linked: a hardlink target, never a pointer target)."""
+    store = lore_dir / STORE_DIR / LINKS_DIR if linked else lore_dir / STORE_DIR
+    return store / digest[:2] / digest
+
+
+def replace_bytes(path: Path, data: bytes) -> None:
+    """Write data to path via temp file + rename (replacing any hardlink with a new file)."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    stats.count("written")
+
+
+def split_source(data: bytes) -> tuple[bytes, bytes]:
+    """Split file content into (frontmatter block including both `---` lines, body).
+
+    The frontmatter block is empty when the file has none.
+    """
+    lines = data.splitlines(keepends=True)
+    if not lines or not BOUNDARY.match(lines[0]):
+        return b"", data
+    end = next((i for i in range(1, len(lines)) if BOUNDARY.match(lines[i])), None)
+    if end is None:
+        return b"", data
+    head_len = sum(len(line) for line in lines[:end + 1])
+    return data[:head_len], data[head_len:]
+
+
+def pointer_bytes(head: bytes, digest: str) -> bytes:
+    """Pointer file content: the entry's own frontmatter block and the blob line."""
+    return head + POINTER_PREFIX + digest.encode() + b"\n"
+
+
+def parse_pointer(data: bytes) -> tuple[bytes, str] | None:
+    """(frontmatter block, blob digest) if data is pointer file content, else None."""
+    if len(data) > POINTER_MAX_BYTES or POINTER_PREFIX not in data:
+        return None
+    head, body = split_source(data)
+    body = body.strip()
+    if not body.startswith(POINTER_PREFIX) or b"\n" in body:
+        return None
+    digest = body[len(POINTER_PREFIX):].decode("ascii", "replace")
+    return (head, digest) if len(digest) == 64 else None
+
+
+def is_source_path(rel_path: str) -> bool:
+    """Whether a lore/-relative path is inside a task's sources/ directory."""
+    parts = rel_path.split("/")
+    return len(parts) > 4 and parts[0] == "1-tasks" and parts[3] == "sources"
+
+
+def resolve_bytes(lore_dir: Path, data: bytes) -> bytes:
+    """Full content for a sources/ entry's bytes (pointer files joined with their blob)."""
+    pointer = parse_pointer(data)
+    if pointer is None:
+        return data
+    head, digest = pointer
+    return head + blob_path(lore_dir, digest).read_bytes()
+
+
+def read_lore_text(lore_dir: Path, rel_path: str, size: int) -> str:
+    """Text of a lore/-relative file, following it if it is a pointer file.
+
+    size comes from the caller's stat; only small files in task sources/
+    can be pointers, so everything else is read directly.
+    """
+    path = lore_dir / rel_path
+    if size > POINTER_MAX_BYTES or not is_source_path(rel_path):
+        return path.read_text(errors="replace")
+    return resolve_bytes(lore_dir, path.read_bytes()).decode(errors="replace")
+
+
+def find_lore_dir(path: Path) -> Path | None:
+    """The lore/ directory path is in (None outside one)."""
+    for parent in Path(os.path.abspath(path)).parents:
+        if parent.name == "lore":
+            return parent
+    return None
+
+
+def read_source(path: Path) -> bytes:
+    """Content of a sources/ entry, following pointer files."""
+    data = path.read_bytes()
+    lore_dir = find_lore_dir(path)
+    return resolve_bytes(lore_dir, data) if lore_dir else data
+
+
+def scan_source_files(lore_dir: Path, under: Path | None = None) -> list[Path]:
+    """Files in task sources/ directories (recursively), optionally only those under a path."""
+    files = []
+    for status in STATUS_DIRS:
+        status_path = lore_dir / "1-tasks" / status
+        if not status_path.exists():
+            continue
+        with os.scandir(status_path) as entries:
+            task_dirs = sorted(Path(entry.path) for entry in entries if entry.is_dir() and not entry.name.startswith("_"))
+        for task_dir in task_dirs:
+            for root, dirs, names in os.walk(task_dir / "sources"):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                files.extend(Path(root) / name for name in sorted(names) if not name.startswith("."))
+
+    if under is not None:
+        under = Path(os.path.abspath(under))
+        files = [path for path in files if path == under or under in path.parents]
+    return files
+
+
+def scan_blobs(lore_dir: Path, linked: bool = False) -> list[Path]:
+    """All pointer target blobs, or with linked all hardlink target blobs."""
+    store = lore_dir / STORE_DIR / LINKS_DIR if linked else lore_dir / STORE_DIR
+    if not store.exists():
+        return []
+    return sorted(path for path in store.glob("??/*") if path.is_file() and not path.name.startswith("."))
+
+
+def disk_usage(paths: list[Path]) -> int:
+    """Bytes used by paths, counting each inode once."""
+    seen = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        seen[(st.st_dev, st.st_ino)] = st.st_size
+    return sum(seen.values())
+
+
+def load_hashes(lore_dir: Path) -> dict:
+    """Cached hashes: lore-relative path -> [mtime_ns, size, inode, sha256, frontmatter length]."""
+    try:
+        data = json.loads((get_cache_dir(lore_dir) / CACHE_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_hashes(lore_dir: Path, hashes: dict) -> None:
+    """Persist cached hashes (only when 0-session/ exists)."""
+    if not (lore_dir / "0-session").exists():
+        return
+    cache_dir = get_cache_dir(lore_dir)
+    cache_dir.mkdir(exist_ok=True)
+    write_atomic(cache_dir / CACHE_NAME, json.dumps(hashes, separators=(",", ":")))
+
+
+def content_digest(lore_dir: Path, path: Path, st: os.stat_result, hashes: dict) -> tuple[str, int]:
+    """(SHA-256 of the body, frontmatter length) for a file, from the hash cache when unchanged.
+
+    Only markdown files are split; anything else (including blobs) is hashed whole.
+    """
+    key = path.relative_to(lore_dir).as_posix()
+    stamp = [st.st_mtime_ns, st.st_size, st.st_ino]
+    entry = hashes.get(key)
+    if entry and len(entry) == 5 and entry[:3] == stamp:
+        stats.count("skipped")
+        return entry[3], entry[4]
+
+    data = path.read_bytes()
+    stats.count("read")
+    stats.count("bytes_read", len(data))
+    head, body = split_source(data) if path.suffix == ".md" else (b"", data)
+    digest = hashlib.sha256(body).hexdigest()
+    hashes[key] = stamp + [digest, len(head)]
+    return digest, len(head)
+
+
+def verify_blobs(lore_dir: Path, hashes: dict) -> int:
+    """Keep pointer targets unlinked, and re-key hardlink targets whose content changed.
+
+    A hardlink target changes when one of its entries is edited in place; the
+    edited content, which every linked entry now shows, moves under its new
+    hash. Pointer targets are never re-keyed, since pointer files name them by
+    hash; one that still has other links gets a private inode. Returns the
+    number of blobs re-keyed.
+    """
+    for blob in scan_blobs(lore_dir):
+        stats.count("stat")
+        if blob.stat().st_nlink > 1:
+            replace_bytes(blob, blob.read_bytes())
+
+    rekeyed = 0
+    for blob in scan_blobs(lore_dir, linked=True):
+        st = blob.stat()
+        stats.count("stat")
+        digest, _ = content_digest(lore_dir, blob, st, hashes)
+        if digest == blob.name:
+            continue
+        target = blob_path(lore_dir, digest, linked=True)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(blob, target)
+        hashes.pop(blob.relative_to(lore_dir).as_posix(), None)
+        rekeyed += 1
+    return rekeyed
+
+
+def put_blob(lore_dir: Path, digest: str, path: Path, body: bytes | None = None) -> tuple[Path, bool]:
+    """Add content to the store as blob digest. Returns (blob, whether it was created).
+
+    With body, those bytes are written as a pointer target; otherwise path's
+    whole file is linked in as a hardlink target (copied where linking is not
+    possible).
+    """
+    blob = blob_path(lore_dir, digest, linked=body is None)
+    if blob.exists():
+        return blob, False
+
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    if body is not None:
+        replace_bytes(blob, body)
+        return blob, True
+
+    tmp_path = blob.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(path, tmp_path)
+    except OSError:
+        shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, blob)
+    stats.count("written")
+    return blob, True
+
+
+def link_source(blob: Path, path: Path) -> str:
+    """Make path a hardlink to blob. Returns "linked", "unchanged" or "failed"."""
+    try:
+        if os.path.samefile(blob, path):
+            return "unchanged"
+    except OSError:
+        pass
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(blob, tmp_path)
+        os.replace(tmp_path, path)
+        return "linked"
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return "failed"
+
+
+def dedupe_sources(
+    lore_dir: Path,
+    under: Path | None = None,
+    pointers: bool = False,
+    dry_run: bool = False,
+    progress: Progress | None = None,
+) -> dict:
+    """Move task sources into the store as pointer files (with frontmatter) or hardlinks.
+
+    under limits the run to one task, sources/ directory or file. Unless
+    limited, blobs no longer referenced by any source are removed. With
+    dry_run nothing is changed and the size after is an estimate.
+
+    Returns {"files", "unique", "stored", "linked", "pointers", "unchanged",
+    "rekeyed_blobs", "missing_blobs", "removed_blobs", "bytes_before",
+    "bytes_after", "reclaimed", "dry_run"}: stored counts new blobs,
+    unchanged the entries already in the store, rekeyed_blobs the blobs
+    found edited in place, missing_blobs the pointer files whose blob is gone.
+    """
+    with _lock:
+        files = scan_source_files(lore_dir, under)
+        hashes = load_hashes(lore_dir)
+        blobs = [(False, blob) for blob in scan_blobs(lore_dir)] + [(True, blob) for blob in scan_blobs(lore_dir, linked=True)]
+        bytes_before = disk_usage(files + [blob for _, blob in blobs])
+
+        report = {
+            "files": len(files), "unique": 0, "stored": 0, "linked": 0, "pointers": 0, "unchanged": 0,
+            "rekeyed_blobs": 0 if dry_run else verify_blobs(lore_dir, hashes),
+            "missing_blobs": 0, "removed_blobs": 0,
+        }
+        # (linked, digest) -> body size of each blob the entries need
+        sizes = {}
+        entry_bytes = 0
+        distinct = set()
+        # Pointer targets referenced by pointer files
+        referenced = set()
+        step = max(1, len(files) // PROGRESS_STEPS)
+        for done, path in enumerate(files, 1):
+            if progress and (done % step == 0 or done == len(files)):
+                progress("dedupe", done, len(files))
+
+            try:
+                st = path.stat()
+                stats.count("stat")
+                pointer = parse_pointer(path.read_bytes()) if st.st_size <= POINTER_MAX_BYTES else None
+                if pointer:
+                    distinct.add(pointer[1])
+                    referenced.add(pointer[1])
+                    report["unchanged"] += 1
+                    report["missing_blobs"] += not blob_path(lore_dir, pointer[1]).exists()
+                    entry_bytes += st.st_size
+                    continue
+
+                digest, head_len = content_digest(lore_dir, path, st, hashes)
+                distinct.add(digest)
+                as_pointer = bool(head_len) or pointers
+                sizes.setdefault((not as_pointer, digest), st.st_size - head_len)
+                if as_pointer:
+                    referenced.add(digest)
+                    entry_bytes += len(pointer_bytes(b"", digest)) + head_len
+                if dry_run:
+                    continue
+
+                created = False
+                outcome = "failed"
+                if not as_pointer:
+                    blob, created = put_blob(lore_dir, digest, path)
+                    outcome = link_source(blob, path)
+                if outcome == "failed":
+                    data = path.read_bytes()
+                    _, stored = put_blob(lore_dir, digest, path, data[head_len:])
+                    created = created or stored
+                    referenced.add(digest)
+                    replace_bytes(path, pointer_bytes(data[:head_len], digest))
+                    outcome = "pointer"
+            except OSError:
+                continue
+
+            if created and outcome == "unchanged":
+                outcome = "linked"  # The blob was linked from this file
+            report["stored"] += created
+            report["linked" if outcome == "linked" else "pointers" if outcome == "pointer" else "unchanged"] += 1
+        report["unique"] = len(distinct)
+
+        if under is None and not dry_run:
+            # Hardlink targets are unreferenced once no entry links them
+            for linked in (False, True):
+                for blob in scan_blobs(lore_dir, linked):
+                    if (linked or blob.name not in referenced) and blob.stat().st_nlink == 1:
+                        blob.unlink()
+                        report["removed_blobs"] += 1
+
+        if dry_run:
+            # One copy per distinct content, the pointer files, and blobs that stay
+            kept = [
+                blob for linked, blob in blobs
+                if (linked, blob.name) not in sizes
+                and (under is not None or (blob.stat().st_nlink > 1 if linked else blob.name in referenced))
+            ]
+            bytes_after = sum(sizes.values()) + entry_bytes + disk_usage(kept)
+        else:
+            save_hashes(lore_dir, {key: entry for key, entry in hashes.items() if (lore_dir / key).exists()})
+            blobs = scan_blobs(lore_dir) + scan_blobs(lore_dir, linked=True)
+            bytes_after = disk_usage(scan_source_files(lore_dir, under) + blobs)
+
+    return {
+        **report,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "reclaimed": bytes_before - bytes_after,
+        "dry_run": dry_run,
+    }
+
+
+def materialize_sources(lore_dir: Path, under: Path) -> int:
+    """Turn the store-backed entries under a path back into private copies, for editing.
+
+    Pointer files get their full content back; hardlinks are replaced by a
+    copy. Returns the number of entries materialized.
+    """
+    count = 0
+    with _lock:
+        for path in scan_source_files(lore_dir, under):
+            st = path.stat()
+            data = path.read_bytes() if st.st_size <= POINTER_MAX_BYTES else None
+            if data is not None and parse_pointer(data):
+                replace_bytes(path, resolve_bytes(lore_dir, data))
+            elif st.st_nlink > 1:
+                replace_bytes(path, path.read_bytes())
+            else:
+                continue
+            count += 1
+    return count
+
+
+def format_size(size: int) -> str:
+    """Human-readable byte count."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_dedupe(report: dict) -> str:
+    """Human-readable dedupe report."""
+    verb = "would reclaim" if report["dry_run"] else "reclaimed"
+    lines = [
+        f"{report['files']} source files, {report['unique']} distinct",
+        f"new blobs: {report['stored']}, hardlinked: {report['linked']}, pointers: {report['pointers']}, "
+        f"already in store: {report['unchanged']}",
+    ]
+    if report["rekeyed_blobs"]:
+        lines.append(f"re-keyed {report['rekeyed_blobs']} blobs edited in place")
+    if report["missing_blobs"]:
+        lines.append(f"Warning: {report['missing_blobs']} pointer files refer to missing blobs")
+    if report["removed_blobs"]:
+        lines.append(f"removed {report['removed_blobs']} unreferenced blobs")
+    lines.append(
+        f"{format_size(report['bytes_before'])} -> {format_size(report['bytes_after'])} "
+        f"({verb} {format_size(report['reclaimed'])})"
+    )
+    return "\n".join(lines)
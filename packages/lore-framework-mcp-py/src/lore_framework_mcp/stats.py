@@ -0,0 +1,125 @@
+"""
+Lore Framework Stats
+
+Per-phase instrumentation. Commands and their phases run inside span(name);
+spans nest into dotted paths (generate-index.parse-tasks), and count(name, n)
+adds to the innermost open span: files stat'd, read, parsed or skipped
+(served from the parse cache), bytes read, files written. Every finished span
+is added to process-wide totals, which the MCP server reports through
+lore_framework_stats; profile() also collects the spans of a single run for
+the CLI's --profile output.
+
+The span stack lives in a context variable, so concurrent async tools keep
+separate stacks and anyio worker threads inherit the caller's. Thread pools
+join the caller's span with attach() as their initializer.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_stack: ContextVar[tuple] = ContextVar("lore_stats_stack", default=())
+_profile: ContextVar[list | None] = ContextVar("lore_stats_profile", default=None)
+
+# Cumulative totals for this process: span path -> {"calls", "ms", "counts"}
+_totals: dict[str, dict] = {}
+_lock = threading.Lock()
+_since = time.time()
+
+
+def merge(into: dict, counts: dict) -> None:
+    """Add counts into into."""
+    for name, n in counts.items():
+        into[name] = into.get(name, 0) + n
+
+
+@contextmanager
+def span(name: str):
+    """Time the block as phase name (nested under the current span)."""
+    stack = _stack.get()
+    path = f"{stack[-1]['span']}.{name}" if stack else name
+    entry = {"span": path, "ms": 0.0, "counts": {}}
+    collected = _profile.get()
+    if collected is not None:
+        collected.append(entry)
+
+    token = _stack.set(stack + (entry,))
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        _stack.reset(token)
+        with _lock:
+            total = _totals.setdefault(path, {"calls": 0, "ms": 0.0, "counts": {}})
+            total["calls"] += 1
+            total["ms"] += entry["ms"]
+            merge(total["counts"], entry["counts"])
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to counter name of the innermost open span (no-op outside spans)."""
+    stack = _stack.get()
+    if stack:
+        counts = stack[-1]["counts"]
+        with _lock:
+            counts[name] = counts.get(name, 0) + n
+
+
+def current() -> tuple:
+    """The open span stack, for attach() in another thread."""
+    return _stack.get()
+
+
+def attach(stack: tuple) -> None:
+    """Make this thread count into stack's innermost span (thread pool initializer)."""
+    _stack.set(stack)
+
+
+@contextmanager
+def profile():
+    """Collect the spans opened inside the block; yields the list they go into."""
+    spans = []
+    token = _profile.set(spans)
+    try:
+        yield spans
+    finally:
+        _profile.reset(token)
+
+
+def profile_report(spans: list[dict]) -> dict:
+    """--profile output: total time and counts of the top-level spans, and every span."""
+    counts = {}
+    for entry in spans:
+        merge(counts, entry["counts"])
+    top = [entry for entry in spans if "." not in entry["span"]]
+    return {"ms": round(sum(entry["ms"] for entry in top), 3), "counts": counts, "spans": spans}
+
+
+def snapshot(reset: bool = False) -> dict:
+    """Cumulative metrics since the process started (or the last reset).
+
+    Returns {"since", "uptime_s", "spans": {path: {"calls", "ms", "avg_ms",
+    "counts"}}}; a span's counts exclude those made in its child spans.
+    """
+    global _since
+    with _lock:
+        spans = {
+            path: {
+                "calls": total["calls"],
+                "ms": round(total["ms"], 3),
+                "avg_ms": round(total["ms"] / total["calls"], 3),
+                "counts": dict(sorted(total["counts"].items())),
+            }
+            for path, total in sorted(_totals.items())
+        }
+        since = _since
+        if reset:
+            _totals.clear()
+            _since = time.time()
+    return {
+        "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(since)),
+        "uptime_s": round(time.time() - since, 1),
+        "spans": spans,
+    }
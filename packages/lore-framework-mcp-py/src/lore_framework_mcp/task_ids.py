@@ -0,0 +1,163 @@
+"""
+Lore Framework Task ID Index
+
+Persisted task ID -> path index in lore/0-session/.cache/task-ids.json, so
+set-task resolves an ID with a dictionary hit instead of walking all status
+directories. The index is rebuilt as a side effect of generate-index and
+validated lazily: a hit is only trusted if the target still exists, and a
+miss falls back to a full scan. Unlike the first-match scan, the index keeps
+every path per ID, so duplicate IDs across status directories are reported.
+"""
+
+import json
+from pathlib import Path
+
+from . import stats
+from .cache import get_cache_dir, scan_position, write_atomic
+
+INDEX_FILE = "task-ids.json"
+STATUS_DIRS = ["active", "blocked", "archive", "backlog"]
+
+# Indexes loaded or rebuilt in this process, keyed by lore/ directory
+_loaded: dict[Path, "TaskIdIndex"] = {}
+
+
+def normalize_task_id(task_id: str) -> str:
+    """Normalize task ID for lookup ("0012" and "12" are the same task)."""
+    return str(task_id).lstrip("0") or "0"
+
+
+def scan_task_paths(lore_dir: Path, task_id: str) -> list[Path]:
+    """Find all task files for an ID by scanning every status directory."""
+    tasks_dir = lore_dir / "1-tasks"
+    task_num = normalize_task_id(task_id)
+    paths = []
+
+    for status_dir in STATUS_DIRS:
+        status_path = tasks_dir / status_dir
+        if not status_path.exists():
+            continue
+
+        for item in sorted(status_path.iterdir()):
+            if item.name.startswith("_"):
+                continue
+
+            if normalize_task_id(item.name.split("_")[0]) == task_num:
+                stats.count("stat")
+                if item.is_dir():
+                    readme = item / "README.md"
+                    if readme.exists():
+                        paths.append(readme)
+                elif item.suffix == ".md":
+                    paths.append(item)
+
+    return paths
+
+
+class TaskIdIndex:
+    """Normalized task ID -> list of task file paths relative to lore/."""
+
+    def __init__(self, lore_dir: Path, ids: dict | None = None):
+        self.lore_dir = lore_dir
+        self.ids = ids or {}
+
+    @property
+    def path(self) -> Path | None:
+        if not (self.lore_dir / "0-session").exists():
+            return None
+        return get_cache_dir(self.lore_dir) / INDEX_FILE
+
+    @classmethod
+    def load(cls, lore_dir: Path) -> "TaskIdIndex":
+        """Load index for lore_dir (empty if never built)."""
+        if lore_dir in _loaded:
+            return _loaded[lore_dir]
+
+        index = cls(lore_dir)
+        if index.path:
+            try:
+                text = index.path.read_text()
+                stats.count("read")
+                stats.count("bytes_read", len(text))
+                data = json.loads(text)
+                if isinstance(data, dict):
+                    index.ids = data
+            except (OSError, ValueError):
+                pass
+
+        _loaded[lore_dir] = index
+        return index
+
+    @classmethod
+    def rebuild(cls, lore_dir: Path, task_files: list[tuple[str, str, Path]]) -> "TaskIdIndex":
+        """Rebuild from scanned (status_dir, task_id, task_path) entries and save."""
+        ids = {}
+        for _, task_id, task_path in task_files:
+            ids.setdefault(normalize_task_id(task_id), []).append(task_path.relative_to(lore_dir).as_posix())
+
+        index = cls(lore_dir, ids)
+        index.save()
+        _loaded[lore_dir] = index
+        return index
+
+    def save(self) -> None:
+        """Persist index (no-op without 0-session/)."""
+        if self.path:
+            self.path.parent.mkdir(exist_ok=True)
+            write_atomic(self.path, json.dumps(self.ids, sort_keys=True))
+
+    def update(self, task_id: str, rel_path: str, exists: bool) -> None:
+        """Add or remove a single task path after an incremental update."""
+        key = normalize_task_id(task_id)
+        paths = self.ids.get(key, [])
+        if exists and rel_path not in paths:
+            # Same order as rebuild(): the scan order
+            self.ids[key] = sorted(paths + [rel_path], key=scan_position)
+        elif not exists and rel_path in paths:
+            paths = [p for p in paths if p != rel_path]
+            if paths:
+                self.ids[key] = paths
+            else:
+                del self.ids[key]
+        else:
+            return
+        self.save()
+
+    def lookup(self, task_id: str) -> list[Path]:
+        """Find all task files for an ID, falling back to a scan on a miss."""
+        key = normalize_task_id(task_id)
+        paths = [self.lore_dir / p for p in self.ids.get(key, [])]
+        stats.count("stat", len(paths))
+        paths = [p for p in paths if p.exists()]
+        if paths:
+            return paths
+
+        with stats.span("scan"):
+            paths = scan_task_paths(self.lore_dir, task_id)
+        if paths:
+            self.ids[key] = [p.relative_to(self.lore_dir).as_posix() for p in paths]
+            self.save()
+        return paths
+
+    def duplicates(self) -> dict:
+        """IDs that map to more than one existing task file."""
+        duplicates = {}
+        for task_id, paths in self.ids.items():
+            if len(paths) > 1:
+                paths = [p for p in paths if (self.lore_dir / p).exists()]
+                if len(paths) > 1:
+                    duplicates[task_id] = paths
+        return duplicates
+
+
+def forget(lore_dir: Path) -> None:
+    """Drop the in-memory index for lore_dir."""
+    _loaded.pop(lore_dir, None)
+
+
+def format_duplicates(duplicates: dict) -> list[str]:
+    """Human-readable warnings for duplicate task IDs."""
+    return [
+        f"Warning: duplicate task ID {task_id}: {', '.join(paths)}"
+        for task_id, paths in sorted(duplicates.items(), key=lambda item: (len(item[0]), item[0]))
+    ]
@@ -0,0 +1,213 @@
+"""
+Lore Framework Worklog Timeline
+
+Cross-task index of worklogs (`worklog/YYYY-MM-DD_*.md` inside task
+directories), sorted by date. Each worklog's frontmatter is read header-only
+and reduced to date (from a YYYY-MM-DD `date`, else the file name), session, focus, tags
+and title (first heading). Bodies are only read when a caller asks for them.
+
+Per-file records are persisted in lore/0-session/.cache/timeline-cache.json
+and validated by stat like the parse cache, so only new or changed worklogs
+are re-read. The sorted timeline is kept in memory and rebuilt only when a
+record changed; date ranges are found by bisection, so a query touches only
+the entries it returns.
+"""
+
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Iterator
+
+from .cache import ParseCache, Progress, load_records
+from .core import extract_title, list_of_strings
+from .reader import BOUNDARY, parse_head
+from .task_ids import normalize_task_id
+
+CACHE_NAME = "timeline-cache.json"
+STATUS_DIRS = ["active", "blocked", "archive", "backlog"]
+WORKLOG_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})_.+\.md$")
+DAY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DAYS_AGO = re.compile(r"^(\d+)d$")
+
+# Timelines built in this process, keyed by lore/ directory
+_timelines: dict[Path, "Timeline"] = {}
+_lock = threading.Lock()
+
+
+def build_worklog_record(lore_dir: Path, task_dir: Path, status: str, worklog_path: Path, head: bytes) -> dict | None:
+    """Build a timeline record from a worklog's frontmatter head.
+
+    The frontmatter date wins when it is a YYYY-MM-DD day; otherwise (missing,
+    or e.g. "2025-1-5") the file name's date is used. Worklogs with neither
+    are skipped.
+    """
+    meta, body = parse_head(head)
+    day = str(meta["date"])[:10] if meta.get("date") else ""
+    if not DAY.match(day):
+        match = WORKLOG_NAME.match(worklog_path.name)
+        day = match.group(1) if match else ""
+    if not DAY.match(day):
+        return None
+
+    session = meta.get("session")
+    return {
+        "date": day,
+        "session": session if isinstance(session, int) and not isinstance(session, bool) else None,
+        "focus": str(meta["focus"]) if meta.get("focus") else None,
+        "tags": list_of_strings(meta.get("tags")),
+        "title": extract_title(body),
+        "task_id": task_dir.name.split("_")[0],
+        "status": status,
+        "task": task_dir.relative_to(lore_dir.parent).as_posix(),
+        "path": worklog_path.relative_to(lore_dir.parent).as_posix(),
+    }
+
+
+def scan_worklog_files(lore_dir: Path) -> list[tuple[Path, str, Path]]:
+    """List (task dir, status, worklog file) for every markdown file in a task's worklog/."""
+    files = []
+    for status in STATUS_DIRS:
+        status_path = lore_dir / "1-tasks" / status
+        if not status_path.exists():
+            continue
+        with os.scandir(status_path) as entries:
+            task_dirs = [Path(entry.path) for entry in entries if entry.is_dir() and not entry.name.startswith("_")]
+        for task_dir in sorted(task_dirs):
+            try:
+                with os.scandir(task_dir / "worklog") as entries:
+                    names = sorted(e.name for e in entries if e.name.endswith(".md") and not e.name.startswith("."))
+            except OSError:
+                continue
+            files.extend((task_dir, status, task_dir / "worklog" / name) for name in names)
+    return files
+
+
+class Timeline:
+    """Worklog records sorted by (date, session, path)."""
+
+    def __init__(self, records: list[dict]):
+        self.records = {record["path"]: record for record in records}
+        self.entries = sorted(records, key=lambda r: (r["date"], r["session"] or 0, r["path"]))
+        self.dates = [entry["date"] for entry in self.entries]
+
+    def between(self, since: str | None = None, until: str | None = None) -> list[dict]:
+        """Entries dated since..until (inclusive, either open)."""
+        start = bisect_left(self.dates, since) if since else 0
+        end = bisect_right(self.dates, until) if until else len(self.dates)
+        return self.entries[start:end]
+
+
+def load_timeline(lore_dir: Path, jobs: int | None = None, progress: Progress | None = None) -> Timeline:
+    """Bring the timeline index up to date and return it."""
+    cache = ParseCache.load(lore_dir, CACHE_NAME)
+    with _lock, cache.lock:
+        cache.seen.clear()
+        sources = [
+            (worklog_path, partial(build_worklog_record, lore_dir, task_dir, status, worklog_path))
+            for task_dir, status, worklog_path in scan_worklog_files(lore_dir)
+        ]
+        records = load_records(lore_dir, sources, cache, jobs, progress, "read worklogs")
+        cache.save()
+
+        timeline = _timelines.get(lore_dir)
+        if timeline is None or timeline.records != {record["path"]: record for record in records}:
+            timeline = Timeline(records)
+            _timelines[lore_dir] = timeline
+        return timeline
+
+
+def forget(lore_dir: Path) -> None:
+    """Drop the in-memory timeline for lore_dir."""
+    with _lock:
+        _timelines.pop(lore_dir, None)
+
+
+def parse_day(value: str | None, today: date | None = None) -> str | None:
+    """Normalize a date bound: YYYY-MM-DD, or Nd for N days ago. Raises ValueError."""
+    if not value:
+        return None
+    value = str(value).strip()
+    match = DAYS_AGO.match(value)
+    if match:
+        return ((today or date.today()) - timedelta(days=int(match.group(1)))).isoformat()
+    if not DAY.match(value):
+        raise ValueError(f"expected a date as YYYY-MM-DD or Nd (days ago), got '{value}'")
+    return value
+
+
+def read_body(path: Path) -> str | None:
+    """Worklog text after its frontmatter (None if unreadable)."""
+    try:
+        lines = path.read_text(errors="replace").lstrip("\ufeff").splitlines(keepends=True)
+    except OSError:
+        return None
+    if lines and BOUNDARY.match(lines[0].encode()):
+        end = next((i for i in range(1, len(lines)) if BOUNDARY.match(lines[i].encode())), None)
+        if end is not None:
+            lines = lines[end + 1:]
+    return "".join(lines).strip()
+
+
+def iter_timeline(
+    lore_dir: Path,
+    since: str | None = None,
+    until: str | None = None,
+    tags: list[str] | None = None,
+    task_id: str | None = None,
+    newest_first: bool = False,
+    body: bool = False,
+    progress: Progress | None = None,
+) -> Iterator[dict]:
+    """Yield worklog entries dated since..until that have all tags (and belong to task_id).
+
+    since/until take YYYY-MM-DD or Nd; with body, each entry also carries
+    its text, read as it is yielded.
+    """
+    since, until = parse_day(since), parse_day(until)
+    entries = load_timeline(lore_dir, progress=progress).between(since, until)
+    if newest_first:
+        entries = reversed(entries)
+
+    wanted = set(tags or ())
+    key = normalize_task_id(task_id) if task_id else None
+    for entry in entries:
+        if wanted and not wanted <= set(entry["tags"]):
+            continue
+        if key and normalize_task_id(entry["task_id"]) != key:
+            continue
+        if body:
+            entry = {**entry, "body": read_body(lore_dir.parent / entry["path"])}
+        yield entry
+
+
+def timeline_page(
+    lore_dir: Path,
+    offset: int = 0,
+    limit: int = 50,
+    progress: Progress | None = None,
+    **filters,
+) -> dict:
+    """One page of iter_timeline(**filters): {"total", "offset", "limit", "items"}.
+
+    Bodies (body=True) are read for the returned page only.
+    """
+    body = filters.pop("body", False)
+    matches = list(iter_timeline(lore_dir, progress=progress, **filters))
+    page = matches[offset:offset + limit] if limit > 0 else matches[offset:]
+    if body:
+        page = [{**entry, "body": read_body(lore_dir.parent / entry["path"])} for entry in page]
+    return {"total": len(matches), "offset": offset, "limit": limit, "items": page}
+
+
+def format_entry(entry: dict) -> str:
+    """One CLI line (plus indented body, if read) for a timeline entry."""
+    session = f" #{entry['session']}" if entry["session"] is not None else ""
+    tags = f"  [{', '.join(entry['tags'])}]" if entry["tags"] else ""
+    line = f"{entry['date']}{session}  {entry['task_id']}  {entry['focus'] or entry['title']}{tags}\n    {entry['path']}"
+    if entry.get("body"):
+        line += "\n" + "\n".join(f"    | {text}" for text in entry["body"].splitlines())
+    return line
@@ -0,0 +1,399 @@
+"""
+Lore Framework Validation
+
+Frontmatter validation for tasks, ADRs, notes and worklogs. Task, ADR and note
+rules mirror the zod schemas of the TypeScript package (including its error
+messages); worklogs follow the documented worklog format (`date` required,
+optional `session`, `focus` and `tags`, file named YYYY-MM-DD_*.md).
+
+Files are validated across a thread pool. Results are cached per file in
+lore/0-session/.cache/validate-cache.json, keyed like the parse cache by
+mtime/size with a hash of the frontmatter as fallback, so re-validation only
+touches files whose frontmatter changed.
+"""
+
+import os
+import re
+import datetime
+from functools import partial
+from pathlib import Path
+
+import yaml
+
+from .cache import ParseCache, Progress, load_records
+from .reader import parse_head
+
+CACHE_NAME = "validate-cache.json"
+STATUS_DIRS = ["active", "blocked", "archive", "backlog"]
+
+TASK_TYPES = ["BUG", "FEATURE", "RESEARCH", "REFACTOR", "DOCS"]
+TASK_STATUSES = ["active", "blocked", "completed", "superseded", "canceled", "backlog"]
+ADR_STATUSES = ["proposed", "accepted", "deprecated", "superseded"]
+NOTE_TYPES = ["question", "idea", "research", "synthesis", "generation"]
+NOTE_STATUSES = ["seed", "developing", "mature", "superseded"]
+CANCEL_REASONS = ["pivot", "obsolete", "duplicate"]
+NOTE_PREFIXES = {"Q-": "question", "I-": "idea", "R-": "research", "S-": "synthesis", "G-": "generation"}
+
+DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+ID = re.compile(r"^\d+$")
+WORKLOG_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})_.+\.md$")
+
+
+# ============================================================================
+# Field checks (zod-style messages: "<path>: <message>")
+# ============================================================================
+
+def type_name(value) -> str:
+    """zod name for a value's type."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return "date"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return "string"
+
+
+def check_string(errors: list, data: dict, field: str, prefix: str = "", required: bool = True,
+                 empty_message: str | None = None, pattern: re.Pattern | None = None,
+                 pattern_message: str = "") -> None:
+    """Check an (optionally required) string field."""
+    path = f"{prefix}{field}"
+    if field not in data:
+        if required:
+            errors.append(f"{path}: Required")
+        return
+    value = data[field]
+    if not isinstance(value, str):
+        errors.append(f"{path}: Expected string, received {type_name(value)}")
+    elif empty_message and not value:
+        errors.append(f"{path}: {empty_message}")
+    elif pattern and not pattern.match(value):
+        errors.append(f"{path}: {pattern_message}")
+
+
+def check_date(errors: list, data: dict, field: str, prefix: str = "") -> None:
+    """Check a required YYYY-MM-DD date (YAML may already have parsed it)."""
+    if isinstance(data.get(field), datetime.date):
+        return
+    check_string(errors, data, field, prefix, pattern=DATE, pattern_message="Must be YYYY-MM-DD format")
+
+
+def check_enum(errors: list, data: dict, field: str, options: list[str], prefix: str = "", required: bool = True) -> None:
+    """Check an (optionally required) enum field."""
+    path = f"{prefix}{field}"
+    if field not in data:
+        if required:
+            errors.append(f"{path}: Required")
+        return
+    if data[field] not in options:
+        expected = " | ".join(f"'{option}'" for option in options)
+        errors.append(f"{path}: Invalid enum value. Expected {expected}, received '{data[field]}'")
+
+
+def check_string_list(errors: list, data: dict, field: str, prefix: str = "") -> None:
+    """Check an optional list of strings."""
+    path = f"{prefix}{field}"
+    if field not in data:
+        return
+    value = data[field]
+    if not isinstance(value, list):
+        errors.append(f"{path}: Expected array, received {type_name(value)}")
+        return
+    for i, item in enumerate(value):
+        if not isinstance(item, str):
+            errors.append(f"{path}.{i}: Expected string, received {type_name(item)}")
+
+
+def check_history(errors: list, meta: dict, check_entry) -> None:
+    """Check the required, non-empty history list with check_entry per entry."""
+    if "history" not in meta:
+        errors.append("history: Required")
+        return
+    history = meta["history"]
+    if not isinstance(history, list):
+        errors.append(f"history: Expected array, received {type_name(history)}")
+        return
+    if not history:
+        errors.append("history: history must have at least one entry")
+    for i, entry in enumerate(history):
+        prefix = f"history.{i}."
+        if not isinstance(entry, dict):
+            errors.append(f"history.{i}: Expected object, received {type_name(entry)}")
+            continue
+        check_date(errors, entry, "date", prefix)
+        check_string(errors, entry, "who", prefix, empty_message="who is required")
+        check_string(errors, entry, "note", prefix, required=False)
+        check_entry(errors, entry, prefix)
+
+
+def check_task_entry(errors: list, entry: dict, prefix: str) -> None:
+    check_enum(errors, entry, "status", TASK_STATUSES, prefix)
+    check_string_list(errors, entry, "by", prefix)
+    check_enum(errors, entry, "reason", CANCEL_REASONS, prefix, required=False)
+    if entry.get("status") in ("blocked", "superseded") and not entry.get("by"):
+        errors.append(f'{prefix[:-1]}: "by" is required for blocked/superseded status')
+    if entry.get("status") == "canceled" and not entry.get("reason"):
+        errors.append(f'{prefix[:-1]}: "reason" is required for canceled status')
+
+
+def check_superseded_by(errors: list, entry: dict, prefix: str) -> None:
+    check_string(errors, entry, "by", prefix, required=False)
+    if entry.get("status") == "superseded" and not entry.get("by"):
+        errors.append(f'{prefix[:-1]}: "by" is required for superseded status')
+
+
+def check_adr_entry(errors: list, entry: dict, prefix: str) -> None:
+    check_enum(errors, entry, "status", ADR_STATUSES, prefix)
+    check_superseded_by(errors, entry, prefix)
+
+
+def check_note_entry(errors: list, entry: dict, prefix: str) -> None:
+    check_enum(errors, entry, "status", NOTE_STATUSES, prefix)
+    check_superseded_by(errors, entry, prefix)
+    check_string_list(errors, entry, "spawned_from", prefix)
+    check_string_list(errors, entry, "spawns", prefix)
+
+
+# ============================================================================
+# Validators
+# ============================================================================
+
+def validate_task(meta: dict, file_path: Path) -> tuple[list, list]:
+    """Validate task frontmatter. Returns (errors, warnings)."""
+    errors = []
+    check_string(errors, meta, "id", pattern=ID, pattern_message='Must be numeric (e.g., "0001")')
+    check_string(errors, meta, "title", empty_message="title is required")
+    check_enum(errors, meta, "type", TASK_TYPES)
+    check_enum(errors, meta, "status", TASK_STATUSES)
+    for field in ("related_adr", "related_tasks", "tags", "links"):
+        check_string_list(errors, meta, field)
+    check_history(errors, meta, check_task_entry)
+    return errors, []
+
+
+def validate_adr(meta: dict, file_path: Path) -> tuple[list, list]:
+    """Validate ADR frontmatter. Returns (errors, warnings)."""
+    errors = []
+    check_string(errors, meta, "id", pattern=ID, pattern_message='Must be numeric (e.g., "0001")')
+    check_string(errors, meta, "title", empty_message="title is required")
+    check_enum(errors, meta, "status", ADR_STATUSES)
+    if "deciders" not in meta:
+        errors.append("deciders: Required")
+    else:
+        check_string_list(errors, meta, "deciders")
+        if isinstance(meta["deciders"], list) and not meta["deciders"]:
+            errors.append("deciders: deciders must have at least one entry")
+    for field in ("related_tasks", "tags", "links"):
+        check_string_list(errors, meta, field)
+    check_history(errors, meta, check_adr_entry)
+    return errors, []
+
+
+def validate_note(meta: dict, file_path: Path) -> tuple[list, list]:
+    """Validate note frontmatter and its type against the filename prefix."""
+    errors = []
+    warnings = []
+    check_string(errors, meta, "title", empty_message="title is required")
+    check_enum(errors, meta, "type", NOTE_TYPES)
+    check_enum(errors, meta, "status", NOTE_STATUSES)
+    for field in ("tags", "links"):
+        check_string_list(errors, meta, field)
+    check_history(errors, meta, check_note_entry)
+
+    # Directory notes (notes/R-x/README.md) take the prefix from the directory
+    name = file_path.parent.name if file_path.name == "README.md" else file_path.name
+    for prefix, expected in NOTE_PREFIXES.items():
+        if name.startswith(prefix) and meta.get("type") and meta["type"] != expected:
+            errors.append(f'Type mismatch: file prefix "{prefix}" expects type "{expected}" but found "{meta["type"]}"')
+
+    if meta.get("spawned_from"):
+        check_string(errors, meta, "spawned_from", required=False)
+        warnings.append('Top-level "spawned_from" is deprecated. Move to history entry with spawned_from array.')
+    if meta.get("spawns"):
+        check_string_list(errors, meta, "spawns")
+        warnings.append('Top-level "spawns" is deprecated. Move to history entry with spawns array.')
+    return errors, warnings
+
+
+def validate_worklog(meta: dict, file_path: Path) -> tuple[list, list]:
+    """Validate worklog frontmatter and filename."""
+    errors = []
+    warnings = []
+    check_date(errors, meta, "date")
+    if "session" in meta and (not isinstance(meta["session"], int) or isinstance(meta["session"], bool)):
+        errors.append(f"session: Expected number, received {type_name(meta['session'])}")
+    check_string(errors, meta, "focus", required=False)
+    check_string_list(errors, meta, "tags")
+
+    match = WORKLOG_NAME.match(file_path.name)
+    if not match:
+        warnings.append("File name should be YYYY-MM-DD_description.md")
+    elif "date" in meta and str(meta["date"]) != match.group(1):
+        warnings.append(f'date {meta["date"]} does not match file name date {match.group(1)}')
+    return errors, warnings
+
+
+VALIDATORS = {
+    "task": validate_task,
+    "adr": validate_adr,
+    "note": validate_note,
+    "worklog": validate_worklog,
+}
+
+
+def validate_head(kind: str, file_path: Path, head: bytes) -> dict:
+    """Validate one file's frontmatter head. Returns {"type", "errors", "warnings"}."""
+    try:
+        meta, _ = parse_head(head)
+        if not meta:
+            return {"type": kind, "errors": ["No frontmatter found"], "warnings": []}
+        errors, warnings = VALIDATORS[kind](meta, file_path)
+    except (yaml.YAMLError, UnicodeDecodeError, TypeError, ValueError) as e:
+        return {"type": kind, "errors": [f"Failed to parse file: {e}"], "warnings": []}
+    return {"type": kind, "errors": errors, "warnings": warnings}
+
+
+# ============================================================================
+# File discovery and runs
+# ============================================================================
+
+def detect_kind(lore_dir: Path, file_path: Path) -> str | None:
+    """Content type of a file inside lore/ (None if not validated)."""
+    try:
+        parts = file_path.relative_to(lore_dir).parts
+    except ValueError:
+        return None
+    if not parts or not file_path.name.endswith(".md"):
+        return None
+    if parts[0] == "2-adrs" and len(parts) == 2:
+        return "adr"
+    if parts[0] != "1-tasks" or len(parts) < 3:
+        return None
+    if "notes" in parts[3:]:
+        return "note"
+    if len(parts) == 5 and parts[3] == "worklog":
+        return "worklog"
+    if len(parts) == 3 or (len(parts) == 4 and parts[3] == "README.md"):
+        return "task"
+    return None
+
+
+def scan_validated_files(lore_dir: Path) -> list[tuple[str, Path]]:
+    """List (kind, file) for all tasks, notes, worklogs and ADRs."""
+    files = []
+
+    def scan_notes(directory: str) -> None:
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir():
+                    scan_notes(entry.path)
+                elif entry.name.endswith(".md") and not entry.name.startswith("."):
+                    files.append(("note", Path(entry.path)))
+
+    for status in STATUS_DIRS:
+        try:
+            with os.scandir(lore_dir / "1-tasks" / status) as entries:
+                items = sorted(entries, key=lambda e: e.name)
+        except OSError:
+            continue
+        for item in items:
+            if item.name.startswith("_"):
+                continue
+            if item.name.endswith(".md") and item.is_file():
+                files.append(("task", Path(item.path)))
+            elif item.is_dir():
+                with os.scandir(item.path) as entries:
+                    children = {entry.name: entry for entry in entries}
+                if "README.md" in children:
+                    files.append(("task", Path(item.path) / "README.md"))
+                if "notes" in children and children["notes"].is_dir():
+                    scan_notes(children["notes"].path)
+                if "worklog" in children and children["worklog"].is_dir():
+                    with os.scandir(children["worklog"].path) as entries:
+                        names = sorted(entry.name for entry in entries if entry.name.endswith(".md"))
+                    files.extend(("worklog", Path(item.path) / "worklog" / name) for name in names)
+
+    adr_dir = lore_dir / "2-adrs"
+    if adr_dir.exists():
+        files.extend(("adr", path) for path in sorted(adr_dir.glob("*.md")) if not path.name.startswith("_"))
+    return files
+
+
+def run_validation(
+    lore_dir: Path,
+    file_path: str | None = None,
+    jobs: int | None = None,
+    progress: Progress | None = None,
+) -> dict:
+    """Validate one file (absolute or project-relative path) or the whole tree.
+
+    Returns {"files", "errors", "warnings", "results"}, where results lists
+    only files with errors or warnings as {"path", "type", "errors", "warnings"}.
+    """
+    if file_path is not None:
+        file_path = Path(os.path.normpath(lore_dir.parent / file_path))
+        if not file_path.is_file():
+            raise ValueError(f"File not found: {file_path}")
+        kind = detect_kind(lore_dir, file_path)
+        if kind is None:
+            raise ValueError(f"Cannot determine content type for: {file_path}")
+        files = [(kind, file_path)]
+    else:
+        files = scan_validated_files(lore_dir)
+
+    def build(kind: str, path: Path, head: bytes) -> dict:
+        return {"path": path.relative_to(lore_dir.parent).as_posix(), **validate_head(kind, path, head)}
+
+    cache = ParseCache.load(lore_dir, CACHE_NAME)
+    with cache.lock:
+        if file_path is None:
+            cache.seen.clear()
+        sources = [(path, partial(build, kind, path)) for kind, path in files]
+        results = load_records(lore_dir, sources, cache, jobs, progress, "validate")
+        cache.save(prune=file_path is None)
+
+    # Files that could not be read at all are reported too
+    checked = {result["path"] for result in results}
+    for kind, path in files:
+        rel_path = path.relative_to(lore_dir.parent).as_posix()
+        if rel_path not in checked:
+            results.append({"path": rel_path, "type": kind, "errors": ["Failed to read file"], "warnings": []})
+
+    problems = [result for result in results if result["errors"] or result["warnings"]]
+    return {
+        "files": len(files),
+        "errors": sum(len(result["errors"]) for result in problems),
+        "warnings": sum(len(result["warnings"]) for result in problems),
+        "results": sorted(problems, key=lambda result: result["path"]),
+    }
+
+
+def format_validation(report: dict) -> str:
+    """Markdown summary in the format of the TypeScript validate tool."""
+    files_with_errors = [r for r in report["results"] if r["errors"]]
+    files_with_warnings = [r for r in report["results"] if r["warnings"]]
+    lines = [
+        "# Validation Results\n",
+        f"**Files checked:** {report['files']}",
+        f"**Errors:** {report['errors']} in {len(files_with_errors)} files",
+        f"**Warnings:** {report['warnings']} in {len(files_with_warnings)} files",
+    ]
+    if not report["results"]:
+        lines.append("\nAll files valid!")
+
+    for result in report["results"]:
+        lines.append(f"\n## {result['path']} ({result['type']})")
+        if result["errors"]:
+            lines.append("\n**Errors:**")
+            lines.extend(f"- {error}" for error in result["errors"])
+        if result["warnings"]:
+            lines.append("\n**Warnings:**")
+            lines.extend(f"- {warning}" for warning in result["warnings"])
+    return "\n".join(lines)
@@ -0,0 +1,312 @@
+"""
+Lore Framework Watch Mode
+
+Opt-in filesystem watcher for the MCP server (LORE_FRAMEWORK_WATCH=1). Watches
+lore/1-tasks and lore/2-adrs with inotify, falling back to stat polling where
+inotify is unavailable (or with LORE_FRAMEWORK_WATCH=poll), keeps a live
+in-memory task/ADR model and regenerates README.md and next-tasks.md after a
+debounce. Edits made outside the agent keep the index current without any
+hook process.
+
+With inotify the watcher also covers every directory the full-text search
+indexes and feeds the changed paths to search.py, so searches stat only what
+changed. When a watch cannot be added or events overflow, the feed reports
+"unknown" and the next search walks the corpus.
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from pathlib import Path
+
+from .cache import ParseCache
+from .core import affects_index, build_index, relative_to_lore, write_index
+from .search import SEARCHED_DIRS, set_change_feed
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+STATUS_DIRS = ["active", "blocked", "archive", "backlog"]
+DEBOUNCE = 0.5
+POLL_INTERVAL = 2.0
+# Above this many changed files a full (cached) rescan is cheaper than patching
+MAX_INCREMENTAL = 32
+
+# Running watchers keyed by lore/ directory
+_watchers: dict[Path, "LoreWatcher"] = {}
+
+
+def get_watcher(lore_dir: Path) -> "LoreWatcher | None":
+    """Get the running watcher for lore_dir, if any."""
+    return _watchers.get(lore_dir)
+
+
+class Inotify:
+    """Minimal inotify binding over libc via ctypes (Linux only)."""
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        self.watched = set()
+
+    def add(self, path: Path) -> bool:
+        """Watch a directory (non-recursive). Returns False if the watch failed."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            return False
+        self.dirs[wd] = path
+        self.watched.add(path)
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout for events to be readable."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready)
+
+    def read(self, timeout: float) -> list[tuple[Path | None, int]]:
+        """Wait up to timeout for events. Returns (path, mask) pairs."""
+        if not self.wait(timeout):
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_IGNORED:
+                self.watched.discard(self.dirs.pop(wd, None))
+                continue
+            directory = self.dirs.get(wd)
+            path = directory / os.fsdecode(name) if directory and name else directory
+            events.append((path, mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class LoreWatcher:
+    """Keeps a live task/ADR model for lore_dir and rewrites the index on change."""
+
+    def __init__(self, lore_dir: Path, poll: bool = False, debounce: float = DEBOUNCE):
+        self.lore_dir = lore_dir
+        self.poll = poll
+        self.debounce = debounce
+        self.inotify = None
+        self.tasks = {}
+        self.adrs = {}
+        self.blocks = {}
+        self.version = 0
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.full = True
+        # Search change feed: lore/-relative paths since the last search, or unknown
+        self.search_pending = set()
+        self.search_full = True
+        self.search_complete = True
+        self.last_event = 0.0
+        # Held while reading and recording events (run loop and search feed)
+        self.events_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        """Start watching in a daemon thread."""
+        if not self.poll:
+            try:
+                self.inotify = Inotify()
+                self.add_tree(self.lore_dir)
+                self.add_search_tree(self.lore_dir)
+            except (OSError, AttributeError, TypeError):
+                self.inotify = None
+
+        _watchers[self.lore_dir] = self
+        if self.inotify:
+            set_change_feed(self.lore_dir, self.search_changes)
+        self.thread = threading.Thread(target=self.run, name="lore-watch", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self.stopped.set()
+        set_change_feed(self.lore_dir, None)
+        if self.thread:
+            self.thread.join(timeout=5)
+        if self.inotify:
+            self.inotify.close()
+            self.inotify = None
+        _watchers.pop(self.lore_dir, None)
+
+    def add_tree(self, path: Path) -> None:
+        """Watch path and the directories below it that can hold index sources."""
+        rel_path = relative_to_lore(self.lore_dir, path)
+        if rel_path is None:
+            return
+        parts = rel_path.parts
+
+        if not parts:
+            # lore/ itself, to notice 1-tasks/ or 2-adrs/ being created
+            self.inotify.add(path)
+            children = [path / "1-tasks", path / "2-adrs"]
+        elif parts == ("1-tasks",):
+            self.inotify.add(path)
+            children = [path / status for status in STATUS_DIRS]
+        elif parts[0] == "1-tasks" and len(parts) == 2 and parts[1] in STATUS_DIRS:
+            self.inotify.add(path)
+            children = [p for p in path.iterdir() if p.is_dir()]
+        elif (parts[0] == "1-tasks" and len(parts) == 3) or parts == ("2-adrs",):
+            self.inotify.add(path)
+            children = []
+        else:
+            return
+
+        for child in children:
+            if child.is_dir():
+                self.add_tree(child)
+
+    def add_search_tree(self, path: Path) -> None:
+        """Watch the directories at or below path that the full-text search indexes.
+
+        Added after the index watches, so running out of watches only costs
+        the search feed.
+        """
+        rel_path = relative_to_lore(self.lore_dir, path)
+        if rel_path is None:
+            return
+        if not rel_path.parts:
+            roots = [path / name for name in SEARCHED_DIRS]
+        elif rel_path.parts[0] in SEARCHED_DIRS:
+            roots = [path]
+        else:
+            return
+
+        for root in roots:
+            for dir_path, dir_names, _ in os.walk(root):
+                dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+                dir_path = Path(dir_path)
+                if dir_path not in self.inotify.watched and not self.inotify.add(dir_path):
+                    self.search_full = True
+                    self.search_complete = False
+
+    def handle(self, path: Path | None, mask: int) -> None:
+        """Record a filesystem event for the next refresh."""
+        self.last_event = time.monotonic()
+        if mask & IN_Q_OVERFLOW or path is None:
+            self.full = True
+            self.search_full = True
+            return
+
+        try:
+            self.search_pending.add(path.relative_to(self.lore_dir).as_posix())
+        except ValueError:
+            pass
+
+        if not mask & IN_ISDIR:
+            self.pending.add(path)
+            return
+
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            self.add_tree(path)
+            self.add_search_tree(path)
+
+        rel_path = relative_to_lore(self.lore_dir, path)
+        if rel_path is None or len(rel_path.parts) > 3:
+            return  # notes/, worklog/, sources/ ...
+        if rel_path.parts and rel_path.parts[0] not in ("1-tasks", "2-adrs"):
+            return  # index/, 0-session/ ...
+        if len(rel_path.parts) == 3 and rel_path.parts[0] == "1-tasks":
+            # Task directory created, moved or removed: its README changed
+            self.pending.add(path / "README.md")
+        else:
+            self.full = True
+
+    def search_changes(self) -> list[str] | None:
+        """Paths changed since the last call (the search change feed), or None if unknown.
+
+        Events already queued by the kernel are read first, so a file written
+        just before a search is included.
+        """
+        with self.events_lock:
+            for path, mask in self.inotify.read(0) if self.inotify else []:
+                self.handle(path, mask)
+            full, self.search_full = self.search_full or not self.search_complete, False
+            changed, self.search_pending = self.search_pending, set()
+        return None if full else sorted(changed)
+
+    def run(self) -> None:
+        """Watch loop: collect events, refresh after debounce quiet period."""
+        while not self.stopped.is_set():
+            if self.inotify:
+                self.inotify.wait(self.debounce)
+                with self.events_lock:
+                    events = self.inotify.read(0)
+                    for path, mask in events:
+                        self.handle(path, mask)
+                if events:
+                    continue
+                if time.monotonic() - self.last_event < self.debounce:
+                    continue
+            elif not self.full:
+                self.stopped.wait(POLL_INTERVAL)
+                self.full = True
+                continue
+
+            if self.full or self.pending:
+                try:
+                    self.refresh()
+                except Exception:
+                    pass
+
+    def refresh(self) -> None:
+        """Bring the model up to date and rewrite the index if it changed."""
+        with self.events_lock:
+            full, self.full = self.full, False
+            pending, self.pending = self.pending, set()
+        changed = [p for p in pending if affects_index(self.lore_dir, p)]
+        if not full and not changed:
+            return
+
+        cache = ParseCache.load(self.lore_dir)
+        if full or len(changed) > MAX_INCREMENTAL:
+            tasks, adrs, blocks = build_index(self.lore_dir, cache)
+        else:
+            for path in changed:
+                tasks, adrs, blocks = build_index(self.lore_dir, cache, path)
+
+        with self.lock:
+            if (tasks, adrs) == (self.tasks, self.adrs) and self.version:
+                return
+            self.tasks, self.adrs = tasks, adrs
+            self.blocks = {tid: list(ids) for tid, ids in blocks.items()}
+            self.version += 1
+
+        write_index(self.lore_dir, tasks, adrs, blocks)
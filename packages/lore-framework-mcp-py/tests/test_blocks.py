@@ -0,0 +1,26 @@
+"""Tests for the blocks map behind the README Blocks column."""
+
+from lore_framework_mcp.core import compute_blocks, patch_blocks
+from lore_framework_mcp.graph import TaskGraph
+from lore_framework_mcp.records import TaskRecord
+
+
+def task(task_id, blocked_by=()):
+    return TaskRecord(task_id, f"Task {task_id}", "FEATURE", "blocked" if blocked_by else "active",
+                      f"lore/1-tasks/active/{task_id}_FEATURE_x.md", blocked_by)
+
+
+def test_blocks_match_graph_for_unpadded_ids():
+    tasks = {t.id: t for t in [task("0001"), task("0002", ["1", "0001"]), task("0003", ["2"])]}
+    blocks = compute_blocks(tasks)
+    assert blocks == {"0001": ["0002"], "0002": ["0003"], "0003": []}
+    assert blocks == TaskGraph(tasks).dependents
+
+
+def test_patch_blocks_resolves_unpadded_ids():
+    tasks = {t.id: t for t in [task("0001"), task("0002"), task("0003", ["1"])]}
+    blocks = compute_blocks(tasks)
+    new = task("0003", ["2"])
+    tasks["0003"] = new
+    patch_blocks(blocks, tasks, task("0003", ["1"]), new)
+    assert blocks == compute_blocks(tasks)
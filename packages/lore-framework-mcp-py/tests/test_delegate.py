@@ -0,0 +1,48 @@
+"""Tests for CLI delegation to a running server."""
+
+import time
+
+from lore_framework_mcp import delegate
+from lore_framework_mcp.cache import env_setting
+from lore_framework_mcp.delegate import DelegateServer, try_delegate
+
+
+def print_index_setting(argv):
+    print(env_setting("LORE_FRAMEWORK_INDEX", "unset"))
+    return 0
+
+
+def test_caller_settings_apply_per_command(tmp_path, monkeypatch):
+    monkeypatch.setenv("LORE_FRAMEWORK_INDEX", "flat")
+    server = DelegateServer(tmp_path, print_index_setting)
+
+    assert server.execute(["lfm", "generate-index"], {"LORE_FRAMEWORK_INDEX": "sharded"})["stdout"] == "sharded\n"
+    assert server.execute(["lfm", "generate-index"], {"LORE_FRAMEWORK_INDEX": None})["stdout"] == "unset\n"
+    assert server.execute(["lfm", "generate-index"])["stdout"] == "flat\n"
+    assert env_setting("LORE_FRAMEWORK_INDEX") == "flat"
+
+
+def test_forwarded_request_carries_settings(tmp_path, monkeypatch, capsys):
+    (tmp_path / "0-session").mkdir()
+    server = DelegateServer(tmp_path, print_index_setting)
+    assert server.start()
+    try:
+        monkeypatch.setenv("LORE_FRAMEWORK_INDEX", "sharded")
+        assert try_delegate(["lfm", "generate-index"], tmp_path) == 0
+        assert capsys.readouterr().out == "sharded\n"
+    finally:
+        server.stop()
+
+
+def test_no_answer_after_send_is_a_failure(tmp_path, monkeypatch, capsys):
+    (tmp_path / "0-session").mkdir()
+    monkeypatch.setattr(delegate, "RESPONSE_TIMEOUT", 0.2)
+    server = DelegateServer(tmp_path, print_index_setting)
+    # Slow command; without output capture, which would also catch this process's stderr
+    monkeypatch.setattr(server, "execute", lambda argv, env=None: time.sleep(1) or {"code": 0})
+    assert server.start()
+    try:
+        assert try_delegate(["lfm", "generate-index"], tmp_path) == 1
+        assert "may still be running" in capsys.readouterr().err
+    finally:
+        server.stop()
@@ -0,0 +1,81 @@
+"""Tests for the task dependency graph."""
+
+from lore_framework_mcp.graph import TaskGraph
+from lore_framework_mcp.records import TaskRecord
+
+
+def task(task_id, blocked_by=(), status=None):
+    status = status or ("blocked" if blocked_by else "active")
+    return TaskRecord(task_id, f"Task {task_id}", "FEATURE", status,
+                      f"lore/1-tasks/{status}/{task_id}_FEATURE_x.md", blocked_by)
+
+
+def graph_of(*tasks):
+    return TaskGraph({t.id: t for t in tasks})
+
+
+def reachable_open(graph, task_id):
+    """Open tasks with blockers reachable from task_id, by plain search."""
+    seen = set()
+    frontier = [task_id]
+    while frontier:
+        for child in graph.dependents[frontier.pop()]:
+            if child not in seen:
+                seen.add(child)
+                frontier.append(child)
+    seen.discard(task_id)
+    return {t for t in seen if graph.tasks[t].status != "completed" and graph.blockers[t]}
+
+
+def test_cycles_are_detected_and_reported():
+    graph = graph_of(
+        task("0001", ["3"]),
+        task("0002", ["1"]),
+        task("0003", ["2"]),
+        task("0004", ["0004"]),
+        task("0005", ["3"]),
+        task("0006"),
+    )
+    assert graph.cycles == [["0001", "0002", "0003"], ["0004"]]
+    assert graph.warnings() == [
+        "Warning: dependency cycle between tasks 0001, 0002, 0003",
+        "Warning: dependency cycle between tasks 0004",
+    ]
+    assert sorted(graph.order) == ["0001", "0002", "0003", "0004", "0005", "0006"]
+    assert graph.order.index("0003") < graph.order.index("0005")
+    assert [t.id for t in graph.ready] == ["0006"]
+    assert graph.downstream["0001"] == 3
+    for task_id in graph.tasks:
+        assert graph.downstream[task_id] == len(reachable_open(graph, task_id))
+
+
+def test_dangling_blockers_are_not_ready():
+    graph = graph_of(
+        task("0001", status="completed"),
+        task("0002", ["1", "0099"]),
+        task("0003", ["1"]),
+        task("0004", ["missing"], status="active"),
+    )
+    assert graph.dangling == {"0002": ["0099"], "0004": ["missing"]}
+    assert graph.blockers["0002"] == ["0001"]
+    assert [t.id for t in graph.ready] == ["0003"]
+    assert graph.warnings() == [
+        "Warning: task 0002 is blocked by unknown task 0099",
+        "Warning: task 0004 is blocked by unknown task missing",
+    ]
+
+
+def test_downstream_counts_open_tasks_transitively():
+    graph = graph_of(
+        task("0001"),
+        task("0002", ["1"]),
+        task("0003", ["2"]),
+        task("0004", ["1"], status="completed"),
+        task("0005", ["4", "3"]),
+        task("0006"),
+    )
+    assert graph.downstream == {"0001": 3, "0002": 2, "0003": 1, "0004": 1, "0005": 0, "0006": 0}
+    assert graph.depth == {"0001": 4, "0002": 3, "0003": 2, "0004": 1, "0005": 1, "0006": 1}
+    assert [t.id for t in graph.ranked_ready()] == ["0001", "0006"]
+    for task_id in graph.tasks:
+        assert graph.downstream[task_id] == len(reachable_open(graph, task_id))
@@ -0,0 +1,29 @@
+"""Tests that CLI/hook startup does not load the MCP stack."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+MCP_STACK = ("mcp", "pydantic", "anyio", "starlette")
+
+
+def test_cli_import_skips_mcp_stack():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lore_framework_mcp.cli"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+
+    modules = {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+    assert "lore_framework_mcp.cli" in modules
+    for package in MCP_STACK:
+        assert not [name for name in modules if name.split(".")[0] == package]
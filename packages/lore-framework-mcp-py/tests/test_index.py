@@ -0,0 +1,50 @@
+"""Tests for incremental index updates."""
+
+import os
+
+from lore_framework_mcp.cache import ParseCache
+from lore_framework_mcp.core import build_index
+
+TASK = """---
+id: "{id}"
+title: "{title}"
+type: FEATURE
+status: active
+history:
+  - date: 2026-01-01
+    status: {status}
+    who: alice{by}
+---
+"""
+
+
+def write_task(lore_dir, status, name, task_id, title, blocked_by=None):
+    path = lore_dir / "1-tasks" / status / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    by = f"\n    by: {blocked_by}" if blocked_by else ""
+    path.write_text(TASK.format(id=task_id, title=title, status="blocked" if blocked_by else "active", by=by))
+    return path
+
+
+def summary(state):
+    tasks, adrs, blocks = state
+    return {tid: (t.path, t.title) for tid, t in tasks.items()}, {k: sorted(v) for k, v in blocks.items()}
+
+
+def test_changed_matches_full_rebuild_for_duplicate_ids(tmp_path):
+    lore_dir = tmp_path / "lore"
+    (lore_dir / "0-session").mkdir(parents=True)
+    active = write_task(lore_dir, "active", "0003_FEATURE_one.md", "0003", "ActiveOne")
+    write_task(lore_dir, "backlog", "0003_FEATURE_one.md", "0003", "BacklogOne")
+    write_task(lore_dir, "active", "0004_FEATURE_two.md", "0004", "Two", ["3"])
+
+    full = summary(build_index(lore_dir, ParseCache.load(lore_dir)))
+    assert full[0]["0003"][1] == "BacklogOne"
+
+    active.write_text(active.read_text().replace("ActiveOne", "ActiveOne edited"))
+    st = active.stat()
+    os.utime(active, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    incremental = summary(build_index(lore_dir, ParseCache.load(lore_dir), changed=active))
+
+    assert incremental == summary(build_index(lore_dir, ParseCache.load(lore_dir)))
+    assert incremental[0]["0003"][1] == "BacklogOne"
@@ -0,0 +1,78 @@
+"""Tests for incremental lineage graph updates."""
+
+import os
+
+from lore_framework_mcp import lineage
+from lore_framework_mcp.lineage import load_lineage
+
+NOTE = """---
+title: {name}
+type: {type}
+status: {status}
+spawned_from: {spawned_from}
+spawns: {spawns}
+---
+"""
+
+TASK_DIR = "1-tasks/active/0001_RESEARCH_x"
+NOTES = f"lore/{TASK_DIR}/notes/"
+
+
+def write_note(lore_dir, name, spawned_from=(), spawns=(), status="active"):
+    path = lore_dir / TASK_DIR / "notes" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = NOTE.format(
+        name=name,
+        type=name[0],
+        status=status,
+        spawned_from="[" + ", ".join(f"notes/{p}" for p in spawned_from) + "]",
+        spawns="[" + ", ".join(f"notes/{c}" for c in spawns) + "]",
+    )
+    path.write_text(text)
+    # Same-second rewrites must still look changed
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    return path
+
+
+def adjacency(graph):
+    return [graph.describe(path) for path in sorted(graph.notes)]
+
+
+def rebuilt(lore_dir):
+    """Graph loaded from scratch in a fresh process state."""
+    graphs = dict(lineage._graphs)
+    lineage._graphs.clear()
+    try:
+        return load_lineage(lore_dir)
+    finally:
+        lineage._graphs.clear()
+        lineage._graphs.update(graphs)
+
+
+def test_update_matches_fresh_graph(tmp_path):
+    lore_dir = tmp_path / "lore"
+    (lore_dir / "0-session").mkdir(parents=True)
+    write_note(lore_dir, "Q-why.md", spawns=["S-answer.md"])
+    write_note(lore_dir, "S-answer.md", spawned_from=["Q-why.md"])
+    write_note(lore_dir, "I-idea.md", spawned_from=["S-answer.md"])
+
+    graph = load_lineage(lore_dir)
+    assert graph.describe(NOTES + "Q-why.md")["descendants"] == [
+        NOTES + "S-answer.md",
+        NOTES + "I-idea.md",
+    ]
+
+    # The Q -> S edge is still declared by Q after S drops it
+    write_note(lore_dir, "S-answer.md")
+    assert load_lineage(lore_dir) is graph
+    assert adjacency(graph) == adjacency(rebuilt(lore_dir))
+    assert graph.describe(NOTES + "S-answer.md")["parents"] == [NOTES + "Q-why.md"]
+
+    write_note(lore_dir, "Q-why.md")
+    (lore_dir / TASK_DIR / "notes" / "I-idea.md").unlink()
+    load_lineage(lore_dir)
+    assert adjacency(graph) == adjacency(rebuilt(lore_dir))
+    assert graph.parents == {} and graph.children == {}
+    assert sorted(graph.notes) == [NOTES + "Q-why.md", NOTES + "S-answer.md"]
+    lineage.forget(lore_dir)
@@ -0,0 +1,32 @@
+"""Tests for header-only frontmatter reading."""
+
+from lore_framework_mcp.core import extract_title
+from lore_framework_mcp.reader import parse_head, read_head
+
+
+def write(tmp_path, text):
+    path = tmp_path / "0001_FEATURE_x.md"
+    path.write_text(text)
+    return path
+
+
+def test_untitled_head_stops_at_first_heading(tmp_path):
+    path = write(tmp_path, '---\nid: "0001"\n---\n\n# Task Title\n\nBody\n')
+    meta, body = parse_head(read_head(path))
+    assert meta == {"id": "0001"}
+    assert body == "# Task Title"
+    assert extract_title(body) == "Task Title"
+
+
+def test_indented_heading_is_not_a_title(tmp_path):
+    path = write(tmp_path, '---\nid: "0001"\n---\n\nIntro\n  # Indented\n\n# Task Title\n\nBody\n')
+    _, body = parse_head(read_head(path))
+    assert extract_title(body) == "Task Title"
+    assert "Body" not in body
+
+
+def test_titled_head_reads_frontmatter_only(tmp_path):
+    path = write(tmp_path, '---\ntitle: "Set"\n---\n\n# Other\n')
+    meta, body = parse_head(read_head(path))
+    assert meta == {"title": "Set"}
+    assert body == ""
@@ -0,0 +1,103 @@
+"""Tests for incremental search index updates."""
+
+import shutil
+
+from lore_framework_mcp import search
+from lore_framework_mcp.cache import get_cache_dir
+from lore_framework_mcp.search import SearchIndex
+
+
+def make_lore(tmp_path):
+    lore_dir = tmp_path / "lore"
+    (lore_dir / "0-session").mkdir(parents=True)
+    for name, text in [
+        ("1-tasks/active/0001_FEATURE_cache.md", "Parse cache keyed by path, validated by mtime"),
+        ("1-tasks/active/0002_RESEARCH_redis/notes/Q-limits.md", "How does redis rate limiting scale"),
+        ("2-adrs/0001_use-redis.md", "Use redis for rate limiting and the parse cache"),
+        ("3-wiki/glossary.md", "Lore glossary: task, ADR, worklog"),
+    ]:
+        write(lore_dir, name, text)
+    return lore_dir
+
+
+def write(lore_dir, name, text):
+    path = lore_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def ranked(index, query):
+    return {r["path"]: r["score"] for r in index.search(query, 50)["results"]}
+
+
+def rebuilt(tmp_path, lore_dir):
+    """Index built from scratch over a copy of lore_dir."""
+    copy = tmp_path / "fresh" / "lore"
+    shutil.copytree(lore_dir, copy, ignore=shutil.ignore_patterns(".cache"))
+    index = SearchIndex(copy)
+    index.update()
+    return index
+
+
+def test_update_appends_segment(tmp_path):
+    lore_dir = make_lore(tmp_path)
+    index = SearchIndex(lore_dir)
+    index.update()
+    directory = get_cache_dir(lore_dir) / search.SEARCH_DIR
+    first = (directory / "postings-1.bin").read_bytes()
+
+    write(lore_dir, "2-adrs/0001_use-redis.md", "Use memcached for the parse cache, not redis")
+    assert index.update() == (1, 0)
+
+    assert [segment["generation"] for segment in index.segments] == [1, 2]
+    assert (directory / "postings-1.bin").read_bytes() == first
+    assert set(index.segments[1]["terms"]) == {"use", "memcached", "for", "the", "parse", "cache", "not", "redis"}
+    for query in ["redis", "parse cache", "memcached", "glossary"]:
+        assert ranked(index, query) == ranked(rebuilt(tmp_path / query.replace(" ", "_"), lore_dir), query)
+
+    # A reload from disk sees the same segments
+    search.forget(lore_dir)
+    assert ranked(SearchIndex.load(lore_dir), "redis") == ranked(index, "redis")
+    search.forget(lore_dir)
+
+
+def test_merge_drops_deleted_postings(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "MAX_SEGMENTS", 2)
+    lore_dir = make_lore(tmp_path)
+    index = SearchIndex(lore_dir)
+    index.update()
+
+    for i in range(5):
+        write(lore_dir, "3-wiki/glossary.md", f"Lore glossary revision {i}: task, ADR, worklog")
+        index.update()
+        assert len(index.segments) <= 2
+    (lore_dir / "1-tasks/active/0001_FEATURE_cache.md").unlink()
+    index.update()
+
+    directory = get_cache_dir(lore_dir) / search.SEARCH_DIR
+    live = {segment["generation"] for segment in index.segments}
+    files = {int(p.stem.split("-")[1]) for p in directory.iterdir() if p.name != search.INDEX_FILE}
+    assert files == live
+    for query in ["revision", "glossary", "cache", "redis"]:
+        assert ranked(index, query) == ranked(rebuilt(tmp_path / query, lore_dir), query)
+
+
+def test_update_with_changed_paths_stats_only_those(tmp_path):
+    lore_dir = make_lore(tmp_path)
+    index = SearchIndex(lore_dir)
+    index.update()
+
+    write(lore_dir, "3-wiki/unlisted.md", "zebra")
+    write(lore_dir, "3-wiki/listed.md", "zebra")
+    shutil.rmtree(lore_dir / "1-tasks/active/0002_RESEARCH_redis")
+    index.update(changed=["3-wiki/listed.md", "1-tasks/active/0002_RESEARCH_redis"])
+
+    assert set(ranked(index, "zebra")) == {"lore/3-wiki/listed.md"}
+    assert "lore/1-tasks/active/0002_RESEARCH_redis/notes/Q-limits.md" not in ranked(index, "redis")
+
+    # Changed paths are ignored until the instance has walked the corpus
+    search.forget(lore_dir)
+    reloaded = SearchIndex.load(lore_dir)
+    reloaded.update(changed=[])
+    assert set(ranked(reloaded, "zebra")) == {"lore/3-wiki/listed.md", "lore/3-wiki/unlisted.md"}
+    search.forget(lore_dir)
@@ -0,0 +1,16 @@
+"""Tests for the sharded index layout."""
+
+from lore_framework_mcp.records import TaskRecord
+from lore_framework_mcp.shards import write_shards
+
+
+def test_write_shards_keeps_user_files(tmp_path):
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    (index_dir / "notes.md").write_text("mine\n")
+    (index_dir / "archive-2019.md").write_text("stale shard\n")
+
+    task = TaskRecord("0001", "One", "FEATURE", "active", "lore/1-tasks/active/0001_FEATURE_one.md")
+    write_shards(tmp_path, {"0001": task}, {}, {"0001": []})
+
+    assert sorted(p.name for p in index_dir.iterdir()) == ["active.md", "notes.md"]
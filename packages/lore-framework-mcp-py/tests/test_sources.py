@@ -0,0 +1,43 @@
+"""Tests for the task source store."""
+
+from lore_framework_mcp.sources import dedupe_sources, read_source
+
+BODY = b"# Page\n\nShared text.\n"
+
+
+def make_source(lore_dir, task, name, data):
+    path = lore_dir / "1-tasks" / "active" / task / "sources" / name
+    path.parent.mkdir(parents=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_editing_a_hardlinked_source_keeps_pointer_content(tmp_path):
+    lore_dir = tmp_path / "lore"
+    raw = make_source(lore_dir, "0001_a", "raw.md", BODY)
+    page_data = b'---\nurl: "https://x"\n---\n' + BODY
+    page = make_source(lore_dir, "0002_b", "page.md", page_data)
+
+    report = dedupe_sources(lore_dir)
+    assert (report["linked"], report["pointers"]) == (1, 1)
+    assert raw.stat().st_nlink == 2
+
+    with open(raw, "r+b") as f:
+        f.write(b"# Edited in place, longer than before\n")
+
+    report = dedupe_sources(lore_dir)
+    assert report["rekeyed_blobs"] == 1
+    assert report["missing_blobs"] == 0
+    assert read_source(page) == page_data
+    assert raw.read_bytes().startswith(b"# Edited in place")
+
+
+def test_dedupe_is_stable(tmp_path):
+    lore_dir = tmp_path / "lore"
+    make_source(lore_dir, "0001_a", "img.png", b"\x89PNG data")
+    make_source(lore_dir, "0002_b", "img.png", b"\x89PNG data")
+
+    first = dedupe_sources(lore_dir)
+    second = dedupe_sources(lore_dir)
+    assert (first["stored"], first["linked"], first["reclaimed"]) == (1, 2, 9)
+    assert (second["stored"], second["unchanged"], second["removed_blobs"], second["reclaimed"]) == (0, 2, 0, 0)
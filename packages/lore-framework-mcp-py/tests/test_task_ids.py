@@ -0,0 +1,15 @@
+"""Tests for the task ID index."""
+
+from lore_framework_mcp.task_ids import TaskIdIndex
+
+
+def test_update_keeps_status_order(tmp_path):
+    index = TaskIdIndex(tmp_path, {"1": ["1-tasks/archive/0001_a.md", "1-tasks/backlog/0001_b.md"]})
+    index.update("0001", "1-tasks/active/0001_c.md", True)
+    index.update("1", "1-tasks/archive/0001_d.md", True)
+    assert index.ids["1"] == [
+        "1-tasks/active/0001_c.md",
+        "1-tasks/archive/0001_a.md",
+        "1-tasks/archive/0001_d.md",
+        "1-tasks/backlog/0001_b.md",
+    ]
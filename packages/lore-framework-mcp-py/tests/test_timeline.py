@@ -0,0 +1,26 @@
+"""Tests for worklog timeline records."""
+
+from lore_framework_mcp.timeline import build_worklog_record
+
+WORKLOG = """---
+date: {date}
+session: 2
+---
+
+# Session notes
+"""
+
+
+def record(tmp_path, name, date):
+    lore_dir = tmp_path / "lore"
+    task_dir = lore_dir / "1-tasks" / "active" / "0007_RESEARCH_x"
+    path = task_dir / "worklog" / name
+    head = WORKLOG.format(date=date).encode()
+    return build_worklog_record(lore_dir, task_dir, "active", path, head)
+
+
+def test_unpadded_date_falls_back_to_file_name(tmp_path):
+    for date in ['"2025-1-5"', "2025-1-5", "Jan 5th", "2025-01-5T10:00"]:
+        assert record(tmp_path, "2025-01-05_session.md", date)["date"] == "2025-01-05"
+    assert record(tmp_path, "notes.md", '"2025-1-5"') is None
+    assert record(tmp_path, "2025-01-05_session.md", "2025-01-06")["date"] == "2025-01-06"
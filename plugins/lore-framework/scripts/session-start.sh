@@ -47,6 +47,7 @@ ensure_gitignore "lore/0-session/current-user.md"
 ensure_gitignore "lore/0-session/current-task.md"
 ensure_gitignore "lore/0-session/current-task.json"
 ensure_gitignore "lore/0-session/next-tasks.md"
+ensure_gitignore "lore/0-session/.cache/"
 
 # Set current user from env var if set
 if [ -n "$LORE_SESSION_CURRENT_USER" ]; then